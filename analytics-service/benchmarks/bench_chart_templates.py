@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-chart render time with and without figure templates
+
+Usage:
+    python benchmarks/bench_chart_templates.py [--iterations 10] [--profile default]
+
+Renders the same sequence of synthetic days through ChartGenerator twice -
+fresh figures every time vs reusable templates - with the chart cache off,
+and prints mean/min milliseconds per chart.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.chart_generator import ChartGenerator, CHART_METHODS
+
+MEALS = ['Breakfast', 'Lunch', 'Dinner', 'Night Snacks']
+COMMENTS = ['too oily', 'good', 'very tasty food', 'bad and cold', 'awesome', 'not good', 'could be better']
+
+
+def synthetic_analysis(seed, students=400):
+    """analysis_data shaped like analyze_daily_feedback output"""
+    rng = random.Random(seed)
+    distribution = {}
+    averages = {}
+    sentiment = {}
+    comments = []
+    for meal in MEALS:
+        counts = [rng.randint(0, students // 5) for _ in range(5)]
+        total = sum(counts)
+        distribution[meal] = {f'{star}_star': counts[star - 1] for star in range(1, 6)}
+        averages[meal] = round(sum((i + 1) * c for i, c in enumerate(counts)) / total, 2) if total else 0
+        sentiment[meal] = {'average_rating': averages[meal], 'total_responses': total}
+        for _ in range(rng.randint(5, 40)):
+            comments.append({'text': rng.choice(COMMENTS), 'meal': meal, 'rating': rng.randint(1, 5)})
+    participating = rng.randint(students // 3, students)
+    return {
+        'overview': {
+            'totalStudents': students,
+            'participatingStudents': participating,
+            'participationRate': round(participating / students * 100, 1),
+            'overallRating': round(statistics.mean(v for v in averages.values() if v) or 0, 2),
+            'qualityConsistencyScore': round(rng.uniform(40, 100), 1)
+        },
+        'averageRatingPerMeal': averages,
+        'feedbackDistributionPerMeal': distribution,
+        'sentimentAnalysisPerMeal': sentiment,
+        'allComments': comments
+    }
+
+
+def time_charts(generator, days):
+    """Milliseconds per chart for each day, keyed by chart name"""
+    timings = {name: [] for name in CHART_METHODS}
+    for data in days:
+        for name, method_name in CHART_METHODS.items():
+            start = time.perf_counter()
+            getattr(generator, method_name)(data)
+            timings[name].append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=10, help='Synthetic days rendered per mode')
+    parser.add_argument('--profile', default=None, help='Render profile (see RENDER_PROFILES)')
+    args = parser.parse_args()
+
+    days = [synthetic_analysis(seed) for seed in range(args.iterations)]
+    fresh = ChartGenerator(use_cache=False, profile=args.profile, use_templates=False)
+    templated = ChartGenerator(use_cache=False, profile=args.profile, use_templates=True)
+
+    # Warm-up: font cache, glyph fallback, first template build
+    time_charts(fresh, days[:1])
+    time_charts(templated, days[:1])
+
+    results = {
+        'fresh': time_charts(fresh, days),
+        'template': time_charts(templated, days)
+    }
+
+    print(f"{'chart':<15}{'fresh mean':>12}{'fresh min':>12}{'tmpl mean':>12}{'tmpl min':>12}{'speedup':>10}")
+    for name in CHART_METHODS:
+        fresh_ms = results['fresh'][name]
+        tmpl_ms = results['template'][name]
+        speedup = statistics.mean(fresh_ms) / statistics.mean(tmpl_ms)
+        print(f"{name:<15}{statistics.mean(fresh_ms):>12.1f}{min(fresh_ms):>12.1f}"
+              f"{statistics.mean(tmpl_ms):>12.1f}{min(tmpl_ms):>12.1f}{speedup:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
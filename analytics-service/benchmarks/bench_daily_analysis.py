@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Benchmark: analyze_daily_feedback stage by stage on synthetic days
+
+Usage:
+    python benchmarks/bench_daily_analysis.py [--sizes 1000,10000,100000] [--repeat 3]
+        [--mongo-uri mongodb://localhost:27017/analytics_bench | --in-process]
+        [--profile default] [--templates] [--output FILE] [--baseline FILE]
+
+Loads one day of synthetic feedback documents (meals.morning/afternoon/
+evening/night, each with rating, comment and submittedAt) per size into a
+local mongod, or into mongomock with --in-process, then times each stage of
+the daily report: the stats aggregation, the comment fetch, the Python
+report assembly, sentiment scoring, each chart, base64 encoding and JSON
+serialization, plus the whole analyze_daily_feedback call. Timings are the
+median of --repeat runs. A separate tracemalloc pass records the Python heap
+peak of each stage. Results go to a JSON file for comparison between
+commits, and --baseline prints the change against an earlier one.
+
+Caches are bypassed so every run measures real work. The chart cache is off,
+the sentiment memo is cleared before each scoring stage, and charts are
+rendered after scoring, so chart timings exclude NLP. mongomock evaluates
+queries in Python, so the fetch stages are only meaningful against mongod
+(it also rejects the rollup write, which the background writer logs).
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import subprocess
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+# Measure rendering and scoring, not cache hits (read when the modules below are imported)
+os.environ['CHART_CACHE_ENABLED'] = 'false'
+os.environ['SENTIMENT_STORE_PATH'] = ''
+os.environ['SENTIMENT_PRECOMPUTED'] = 'false'
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+
+import utils.database as database
+from services.daily_analysis_core import (
+    MEAL_TYPES, fetch_daily_stats, iter_daily_comments, assemble_analysis_data,
+    analyze_daily_feedback
+)
+from services.daily_rollups import ROLLUP_COLLECTION
+from services.indexes import ensure_indexes
+from services.student_count import HEADCOUNT_COLLECTION, record_headcount
+from utils.chart_generator import ChartGenerator, CHART_METHODS, to_data_uri
+from utils.database import get_date_range, get_database_name
+from utils.sentiment import sentiment_engine
+
+BENCH_DATE = '2025-03-14'
+DEFAULT_MONGO_URI = 'mongodb://localhost:27017/analytics_bench'
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+INSERT_BATCH_SIZE = 5000
+
+# Share of students rating each meal, and relative weight of 1..5 stars
+MEAL_ATTENDANCE = {'morning': 0.85, 'afternoon': 0.9, 'evening': 0.8, 'night': 0.55}
+MEAL_RATING_WEIGHTS = {
+    'morning': [5, 10, 25, 35, 25],
+    'afternoon': [4, 8, 20, 38, 30],
+    'evening': [8, 12, 28, 32, 20],
+    'night': [10, 15, 30, 28, 17]
+}
+COMMENT_RATE = 0.35
+# Comments are built from these, so a day holds a few thousand distinct texts
+DISHES = ['dal', 'rice', 'paneer', 'roti', 'sambar', 'poha', 'curry', 'chai', 'biryani', 'salad', 'maggi', 'idli']
+PHRASES = {
+    1: ['{dish} was cold and stale', 'found a hair in the {dish}', 'terrible {dish}, not edible'],
+    2: ['{dish} too oily', '{dish} was undercooked', 'not good, {dish} tasteless'],
+    3: ['{dish} was okay', 'average {dish}', '{dish} could be better'],
+    4: ['good {dish}', '{dish} was tasty', 'nice {dish} today'],
+    5: ['awesome {dish}!', 'loved the {dish}', 'very tasty {dish}, thanks']
+}
+SUFFIXES = ['', '', '', ' today', ' again', '!!', ' 😋', ' please improve', ' as usual']
+MEAL_HOURS = {'morning': 8, 'afternoon': 13, 'evening': 17, 'night': 21}
+
+# Starlette's JSONResponse encoding
+JSON_KWARGS = {'ensure_ascii': False, 'allow_nan': False, 'indent': None, 'separators': (',', ':')}
+
+
+def synthetic_feedback(day, count, seed=0):
+    """Yield count feedback documents for one day, shaped like the backend's Feedback model"""
+    rng = random.Random(seed)
+    # Stored dates are IST midnight; submissions happen at meal times (UTC)
+    ist_offset = timedelta(hours=5, minutes=30)
+    for _ in range(count):
+        meals = {}
+        last_submitted = None
+        for meal in MEAL_TYPES:
+            if rng.random() < MEAL_ATTENDANCE[meal]:
+                rating = rng.choices(range(1, 6), weights=MEAL_RATING_WEIGHTS[meal])[0]
+                comment = ''
+                if rng.random() < COMMENT_RATE:
+                    comment = rng.choice(PHRASES[rating]).format(dish=rng.choice(DISHES)) + rng.choice(SUFFIXES)
+                submitted_at = day - ist_offset + timedelta(hours=MEAL_HOURS[meal], minutes=rng.randint(0, 119))
+                meals[meal] = {'rating': rating, 'comment': comment, 'submittedAt': submitted_at}
+                last_submitted = submitted_at
+            else:
+                meals[meal] = {'rating': None, 'comment': '', 'submittedAt': None}
+        if last_submitted is None:
+            # Every stored feedback has at least one rated meal
+            meal = rng.choice(MEAL_TYPES)
+            last_submitted = day - ist_offset + timedelta(hours=MEAL_HOURS[meal])
+            meals[meal] = {'rating': 3, 'comment': '', 'submittedAt': last_submitted}
+        yield {
+            'user': ObjectId(),
+            'date': day,
+            'meals': meals,
+            'createdAt': last_submitted,
+            'updatedAt': last_submitted
+        }
+
+
+def load_day(db, count, seed):
+    """Replace the benchmark day with count synthetic documents; returns the headcount"""
+    for name in ('feedbacks', ROLLUP_COLLECTION, HEADCOUNT_COLLECTION):
+        db[name].drop()
+    ensure_indexes(db)
+    day = datetime.strptime(BENCH_DATE, '%Y-%m-%d')
+    batch = []
+    for doc in synthetic_feedback(day, count, seed):
+        batch.append(doc)
+        if len(batch) == INSERT_BATCH_SIZE:
+            db.feedbacks.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        db.feedbacks.insert_many(batch, ordered=False)
+    # Fixed headcount snapshot: participation is about 80% whatever the size
+    total_students = round(count / 0.8)
+    record_headcount(db, BENCH_DATE, total_students)
+    return total_students
+
+
+def run_stages(db, total_students, generator, measure):
+    """
+    Run every stage once through measure(name, work) -> result
+
+    Returns the comment rows and the size of the JSON response in bytes.
+    """
+    feedbacks = db.feedbacks
+    start_date, end_date = get_date_range(BENCH_DATE)
+
+    _, participating, meal_stats = measure('fetchStats', lambda: fetch_daily_stats(feedbacks, start_date, end_date))
+    rows = measure('fetchComments', lambda: list(iter_daily_comments(feedbacks, start_date, end_date)))
+    data = measure('aggregate', lambda: assemble_analysis_data(total_students, participating, meal_stats, rows))
+
+    sentiment_engine.memory.clear()
+    measure('sentiment', lambda: generator.summarize_comment_sentiment(data['allComments']))
+
+    images = {}
+    for name, method_name in CHART_METHODS.items():
+        rendered = measure(f'chart:{name}', lambda: getattr(generator, method_name)(data))
+        images[name] = rendered['image'] if isinstance(rendered, dict) else rendered
+
+    encoded = measure('base64', lambda: {
+        name: to_data_uri(image, generator.media_type) for name, image in images.items()
+    })
+    response = {
+        'status': 'success',
+        'date': BENCH_DATE,
+        'data': data,
+        'charts': {name: {'base64': uri} for name, uri in encoded.items()},
+        'timestamp': datetime.now().isoformat()
+    }
+    body = measure('json', lambda: json.dumps(response, **JSON_KWARGS).encode('utf-8'))
+
+    sentiment_engine.memory.clear()
+    measure('endToEnd', lambda: analyze_daily_feedback(BENCH_DATE, True, generator.profile))
+    return rows, len(body)
+
+
+def time_stages(db, total_students, generator, repeat):
+    """Milliseconds per stage for each of repeat runs"""
+    timings = {}
+
+    def measure(name, work):
+        start = time.perf_counter()
+        result = work()
+        timings.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+        return result
+
+    for _ in range(repeat):
+        rows, response_bytes = run_stages(db, total_students, generator, measure)
+    return timings, rows, response_bytes
+
+
+def peak_memory(db, total_students, generator):
+    """Python heap peak (MiB above the stage's starting point) per stage, via tracemalloc"""
+    peaks = {}
+
+    def measure(name, work):
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        result = work()
+        peaks[name] = (tracemalloc.get_traced_memory()[1] - baseline) / (1024 * 1024)
+        return result
+
+    tracemalloc.start()
+    try:
+        run_stages(db, total_students, generator, measure)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def max_rss_mib():
+    """Peak resident set size of this process so far (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def connect(args):
+    """Database for the benchmark: mongomock in-process, or a dedicated mongod database"""
+    if args.in_process:
+        try:
+            import mongomock
+        except ImportError:
+            sys.exit("--in-process needs mongomock (pip install mongomock)")
+        database._shared_client = mongomock.MongoClient()
+        os.environ['MONGODB_URI'] = DEFAULT_MONGO_URI
+        return database.get_client()[get_database_name(DEFAULT_MONGO_URI)], 'mongomock'
+
+    name = get_database_name(args.mongo_uri)
+    # The benchmark drops its collections, so never point it at real data
+    if 'bench' not in name:
+        sys.exit(f"Refusing to use database '{name}': its name must contain 'bench'")
+    os.environ['MONGODB_URI'] = args.mongo_uri
+    client = database.init_client()
+    version = client.server_info()['version']
+    return client[name], f'mongod {version}'
+
+
+def print_report(size_result, baseline):
+    print(f"\n{size_result['documents']:,} documents, {size_result['comments']:,} comments "
+          f"({size_result['distinctComments']:,} distinct), response {size_result['responseKiB']:.0f} KiB")
+    header = f"{'stage':<22}{'median ms':>12}{'min ms':>10}{'peak MiB':>10}"
+    print(header + (f"{'vs baseline':>13}" if baseline else ''))
+    for name, stage in size_result['stages'].items():
+        line = f"{name:<22}{stage['medianMs']:>12.1f}{stage['minMs']:>10.1f}{stage['peakMiB']:>10.1f}"
+        previous = (baseline or {}).get(name)
+        if previous:
+            line += f"{(stage['medianMs'] / previous['medianMs'] - 1) * 100:>+12.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000', help='Comma-separated documents per day')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per size (median reported)')
+    parser.add_argument('--mongo-uri', default=DEFAULT_MONGO_URI,
+                        help="mongod database to load (its name must contain 'bench')")
+    parser.add_argument('--in-process', action='store_true', help='Use mongomock instead of mongod')
+    parser.add_argument('--profile', default=None, help='Render profile (see RENDER_PROFILES)')
+    parser.add_argument('--templates', action='store_true', help='Render with figure templates')
+    parser.add_argument('--seed', type=int, default=0, help='Synthetic data seed')
+    parser.add_argument('--output', default=None, help='Results file (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--baseline', default=None, help='Earlier results file to compare medians against')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    db, backend = connect(args)
+    generator = ChartGenerator(use_cache=False, profile=args.profile, use_templates=args.templates)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {result['documents']: result['stages'] for result in json.load(f)['results']}
+
+    results = []
+    for size in sizes:
+        start = time.perf_counter()
+        total_students = load_day(db, size, args.seed)
+        print(f"Loaded {size:,} documents in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+
+        # Untimed first pass: imports, font cache and glyph fallback, sentiment lexicon
+        time_stages(db, total_students, generator, 1)
+        timings, rows, response_bytes = time_stages(db, total_students, generator, args.repeat)
+        peaks = peak_memory(db, total_students, generator)
+
+        size_result = {
+            'documents': size,
+            'totalStudents': total_students,
+            'comments': len(rows),
+            'distinctComments': len({comment for _, _, comment in rows}),
+            'responseKiB': round(response_bytes / 1024, 1),
+            'stages': {
+                name: {
+                    'medianMs': round(statistics.median(values), 2),
+                    'minMs': round(min(values), 2),
+                    'maxMs': round(max(values), 2),
+                    'peakMiB': round(peaks.get(name, 0), 2)
+                }
+                for name, values in timings.items()
+            },
+            'maxRssMiB': round(max_rss_mib() or 0, 1)
+        }
+        results.append(size_result)
+        print_report(size_result, (baseline or {}).get(size))
+
+    report = {
+        'benchmark': 'daily_analysis',
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'gitRevision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpuCount': os.cpu_count(),
+        'database': backend,
+        'profile': generator.profile,
+        'templates': args.templates,
+        'sentimentBackend': sentiment_engine.backend.name,
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'results': results
+    }
+    output = args.output or os.path.join(
+        DEFAULT_OUTPUT_DIR, f"daily_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == '__main__':
+    main()
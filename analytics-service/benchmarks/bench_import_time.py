@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold import time of the service
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 5] [--top 15] [--max-ms 1000] [--module main]
+
+Imports the module in fresh interpreters with `python -X importtime`, prints
+the median cumulative import time and the heaviest imports of the median run,
+and exits non-zero when chart/NLP dependencies (matplotlib, seaborn, NumPy,
+TextBlob, ...) are imported eagerly or the median exceeds --max-ms.
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must only be imported on first chart render / sentiment scoring / trend request
+LAZY_MODULES = ('matplotlib', 'seaborn', 'numpy', 'textblob', 'pandas', 'scipy', 'PIL', 'nltk')
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us, depth)] from -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        # "import time:   398 |   450221 |     fastapi" (two spaces of indent per nesting level)
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def measure(module):
+    """One cold import in a fresh interpreter"""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=SERVICE_DIR, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        sys.exit(f"import {module} failed:\n{completed.stderr[-2000:]}")
+    rows = parse_importtime(completed.stderr)
+    total = next((cumulative for name, _, cumulative, depth in rows if name == module and depth == 0), None)
+    return total, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to measure')
+    parser.add_argument('--top', type=int, default=15, help='Heaviest imports to list')
+    parser.add_argument('--max-ms', type=float, default=None, help='Fail when the median import exceeds this')
+    parser.add_argument('--module', default='main', help='Module to import (default: main)')
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.runs)]
+    runs.sort(key=lambda run: run[0])
+    median_us, rows = runs[len(runs) // 2]
+    totals_ms = [total / 1000 for total, _ in runs]
+
+    print(f"import {args.module}: median {statistics.median(totals_ms):.0f} ms "
+          f"(min {min(totals_ms):.0f}, max {max(totals_ms):.0f}, {args.runs} runs)")
+    print(f"\n{'cumulative ms':>14}{'self ms':>10}  module")
+    heaviest = sorted((row for row in rows if row[0] != args.module), key=lambda row: row[2], reverse=True)
+    for name, self_us, cumulative_us, depth in heaviest[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f}{self_us / 1000:>10.1f}  {'  ' * depth}{name}")
+
+    imported = {name for name, _, _, _ in rows}
+    eager = [module for module in LAZY_MODULES if module in imported]
+    failed = False
+    if eager:
+        print(f"\nFAIL: imported eagerly: {', '.join(eager)}")
+        failed = True
+    if args.max_ms is not None and statistics.median(totals_ms) > args.max_ms:
+        print(f"\nFAIL: median import {statistics.median(totals_ms):.0f} ms exceeds {args.max_ms:.0f} ms")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
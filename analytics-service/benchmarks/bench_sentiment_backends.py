@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sentiment backend speed against the TextBlob reference
+
+Usage:
+    python benchmarks/bench_sentiment_backends.py [--comments 5000]
+
+Scores the same synthetic hostel comments with every backend in
+SENTIMENT_BACKENDS (memo cache bypassed) and prints time per backend, with
+label agreement and mean polarity difference against TextBlob for context.
+Parity itself is tested in tests/test_sentiment_backends.py.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.sentiment import SENTIMENT_BACKENDS, classify_polarity, normalize_comment
+
+SUBJECTS = ['food', 'rice', 'dal', 'sambar', 'chapati', 'curry', 'tea', 'breakfast', 'biryani', 'snacks']
+OPENERS = ['', 'the', 'today the', 'honestly the', 'our']
+VERBS = ['was', 'is', 'tasted', "wasn't", 'looked']
+MODIFIERS = ['', '', 'very', 'really', 'too', 'not', 'not very', 'extremely', 'a bit']
+ADJECTIVES = ['good', 'bad', 'tasty', 'cold', 'oily', 'awesome', 'terrible', 'fresh', 'bland',
+              'delicious', 'salty', 'nice', 'horrible', 'great', 'poor', 'okay', 'spicy', 'hot']
+TAILS = ['', '', '!', '!!', '.', ' please improve', ' loved it', ' could be better', ' as usual']
+
+
+def synthetic_comments(count, seed=0):
+    """Comments assembled from hostel-feedback phrases"""
+    rng = random.Random(seed)
+    comments = []
+    for _ in range(count):
+        parts = [rng.choice(OPENERS), rng.choice(SUBJECTS), rng.choice(VERBS),
+                 rng.choice(MODIFIERS), rng.choice(ADJECTIVES)]
+        if rng.random() < 0.3:
+            parts += ['and', rng.choice(MODIFIERS), rng.choice(ADJECTIVES)]
+        comments.append(' '.join(p for p in parts if p) + rng.choice(TAILS))
+    return comments
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--comments', type=int, default=5000, help='Synthetic comments scored per backend')
+    args = parser.parse_args()
+
+    texts = [normalize_comment(t) for t in synthetic_comments(args.comments)]
+    backends = {name: backend() for name, backend in SENTIMENT_BACKENDS.items()}
+
+    # Warm-up: lexicon load, vocabulary arrays
+    for backend in backends.values():
+        backend.score(texts[:10])
+
+    results = {}
+    for name, backend in backends.items():
+        start = time.perf_counter()
+        polarities = backend.score(texts)
+        results[name] = (polarities, (time.perf_counter() - start) * 1000)
+
+    reference, reference_ms = results['textblob']
+    reference_labels = [classify_polarity(p) for p in reference]
+
+    print(f"{len(texts)} comments")
+    print(f"{'backend':<12}{'ms':>10}{'speedup':>10}{'agreement':>12}{'mean |dp|':>12}")
+    for name, (polarities, elapsed_ms) in results.items():
+        labels = [classify_polarity(p) for p in polarities]
+        agreement = sum(a == b for a, b in zip(labels, reference_labels)) / len(texts) * 100
+        error = sum(abs(a - b) for a, b in zip(polarities, reference)) / len(texts)
+        print(f"{name:<12}{elapsed_ms:>10.1f}{reference_ms / elapsed_ms:>9.2f}x"
+              f"{agreement:>11.1f}%{error:>12.4f}")
+
+
+if __name__ == '__main__':
+    main()
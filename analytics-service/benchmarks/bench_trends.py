@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark: trend computation cost by window length
+
+Usage:
+    python benchmarks/bench_trends.py [--repeat 20]
+
+Builds synthetic daily rollups (with holidays as gaps) and times
+compute_trends for 7 to 365 days against a plain-Python loop computing the
+same series (daily and rolling averages, moving participation, weekly
+averages, slopes), checking both agree.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.daily_analysis_core import MEAL_TYPES
+from services.trend_analysis import compute_trends, TREND_LOOKBACK_DAYS, TREND_WINDOW_DAYS
+
+WINDOWS = [7, 30, 90, 180, 365]
+
+
+def synthetic_rollups(days, students=400, seed=0):
+    """Consecutive rollup documents; about one day in ten has no feedback"""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    rollups = []
+    for offset in range(days):
+        has_feedback = rng.random() > 0.1
+        meals = {}
+        for meal_type in MEAL_TYPES:
+            count = rng.randint(students // 4, students) if has_feedback else 0
+            meals[meal_type] = {'count': count, 'sum': sum(rng.randint(1, 5) for _ in range(count))}
+        rollups.append({
+            '_id': (start + timedelta(days=offset)).strftime('%Y-%m-%d'),
+            'documents': max(m['count'] for m in meals.values()),
+            'participatingStudents': max(m['count'] for m in meals.values()),
+            'totalStudents': students,
+            'meals': meals
+        })
+    return rollups
+
+
+def python_trends(rollups, days):
+    """Loop reference computing the same series as compute_trends"""
+    window = TREND_WINDOW_DAYS
+    columns = MEAL_TYPES + [None]  # None = all meals
+
+    def totals(rollup, column):
+        meals = rollup['meals'].values() if column is None else [rollup['meals'][column]]
+        return sum(m['sum'] for m in meals), sum(m['count'] for m in meals)
+
+    def window_average(end, column):
+        total = count = 0
+        for rollup in rollups[max(0, end - window + 1):end + 1]:
+            s, c = totals(rollup, column)
+            total += s
+            count += c
+        return total / count if count else None
+
+    def window_participation(end):
+        rates = [r['participatingStudents'] / r['totalStudents'] * 100
+                 for r in rollups[max(0, end - window + 1):end + 1] if r['documents']]
+        return sum(rates) / len(rates) if rates else None
+
+    def slope(values):
+        points = [(x, y) for x, y in enumerate(values) if y is not None]
+        if len(points) < 2:
+            return None
+        x_mean = sum(x for x, _ in points) / len(points)
+        y_mean = sum(y for _, y in points) / len(points)
+        denominator = sum((x - x_mean) ** 2 for x, _ in points)
+        return sum((x - x_mean) * (y - y_mean) for x, y in points) / denominator if denominator else None
+
+    last = len(rollups) - 1
+    view = range(len(rollups) - days, len(rollups))
+    result = {}
+    for column in columns:
+        daily = []
+        for index in view:
+            s, c = totals(rollups[index], column)
+            daily.append(s / c if c else None)
+        result[column] = {
+            'daily': daily,
+            'rollingAverage': [window_average(index, column) for index in view],
+            'currentWeekAverage': window_average(last, column),
+            'previousWeekAverage': window_average(last - window, column),
+            'slopePerDay': slope(daily)
+        }
+    participation = [r['participatingStudents'] / r['totalStudents'] * 100 if r['documents'] else None
+                     for r in (rollups[index] for index in view)]
+    result['participation'] = {
+        'dailyRate': participation,
+        'movingAverage7d': [window_participation(index) for index in view],
+        'slopePerDay': slope(participation)
+    }
+    return result
+
+
+def close(a, b, tolerance=0.011):
+    """Equal lists/values within rounding (NumPy and Python round differently at .5)"""
+    if isinstance(a, list):
+        return len(a) == len(b) and all(close(x, y, tolerance) for x, y in zip(a, b))
+    if a is None or b is None:
+        return a is None and b is None
+    return abs(a - b) <= tolerance
+
+
+def agrees(trends, reference):
+    """compute_trends output matches the loop reference"""
+    pairs = [(trends['overall'], reference[None]), (trends['participation'], reference['participation'])]
+    pairs += [(trends['meals'][name], reference[meal_type])
+              for name, meal_type in zip(trends['meals'], MEAL_TYPES)]
+    return all(
+        close(ours[key], theirs[key], 0.051 if key in ('dailyRate', 'movingAverage7d') else 0.011)
+        for ours, theirs in pairs for key in theirs
+    )
+
+
+def time_ms(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.mean(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20, help='Timed runs per window')
+    args = parser.parse_args()
+
+    print(f"{'days':>6}{'numpy ms':>12}{'python ms':>12}{'speedup':>10}  agree")
+    for days in WINDOWS:
+        rollups = synthetic_rollups(days + TREND_LOOKBACK_DAYS, seed=days)
+
+        agree = agrees(compute_trends(rollups, days), python_trends(rollups, days))
+
+        numpy_ms = time_ms(lambda: compute_trends(rollups, days), args.repeat)
+        python_ms = time_ms(lambda: python_trends(rollups, days), args.repeat)
+        print(f"{days:>6}{numpy_ms:>12.2f}{python_ms:>12.2f}{python_ms / numpy_ms:>9.1f}x  {agree}")
+
+
+if __name__ == '__main__':
+    main()
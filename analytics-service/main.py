@@ -4,31 +4,107 @@ FastAPI Analytics Service
 Independent microservice for hostel food feedback analytics
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from typing import Optional
+import asyncio
 import os
+import re
+import time
+import uuid
 from dotenv import load_dotenv
 
 # Import analysis modules
-from services.daily_analysis_core import analyze_daily_feedback
-from utils.database import DatabaseConnection
+from services.analysis_executor import (
+    run_daily_analysis, run_in_executor, start_executor, shutdown_executor, AnalysisQueueFull,
+    get_pending_count, ANALYSIS_WORKERS, ANALYSIS_QUEUE_DEPTH
+)
+from services.analysis_cache import (
+    get_cached_analysis, store_analysis, invalidate_date, cache_stats, is_closed_day
+)
+from services.daily_rollups import backfill_rollups, delete_rollup, rollup_writer
+from services.range_analysis import analyze_date_range, DATE_RANGE_MAX_DAYS
+from services.trend_analysis import analyze_trends, TRENDS_MAX_DAYS
+from services.sentiment_worker import sentiment_worker, start_sentiment_worker, stop_sentiment_worker
+from services.live_counters import live_counters, start_live_counters, stop_live_counters
+from services.live_stream import DailyStreamHub, StreamFull, STREAM_KEEPALIVE_SECONDS
+from services.student_count import student_counter, start_student_count_watcher, stop_student_count_watcher
+from services.indexes import provision_indexes, explain_hot_queries
+from services.warmup import startup_warmup, start_startup_warmup
+from utils.chart_cache import chart_cache
+from utils.chart_generator import (
+    CHART_METHODS, CHART_RENDER_MODE, start_render_pool, shutdown_render_pool,
+    RENDER_PROFILES, DEFAULT_RENDER_PROFILE, MEDIA_TYPES,
+    get_chart_key, render_chart_image, summarize_top_comments
+)
+from utils.sentiment import sentiment_engine
+from utils.database import DatabaseConnection, init_client, close_client, MONGO_MAX_POOL_SIZE
+from utils.metrics import METRICS_ENABLED, observe_request, render_metrics, stats_collector
+from utils.logger import get_logger, request_id_var, logging_stats
 
 # Load environment variables
 load_dotenv()
 
+logger = get_logger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources on startup and release them on shutdown"""
+    # One pooled MongoClient per process, borrowed by every request
+    init_client()
+    # Create the indexes the analytics queries need (idempotent)
+    provision_indexes()
+    # Bounded pool that keeps blocking analysis work off the event loop
+    start_executor()
+    # Keeps the registered-student count fresh off the request path
+    start_student_count_watcher()
+    if CHART_RENDER_MODE == 'process':
+        start_render_pool()
+    # Optional synthetic render + sentiment priming; /health is not ready until it finishes
+    start_startup_warmup()
+    # Optional background scoring of new comments into the sentiment side collection
+    start_sentiment_worker()
+    # Optional in-memory counters for today; every change drops today's cached analysis
+    live_counters.add_listener(invalidate_date)
+    # SSE subscribers are pushed an update after each (debounced) change
+    stream_hub.start(asyncio.get_running_loop())
+    live_counters.add_listener(stream_hub.notify_threadsafe)
+    start_live_counters()
+    yield
+    stop_live_counters()
+    stream_hub.stop()
+    stop_sentiment_worker()
+    stop_student_count_watcher()
+    shutdown_executor()
+    shutdown_render_pool()
+    close_client()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Hostel Flavour Analytics API",
     description="Analytics microservice for hostel food feedback analysis",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # Get allowed origins from environment
 allowed_origins = os.getenv("CORS_ORIGINS", "*").split(",")
 
+# Optional shared secret for admin endpoints (unset = open, as on an internal network)
+admin_token = os.getenv("ANALYTICS_ADMIN_TOKEN")
+
+
+def require_admin(token: Optional[str]):
+    """Reject admin calls without the configured token"""
+    if admin_token and token != admin_token:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
@@ -39,6 +115,43 @@ app.add_middleware(
 )
 
 
+async def record_request_metrics(request: Request, call_next):
+    """Count requests and time them until the response starts, labelled by route template"""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Path template (/api/analytics/daily/{date}), so dates do not become labels
+        route = request.scope.get("route")
+        observe_request(request.method, getattr(route, "path", "unmatched"), status,
+                        time.perf_counter() - start)
+
+
+if METRICS_ENABLED:
+    app.middleware("http")(record_request_metrics)
+
+# Caller-supplied IDs are kept only if they are short and header-safe
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+@app.middleware("http")
+async def assign_request_id(request: Request, call_next):
+    """Tag the request, and every log record it produces, with an ID echoed as X-Request-ID"""
+    request_id = request.headers.get("x-request-id")
+    if not request_id or not REQUEST_ID_PATTERN.match(request_id):
+        request_id = uuid.uuid4().hex[:16]
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -51,28 +164,132 @@ async def root():
 
 
 @app.get("/health")
-async def health_check():
-    """Detailed health check with database connectivity"""
+def health_check():
+    """
+    Detailed health check with database connectivity (sync: runs in threadpool)
+
+    503 while the startup warm-up is still running, so load balancers hold
+    traffic until the rendering stack is warm.
+    """
     db_conn = DatabaseConnection()
-    db_status = db_conn.connect()
+    db_status = db_conn.ping()
     
     health_info = {
         "status": "healthy" if db_status else "unhealthy",
+        "ready": startup_warmup.ready,
         "database": "connected" if db_status else "disconnected",
+        "warmup": startup_warmup.stats(),
         "timestamp": datetime.now().isoformat(),
         "environment": os.getenv("ENVIRONMENT", "development")
     }
     
-    if db_status:
-        db_conn.close()
+    db_conn.close()
+    
+    if not startup_warmup.ready:
+        health_info["status"] = "warming"
+        return JSONResponse(status_code=503, content=health_info)
     
     return health_info
 
 
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Prometheus scrape endpoint (sync: runs in threadpool)"""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+async def load_daily_analysis(date: str, include_charts: bool, profile: Optional[str] = None):
+    """Serve a daily analysis from cache or compute it on the analysis executor"""
+    cached = get_cached_analysis(date, include_charts, profile)
+    if cached is not None:
+        return cached
+    
+    logger.debug("Analysis started", extra={"date": date, "includeCharts": include_charts, "sampled": True})
+    start = time.perf_counter()
+    # Decided now: a day that closes mid-computation must not be cached forever
+    closed = is_closed_day(date)
+    
+    # Today's numbers come from the live counters when they are running
+    live_snapshot = live_counters.snapshot(date)
+    
+    # Perform analysis on the bounded executor so the event loop stays free
+    result = await run_daily_analysis(date, include_charts, profile, live_snapshot)
+    
+    logger.info("Analysis completed", extra={
+        "date": date, "includeCharts": include_charts, "status": result.get("status", "unknown"),
+        "durationMs": round((time.perf_counter() - start) * 1000, 1)
+    })
+    
+    # A result built from counters that changed meanwhile is served but not cached
+    stale = live_snapshot is not None and live_snapshot['version'] != live_counters.version
+    if not result.get("error") and not stale:
+        store_analysis(date, include_charts, result, profile, closed=closed)
+    
+    return result
+
+
+# One shared, chart-less computation per date fans out to every open stream
+stream_hub = DailyStreamHub(lambda date: load_daily_analysis(date, False))
+
+# Read from the services' stats() on each scrape
+stats_collector.add("analytics_analyses_in_flight", "Analyses running or queued on the analysis pool",
+                    get_pending_count)
+stats_collector.add("analytics_analysis_capacity", "Analyses accepted before answering 503",
+                    lambda: ANALYSIS_WORKERS + ANALYSIS_QUEUE_DEPTH)
+stats_collector.add("analytics_cache_entries", "Entries per in-process cache", lambda: {
+    "analysis": cache_stats()["entries"],
+    "charts": chart_cache.stats()["entries"],
+    "sentiment": sentiment_engine.memory.stats()["entries"]
+}, label="cache")
+stats_collector.add("analytics_cache_bytes", "Estimated bytes held per in-process cache", lambda: {
+    "analysis": cache_stats()["bytes"],
+    "charts": chart_cache.stats()["bytes"]
+}, label="cache")
+stats_collector.add("analytics_cache_hits", "Cache hits", lambda: {
+    "analysis": cache_stats()["hits"],
+    "charts": chart_cache.stats()["hits"],
+    "sentiment": sentiment_engine.memory.stats()["hits"]
+}, label="cache", kind="counter")
+stats_collector.add("analytics_cache_misses", "Cache misses", lambda: {
+    "analysis": cache_stats()["misses"],
+    "charts": chart_cache.stats()["misses"],
+    "sentiment": sentiment_engine.memory.stats()["misses"]
+}, label="cache", kind="counter")
+stats_collector.add("analytics_mongo_pool_max_size", "maxPoolSize of the MongoDB client",
+                    lambda: MONGO_MAX_POOL_SIZE)
+stats_collector.add("analytics_stream_subscribers", "Open live stream connections",
+                    lambda: stream_hub.subscriber_count)
+
+
+def validate_profile(profile: Optional[str]):
+    """Reject unknown render profiles with a 400"""
+    if profile is not None and profile not in RENDER_PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown profile '{profile}'. Use one of: {', '.join(RENDER_PROFILES)}"
+        )
+
+
+def chart_urls(date: str, profile: Optional[str] = None):
+    """Chart image URLs for a date, keyed like the inline charts object"""
+    profile = profile or DEFAULT_RENDER_PROFILE
+    ext = RENDER_PROFILES[profile]['format']
+    return {
+        name: {'url': f"/api/analytics/daily/{date}/charts/{name}.{ext}?profile={profile}"}
+        for name in CHART_METHODS
+    }
+
+
 @app.get("/api/analytics/daily/{date}")
 async def get_daily_analysis(
     date: str,
-    include_charts: bool = Query(True, description="Include base64 chart images")
+    include_charts: bool = Query(True, description="Include base64 chart images"),
+    chart_mode: str = Query("inline", pattern="^(inline|url)$",
+                            description="inline: base64 data URIs, url: links to image endpoints"),
+    profile: Optional[str] = Query(None, description="Chart render profile: thumbnail, web, default, print, webp, svg")
 ):
     """
     Get comprehensive daily analytics for a specific date
@@ -80,24 +297,25 @@ async def get_daily_analysis(
     Args:
         date: Date in YYYY-MM-DD format
         include_charts: Whether to include base64 encoded charts (default: True)
+        chart_mode: "inline" embeds base64 charts, "url" returns chart URLs so
+                    the numbers are not held back by rendering
+        profile: Chart output profile (format, DPI), see RENDER_PROFILES
     
     Returns:
         Comprehensive analytics data with charts
     """
-    import traceback
-    import sys
-    
     # Validate date format
     try:
         requested_date = datetime.strptime(date, '%Y-%m-%d')
     except ValueError as e:
-        error_msg = f"Invalid date format: {str(e)}"
-        print(f"ERROR: {error_msg}", file=sys.stderr)
+        logger.error("Invalid date format", extra={"date": date, "error": str(e)})
         raise HTTPException(
             status_code=400,
             detail="Invalid date format. Use YYYY-MM-DD"
         )
     
+    validate_profile(profile)
+    
     # Check if date is in the future
     today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
     if requested_date > today:
@@ -120,60 +338,312 @@ async def get_daily_analysis(
         )
     
     try:
-        print(f"INFO: Starting analysis for date: {date}, include_charts: {include_charts}", file=sys.stderr)
-        
-        # Perform analysis
-        result = analyze_daily_feedback(date, include_charts=include_charts)
-        
-        print(f"INFO: Analysis completed with status: {result.get('status', 'unknown')}", file=sys.stderr)
+        url_mode = include_charts and chart_mode == "url"
+        result = await load_daily_analysis(date, include_charts and not url_mode, profile)
         
         if result.get("error"):
             error_msg = result.get("message", "Analysis failed")
-            print(f"ERROR: Analysis returned error: {error_msg}", file=sys.stderr)
+            logger.error("Analysis returned error", extra={"date": date, "error": error_msg})
             raise HTTPException(
                 status_code=500,
                 detail=error_msg
             )
         
+        if url_mode and result.get("status") == "success":
+            charts = chart_urls(date, profile)
+            # Top comments are text, so they stay in the JSON
+            charts['sentiment']['topComments'] = await run_in_executor(
+                summarize_top_comments, result["data"].get("allComments", [])
+            )
+            result = {**result, "charts": charts}
+        
         return JSONResponse(content=result)
         
     except HTTPException:
         raise
+    except AnalysisQueueFull as e:
+        logger.warning(str(e))
+        raise HTTPException(
+            status_code=503,
+            detail=str(e)
+        )
     except Exception as e:
-        error_trace = traceback.format_exc()
-        print(f"ERROR: Daily analysis exception: {str(e)}", file=sys.stderr)
-        print(f"TRACEBACK:\n{error_trace}", file=sys.stderr)
+        logger.exception("Daily analysis exception", extra={"date": date})
         raise HTTPException(
             status_code=500,
             detail=f"Daily analysis failed: {str(e)}"
         )
 
 
+@app.get("/api/analytics/daily/{date}/stream")
+async def stream_daily_analysis(date: str, request: Request):
+    """
+    Server-Sent Events stream of a date's overview and per-meal figures
+    
+    An `analytics` event is sent on connect and whenever new feedback changes
+    the numbers (debounced). All subscribers of a date share one computation.
+    """
+    try:
+        datetime.strptime(date, '%Y-%m-%d')
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    try:
+        queue = stream_hub.subscribe(date)
+    except StreamFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    async def events():
+        try:
+            # Reconnect delay for EventSource clients, in milliseconds
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    yield await asyncio.wait_for(queue.get(), STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            stream_hub.unsubscribe(date, queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# Profile used when a chart is requested by extension without ?profile=
+EXTENSION_PROFILES = {
+    'png': DEFAULT_RENDER_PROFILE if RENDER_PROFILES[DEFAULT_RENDER_PROFILE]['format'] == 'png' else 'default',
+    'webp': 'webp',
+    'svg': 'svg'
+}
+
+
+@app.get("/api/analytics/daily/{date}/charts/{name}.{ext}")
+async def get_daily_chart(
+    date: str,
+    name: str,
+    ext: str,
+    profile: Optional[str] = Query(None, description="Render profile, must match the extension"),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Raw image for one daily chart (avgRatings, distribution, sentiment, participation)
+    
+    The ETag is the content hash of the chart's inputs, so revalidation never renders.
+    """
+    if name not in CHART_METHODS:
+        raise HTTPException(status_code=404, detail=f"Unknown chart: {name}")
+    if ext not in EXTENSION_PROFILES:
+        raise HTTPException(status_code=404, detail=f"Unsupported format: {ext}")
+    
+    validate_profile(profile)
+    profile = profile or EXTENSION_PROFILES[ext]
+    if RENDER_PROFILES[profile]['format'] != ext:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Profile '{profile}' renders {RENDER_PROFILES[profile]['format']}, not {ext}"
+        )
+    
+    try:
+        datetime.strptime(date, '%Y-%m-%d')
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    try:
+        result = await load_daily_analysis(date, False)
+    except AnalysisQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    if result.get("error"):
+        raise HTTPException(status_code=500, detail=result.get("message", "Analysis failed"))
+    if result.get("status") != "success":
+        raise HTTPException(status_code=404, detail="No chart available for this date")
+    
+    data = result["data"]
+    etag = f'"{get_chart_key(name, data, profile)}"'
+    headers = {
+        "ETag": etag,
+        # Closed days never change; today must revalidate (cheap, thanks to the ETag)
+        "Cache-Control": "public, max-age=86400" if is_closed_day(date) else "no-cache"
+    }
+    
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    
+    try:
+        image = await run_in_executor(render_chart_image, name, data, profile)
+    except AnalysisQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    if image is None:
+        raise HTTPException(status_code=404, detail="No chart available for this date")
+    
+    return Response(content=image, media_type=MEDIA_TYPES[ext], headers=headers)
+
+
+@app.get("/api/analytics/cache/stats")
+async def get_cache_stats(x_admin_token: Optional[str] = Header(None)):
+    """Hit/miss counters and memory usage of the analysis, chart and sentiment caches, live counters state"""
+    require_admin(x_admin_token)
+    return {
+        "status": "success",
+        "cache": cache_stats(),
+        "charts": chart_cache.stats(),
+        "sentiment": {**sentiment_engine.stats(), "worker": sentiment_worker.stats()},
+        "live": live_counters.stats(),
+        "streams": stream_hub.stats(),
+        "students": student_counter.stats(),
+        "rollups": rollup_writer.stats(),
+        "logging": logging_stats()
+    }
+
+
+@app.delete("/api/analytics/cache/{date}")
+async def invalidate_daily_cache(date: str, x_admin_token: Optional[str] = Header(None)):
+    """Drop cached analysis and the rollup for a date (e.g. after feedback was corrected)"""
+    require_admin(x_admin_token)
+    removed = invalidate_date(date)
+    rollup_removed = await run_in_executor(delete_rollup, date)
+    return {
+        "status": "success",
+        "date": date,
+        "removed": removed,
+        "rollupRemoved": rollup_removed
+    }
+
+
+@app.get("/api/analytics/diagnostics/query-plans")
+async def get_query_plans(
+    date: Optional[str] = Query(None, description="Date the queries are explained for (YYYY-MM-DD), default today"),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """
+    Explain each hot query and check the declared indexes
+    
+    Reports plan stages, indexes used, COLLSCANs, covered plans and documents
+    and keys examined per query.
+    """
+    require_admin(x_admin_token)
+    if date is not None:
+        try:
+            datetime.strptime(date, '%Y-%m-%d')
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    try:
+        result = await run_in_executor(explain_hot_queries, date)
+    except AnalysisQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    if result.get("error"):
+        raise HTTPException(status_code=500, detail=result.get("message", "Query plan check failed"))
+    
+    return JSONResponse(content=result)
+
+
+@app.post("/api/analytics/rollups/backfill")
+async def backfill_daily_rollups(
+    start_date: str = Query(..., description="First date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Last date (YYYY-MM-DD), default today"),
+    force: bool = Query(False, description="Recompute days that already have a rollup"),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """Build daily_rollups documents for a window of history"""
+    require_admin(x_admin_token)
+    try:
+        start = datetime.strptime(start_date, '%Y-%m-%d')
+        end = datetime.strptime(end_date, '%Y-%m-%d') if end_date else datetime.now()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    try:
+        computed = await run_in_executor(backfill_rollups, start, end, force)
+    except AnalysisQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return {
+        "status": "success",
+        "startDate": start_date,
+        "endDate": end.strftime('%Y-%m-%d'),
+        "computed": computed
+    }
+
+
 @app.get("/api/analytics/date-range")
 async def get_date_range_analysis(
     start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
     end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
 ):
     """
-    Get analytics for a date range (future enhancement)
+    Get analytics for a date range (inclusive)
+    
+    Returns the overview, per-meal averages, distributions and consistency
+    score over the whole window plus a per-day series. Reads daily_rollups,
+    so a semester is a few hundred tiny documents.
     """
-    return {
-        "status": "not_implemented",
-        "message": "Date range analysis will be available in future version"
-    }
+    try:
+        start = datetime.strptime(start_date, '%Y-%m-%d')
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    if end < start:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    if (end - start).days + 1 > DATE_RANGE_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range too long, at most {DATE_RANGE_MAX_DAYS} days"
+        )
+    
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    if start > today:
+        return {
+            "status": "no_data",
+            "message": f"Feedback will be available after {start_date}",
+            "startDate": start_date,
+            "endDate": end_date,
+            "type": "future_date"
+        }
+    
+    try:
+        result = await run_in_executor(analyze_date_range, start_date, end_date)
+    except AnalysisQueueFull as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    if result.get("error"):
+        error_msg = result.get("message", "Analysis failed")
+        logger.error("Range analysis returned error", extra={"startDate": start_date, "endDate": end_date,
+                                                              "error": error_msg})
+        raise HTTPException(status_code=500, detail=error_msg)
+    
+    return JSONResponse(content=result)
 
 
 @app.get("/api/analytics/trends")
 async def get_trends(
-    days: int = Query(7, description="Number of days to analyze", ge=1, le=30)
+    days: int = Query(7, description="Number of days to analyze", ge=1, le=TRENDS_MAX_DAYS)
 ):
     """
-    Get trend analysis for the last N days (future enhancement)
+    Get trend analysis for the last N days
+    
+    Per-meal daily and 7-day rolling averages, 7-day moving participation,
+    week-over-week deltas and least-squares trend slopes.
     """
-    return {
-        "status": "not_implemented",
-        "message": "Trend analysis will be available in future version"
-    }
+    try:
+        result = await run_in_executor(analyze_trends, days)
+    except AnalysisQueueFull as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    if result.get("error"):
+        error_msg = result.get("message", "Analysis failed")
+        logger.error("Trend analysis returned error", extra={"days": days, "error": error_msg})
+        raise HTTPException(status_code=500, detail=error_msg)
+    
+    return JSONResponse(content=result)
 
 
 # Error handlers
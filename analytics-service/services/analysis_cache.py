@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Daily Analysis Cache Module
+Caches analyze_daily_feedback results: closed days never change, today gets a short TTL
+"""
+
+import os
+import sys
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.database import get_ist_today
+from utils.result_cache import ResultCache
+from utils.chart_generator import DEFAULT_RENDER_PROFILE
+
+# Cache settings
+ANALYTICS_CACHE_MAX_MB = float(os.getenv('ANALYTICS_CACHE_MAX_MB', '64'))
+ANALYTICS_CACHE_TODAY_TTL = int(os.getenv('ANALYTICS_CACHE_TODAY_TTL', '60'))
+
+daily_cache = ResultCache(int(ANALYTICS_CACHE_MAX_MB * 1024 * 1024), name='daily_analysis')
+
+
+def is_closed_day(date_str):
+    """A day is closed once the IST date has moved past it"""
+    try:
+        return datetime.strptime(date_str, '%Y-%m-%d') < get_ist_today()
+    except ValueError:
+        return False
+
+
+def cache_key(date_str, include_charts, chart_profile=None):
+    """(date, render profile) - profile is None for chart-less results"""
+    if not include_charts:
+        return (date_str, None)
+    return (date_str, chart_profile or DEFAULT_RENDER_PROFILE)
+
+
+def get_cached_analysis(date_str, include_charts, chart_profile=None):
+    """
+    Look up a cached result for (date, include_charts, profile)
+
+    A chart-less request is also served from a cached default-profile chart result.
+    """
+    if not include_charts:
+        with_charts = daily_cache.get(cache_key(date_str, True), record=False)
+        if with_charts is not None:
+            daily_cache.record_hit()
+            return {**with_charts, "charts": None}
+    return daily_cache.get(cache_key(date_str, include_charts, chart_profile))
+
+
+def store_analysis(date_str, include_charts, result, chart_profile=None, closed=None):
+    """
+    Cache a finished analysis; errors are never cached
+
+    closed is is_closed_day() taken before the computation started: a day
+    that closed while it ran may hold partial numbers, so it keeps the
+    short TTL (checked now when not given).
+    """
+    if result.get("error") or result.get("type") == "future_date":
+        return False
+    if closed is None:
+        closed = is_closed_day(date_str)
+    ttl = None if closed else ANALYTICS_CACHE_TODAY_TTL
+    return daily_cache.set(cache_key(date_str, include_charts, chart_profile), result, ttl=ttl)
+
+
+def invalidate_date(date_str):
+    """Drop every cached variant of a date, return how many entries were removed"""
+    return daily_cache.invalidate(lambda key: key[0] == date_str)
+
+
+def cache_stats():
+    """Hit/miss counters and memory usage of the daily cache"""
+    return daily_cache.stats()
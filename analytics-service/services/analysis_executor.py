@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Analysis Executor Module
+Runs the blocking daily analysis (PyMongo I/O + matplotlib) off the event loop
+on a bounded thread or process pool
+"""
+
+import os
+import sys
+import asyncio
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.daily_analysis_core import analyze_daily_feedback
+from utils.chart_generator import CHART_RENDER_MODE, disable_render_pool
+from utils.logger import get_logger, current_request_id, run_with_request_id
+
+logger = get_logger(__name__)
+
+# Executor settings
+# "thread": Mongo I/O runs concurrently, chart rendering is serialized (pyplot is not thread-safe)
+# "process": each worker has its own interpreter, so rendering scales with cores
+ANALYSIS_EXECUTOR = os.getenv('ANALYSIS_EXECUTOR', 'thread').lower()
+ANALYSIS_WORKERS = int(os.getenv('ANALYSIS_WORKERS', '2'))
+ANALYSIS_QUEUE_DEPTH = int(os.getenv('ANALYSIS_QUEUE_DEPTH', '8'))
+
+_executor = None
+_pending = 0
+
+
+class AnalysisQueueFull(Exception):
+    """Raised when the number of queued analyses exceeds the configured depth"""
+    pass
+
+
+def start_executor():
+    """Create the analysis pool (idempotent)"""
+    global _executor
+    if _executor is None:
+        if ANALYSIS_EXECUTOR == 'process':
+            # Workers already render in parallel with each other; a render pool
+            # per worker would nest pools, so they (and this process) render serially
+            disable_render_pool()
+            # spawn: never fork a process that already holds a MongoClient
+            _executor = ProcessPoolExecutor(
+                max_workers=ANALYSIS_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=disable_render_pool
+            )
+            if CHART_RENDER_MODE == 'process':
+                logger.info("Chart render pool disabled, analysis workers render serially")
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=ANALYSIS_WORKERS,
+                thread_name_prefix='analysis'
+            )
+        logger.info("Analysis executor started", extra={
+            "executor": ANALYSIS_EXECUTOR, "workers": ANALYSIS_WORKERS, "queueDepth": ANALYSIS_QUEUE_DEPTH
+        })
+    return _executor
+
+
+def shutdown_executor():
+    """Shut the analysis pool down, waiting for running analyses"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+def get_pending_count():
+    """Number of analyses currently running or waiting for a worker"""
+    return _pending
+
+
+async def run_in_executor(func, *args):
+    """
+    Run a blocking callable on the analysis pool without blocking the event loop
+
+    Raises:
+        AnalysisQueueFull: when all workers are busy and the queue is full
+    """
+    global _pending
+    if _pending >= ANALYSIS_WORKERS + ANALYSIS_QUEUE_DEPTH:
+        raise AnalysisQueueFull(
+            f"Analytics service busy ({_pending} analyses in progress), try again shortly"
+        )
+
+    executor = start_executor()
+    loop = asyncio.get_running_loop()
+    _pending += 1
+    try:
+        # Executor threads/processes do not inherit the request context, so carry the ID along
+        return await loop.run_in_executor(executor, run_with_request_id, current_request_id(), func, *args)
+    finally:
+        _pending -= 1
+
+
+async def run_daily_analysis(date_str, include_charts=True, chart_profile=None, live_snapshot=None):
+    """Run analyze_daily_feedback on the analysis pool"""
+    return await run_in_executor(analyze_daily_feedback, date_str, include_charts, chart_profile, live_snapshot)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Collection Tailer Module
+Background thread following one collection (feedbacks by default): a change
+stream where the server supports one (replica sets, Atlas), a subclass-defined
+poll on standalone servers. Subclasses implement prepare(), handle_change() and
+poll().
+"""
+
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo.errors import OperationFailure
+
+from utils.database import DatabaseConnection
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CHANGE_STREAM_OPERATIONS = ['insert', 'update', 'replace', 'delete']
+
+
+class CollectionTailer:
+    # Thread name and log prefix
+    name = 'collection-tailer'
+    # Collection whose change stream is followed
+    collection = 'feedbacks'
+
+    def __init__(self, mode='auto', poll_interval=15):
+        # auto: change stream, falling back to polling; or force change_stream / poll
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.active_mode = None
+        self.last_event_at = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._resume_token = None
+        self._db_conn = DatabaseConnection()
+
+    def start(self):
+        """Run on a daemon thread (idempotent)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5):
+        """Ask the thread to stop and wait briefly for it"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def db(self):
+        if self._db_conn.db is None:
+            self._db_conn.connect()
+        return self._db_conn.db
+
+    def _run(self):
+        try:
+            self.prepare()
+        except Exception as e:
+            logger.warning("Tailer startup failed", extra={"tailer": self.name, "error": str(e)})
+
+        while not self._stop.is_set():
+            try:
+                if self.mode in ('auto', 'change_stream'):
+                    try:
+                        self._tail_change_stream()
+                    except OperationFailure as e:
+                        # Standalone servers do not support change streams
+                        if self.mode == 'change_stream':
+                            raise
+                        logger.info("Change streams unavailable, polling instead",
+                                    extra={"tailer": self.name, "error": str(e)})
+                        self.mode = 'poll'
+                        continue
+                else:
+                    self._poll_loop()
+            except Exception as e:
+                logger.warning("Tailer error", extra={"tailer": self.name, "error": str(e)})
+                self._stop.wait(self.poll_interval)
+
+    def _tail_change_stream(self):
+        """Follow inserts/updates/deletes on the collection until stopped"""
+        watched = self.db[self.collection]
+        with watched.watch(self.change_stream_pipeline(), full_document='updateLookup',
+                           resume_after=self._resume_token, max_await_time_ms=1000) as stream:
+            self.active_mode = 'change_stream'
+            logger.info("Following change stream", extra={"tailer": self.name, "collection": self.collection})
+            while not self._stop.is_set():
+                change = stream.try_next()
+                self._resume_token = stream.resume_token
+                if change is not None:
+                    self.last_event_at = datetime.now(timezone.utc)
+                    self.handle_change(change)
+                self.tick()
+
+    def _poll_loop(self):
+        """Call poll() every poll_interval seconds, right away while it reports a backlog"""
+        self.active_mode = 'poll'
+        backlog = False
+        while not self._stop.is_set():
+            if not backlog:
+                self._stop.wait(self.poll_interval)
+                if self._stop.is_set():
+                    break
+            self.tick()
+            backlog = self.poll()
+
+    def change_stream_pipeline(self):
+        """Server-side filter for the change stream"""
+        return [{'$match': {'operationType': {'$in': CHANGE_STREAM_OPERATIONS}}}]
+
+    def prepare(self):
+        """Runs once on the thread before tailing starts (indexes, backfill, initial load)"""
+
+    def handle_change(self, change):
+        """Apply one change stream event"""
+        raise NotImplementedError
+
+    def poll(self):
+        """Fetch and apply changes since the last poll; return True when more are waiting"""
+        raise NotImplementedError
+
+    def tick(self):
+        """Housekeeping between events (e.g. day rollover)"""
@@ -12,8 +12,25 @@ from collections import Counter
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from services.student_count import headcount_for
 from utils.database import DatabaseConnection, get_date_range
 from utils.chart_generator import ChartGenerator
+from utils.metrics import stage_timer, timed_iter
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MEAL_TYPES = ['morning', 'afternoon', 'evening', 'night']
+MEAL_NAMES = {
+    'morning': 'Breakfast',
+    'afternoon': 'Lunch',
+    'evening': 'Dinner',
+    'night': 'Night Snacks'
+}
+STAR_VALUES = [1, 2, 3, 4, 5]
+
+# Documents per round trip when streaming comments
+FEEDBACK_BATCH_SIZE = int(os.getenv('FEEDBACK_BATCH_SIZE', '500'))
 
 
 def classify_sentiment(rating):
@@ -26,7 +43,7 @@ def classify_sentiment(rating):
         return 'neutral'
 
 
-def calculate_quality_consistency(meal_ratings, meal_types):
+def calculate_quality_consistency(meal_stats, meal_types):
     """
     Calculate Quality Consistency Score (0-100)
     Measures how consistent food quality is across all meals
@@ -34,8 +51,8 @@ def calculate_quality_consistency(meal_ratings, meal_types):
     """
     valid_meal_ratings = []
     for meal_type in meal_types:
-        if meal_ratings[meal_type]:
-            avg = sum(meal_ratings[meal_type]) / len(meal_ratings[meal_type])
+        if meal_stats[meal_type]['count']:
+            avg = meal_stats[meal_type]['sum'] / meal_stats[meal_type]['count']
             valid_meal_ratings.append(avg)
     
     if len(valid_meal_ratings) < 2:
@@ -57,6 +74,284 @@ def calculate_quality_consistency(meal_ratings, meal_types):
     return round(consistency_score, 1)
 
 
+def empty_meal_stats():
+    """Zeroed per-meal statistics, matching one group of the stats pipeline"""
+    return {
+        'count': 0,
+        'sum': 0,
+        'sum_sq': 0,
+        'positive': 0,
+        'negative': 0,
+        'histogram': {star: 0 for star in STAR_VALUES}
+    }
+
+
+def meal_group_stage(group_id):
+    """$group over {m, v} rows: count, sum, sum of squares, sentiment buckets and star histogram"""
+    meal_group = {
+        '_id': group_id,
+        'count': {'$sum': 1},
+        'sum': {'$sum': '$v'},
+        'sum_sq': {'$sum': {'$multiply': ['$v', '$v']}},
+        'positive': {'$sum': {'$cond': [{'$gte': ['$v', 4]}, 1, 0]}},
+        'negative': {'$sum': {'$cond': [{'$lte': ['$v', 2]}, 1, 0]}}
+    }
+    for star in STAR_VALUES:
+        meal_group[f'star_{star}'] = {'$sum': {'$cond': [{'$eq': ['$v', star]}, 1, 0]}}
+    return meal_group
+
+
+def unpack_meal_group(stats, group):
+    """Copy one meal_group_stage result into an empty_meal_stats() dict"""
+    for key in ('count', 'sum', 'sum_sq', 'positive', 'negative'):
+        stats[key] = group[key]
+    stats['histogram'] = {star: group[f'star_{star}'] for star in STAR_VALUES}
+    return stats
+
+
+# Rated meals only, as (day, m, v) rows after $objectToArray/$unwind
+RATED_MEAL_MATCH = {'meal.k': {'$in': MEAL_TYPES}, 'meal.v.rating': {'$ne': None}}
+
+
+# Fields the stats pipeline reads; all of them are in the feedbacks ratings index
+RATINGS_PROJECTION = {'_id': 0, **{f'meals.{meal}.rating': 1 for meal in MEAL_TYPES}}
+
+
+def build_daily_stats_pipeline(start_date, end_date):
+    """
+    Build the aggregation pipeline for the numeric part of the daily report
+
+    Returns one document with three facets:
+        documents: number of feedback documents for the day
+        participants: documents with at least one rated meal
+        meals: per-meal count, sum, sum of squares, sentiment buckets and star histogram
+    """
+    return [
+        {'$match': {'date': {'$gte': start_date, '$lt': end_date}}},
+        # Ratings only: with the (date, meals.*.rating) index the scan is covered
+        {'$project': RATINGS_PROJECTION},
+        {'$facet': {
+            'documents': [{'$count': 'count'}],
+            'participants': [
+                {'$match': {'$or': [
+                    {f'meals.{meal}.rating': {'$ne': None}} for meal in MEAL_TYPES
+                ]}},
+                {'$count': 'count'}
+            ],
+            'meals': [
+                {'$project': {'_id': 0, 'meal': {'$objectToArray': '$meals'}}},
+                {'$unwind': '$meal'},
+                {'$match': RATED_MEAL_MATCH},
+                {'$project': {'m': '$meal.k', 'v': '$meal.v.rating'}},
+                {'$group': meal_group_stage('$m')}
+            ]
+        }}
+    ]
+
+
+def fetch_daily_stats(feedback_collection, start_date, end_date):
+    """
+    Run the stats pipeline and unpack it
+
+    Returns:
+        (document_count, participating_students, meal_stats keyed by meal type)
+    """
+    result = next(feedback_collection.aggregate(build_daily_stats_pipeline(start_date, end_date)), {})
+    
+    documents = result.get('documents') or [{'count': 0}]
+    participants = result.get('participants') or [{'count': 0}]
+    
+    meal_stats = {meal: empty_meal_stats() for meal in MEAL_TYPES}
+    for group in result.get('meals', []):
+        stats = meal_stats.get(group['_id'])
+        if stats is None:
+            continue
+        unpack_meal_group(stats, group)
+    
+    return documents[0]['count'], participants[0]['count'], meal_stats
+
+
+def build_range_stats_pipeline(start_date, end_date):
+    """
+    The daily stats for every day of a window in one pass
+
+    Feedback is bucketed with $dateTrunc (MongoDB 5.0+) and each facet groups
+    by that day, so a semester costs one aggregation instead of one per day.
+    """
+    return [
+        {'$match': {'date': {'$gte': start_date, '$lt': end_date}}},
+        {'$project': {
+            'day': {'$dateTrunc': {'date': '$date', 'unit': 'day'}},
+            'meal': {'$objectToArray': '$meals'}
+        }},
+        {'$facet': {
+            'documents': [
+                {'$group': {'_id': '$day', 'count': {'$sum': 1}}}
+            ],
+            'participants': [
+                {'$unwind': '$meal'},
+                {'$match': RATED_MEAL_MATCH},
+                {'$group': {'_id': {'day': '$day', 'doc': '$_id'}}},
+                {'$group': {'_id': '$_id.day', 'count': {'$sum': 1}}}
+            ],
+            'meals': [
+                {'$unwind': '$meal'},
+                {'$match': RATED_MEAL_MATCH},
+                {'$project': {'day': 1, 'm': '$meal.k', 'v': '$meal.v.rating'}},
+                {'$group': meal_group_stage({'day': '$day', 'm': '$m'})}
+            ]
+        }}
+    ]
+
+
+def fetch_range_stats(feedback_collection, start_date, end_date):
+    """
+    Run the range pipeline and unpack it per day
+
+    Returns:
+        {YYYY-MM-DD: (document_count, participating_students, meal_stats)}
+        for the days that have feedback
+    """
+    result = next(feedback_collection.aggregate(build_range_stats_pipeline(start_date, end_date)), {})
+    
+    days = {}
+    
+    def day_entry(day):
+        date_str = day.strftime('%Y-%m-%d')
+        if date_str not in days:
+            days[date_str] = [0, 0, {meal: empty_meal_stats() for meal in MEAL_TYPES}]
+        return days[date_str]
+    
+    for group in result.get('documents', []):
+        day_entry(group['_id'])[0] = group['count']
+    for group in result.get('participants', []):
+        day_entry(group['_id'])[1] = group['count']
+    for group in result.get('meals', []):
+        stats = day_entry(group['_id']['day'])[2].get(group['_id']['m'])
+        if stats is not None:
+            unpack_meal_group(stats, group)
+    
+    return {date_str: tuple(entry) for date_str, entry in days.items()}
+
+
+def build_meal_sections(meal_stats, improvement_areas=None):
+    """
+    Per-meal report sections from meal_stats, keyed by meal name
+
+    Returns:
+        (averageRatingPerMeal, studentRatingPerMeal, feedbackDistributionPerMeal,
+         sentimentAnalysisPerMeal)
+    """
+    improvement_areas = improvement_areas or {}
+    average_ratings_per_meal = {}
+    student_rating_per_meal = {}
+    feedback_distribution_per_meal = {}
+    sentiment_analysis_per_meal = {}
+    
+    for meal_type in MEAL_TYPES:
+        meal_name = MEAL_NAMES[meal_type]
+        stats = meal_stats[meal_type]
+        
+        # Calculate average ratings per meal
+        if stats['count']:
+            average_ratings_per_meal[meal_name] = round(stats['sum'] / stats['count'], 2)
+        else:
+            average_ratings_per_meal[meal_name] = 0
+        
+        # Calculate student participation per meal
+        student_rating_per_meal[meal_name] = stats['count']
+        
+        # Prepare feedback distribution per meal
+        histogram = stats['histogram']
+        feedback_distribution_per_meal[meal_name] = {
+            f"{star}_star": histogram[star] for star in STAR_VALUES
+        }
+        
+        # Sentiment analysis per meal
+        if stats['count']:
+            total_responses = stats['count']
+            positive_count = stats['positive']
+            negative_count = stats['negative']
+            neutral_count = total_responses - positive_count - negative_count
+            
+            positive_pct = (positive_count / total_responses * 100) if total_responses > 0 else 0
+            negative_pct = (negative_count / total_responses * 100) if total_responses > 0 else 0
+            
+            sentiment_counts = Counter({
+                'positive': positive_count,
+                'neutral': neutral_count,
+                'negative': negative_count
+            })
+            dominant = sentiment_counts.most_common(1)[0][0]
+            
+            avg_rating = stats['sum'] / total_responses
+            
+            sentiment_analysis_per_meal[meal_name] = {
+                "average_rating": round(avg_rating, 2),
+                "total_responses": total_responses,
+                "positive_percentage": round(positive_pct, 1),
+                "negative_percentage": round(negative_pct, 1),
+                "dominant_sentiment": dominant,
+                "improvement_areas": improvement_areas.get(meal_type, [])
+            }
+        else:
+            sentiment_analysis_per_meal[meal_name] = {
+                "average_rating": 0,
+                "total_responses": 0,
+                "positive_percentage": 0,
+                "negative_percentage": 0,
+                "dominant_sentiment": "none",
+                "improvement_areas": []
+            }
+    
+    return (average_ratings_per_meal, student_rating_per_meal,
+            feedback_distribution_per_meal, sentiment_analysis_per_meal)
+
+
+def overall_rating_of(meal_stats):
+    """Mean rating over every rated meal"""
+    total_ratings = sum(meal_stats[meal]['count'] for meal in MEAL_TYPES)
+    total_rating_sum = sum(meal_stats[meal]['sum'] for meal in MEAL_TYPES)
+    return total_rating_sum / total_ratings if total_ratings else 0
+
+
+def daily_comments_query(start_date, end_date):
+    """(filter, projection) for the feedback documents of a day that carry a comment"""
+    query = {
+        "date": {"$gte": start_date, "$lt": end_date},
+        "$or": [{f"meals.{meal}.comment": {"$gt": ""}} for meal in MEAL_TYPES]
+    }
+    projection = {"_id": 0}
+    for meal in MEAL_TYPES:
+        projection[f"meals.{meal}.rating"] = 1
+        projection[f"meals.{meal}.comment"] = 1
+    return query, projection
+
+
+def iter_daily_comments(feedback_collection, start_date, end_date, batch_size=None):
+    """
+    Stream (meal_type, rating, comment) for every rated meal with a comment
+
+    Only meals.*.rating and meals.*.comment are projected, documents without
+    any comment are filtered server-side, and the cursor is consumed batch by
+    batch so memory stays flat however many students submit.
+    """
+    query, projection = daily_comments_query(start_date, end_date)
+    cursor = feedback_collection.find(query, projection).batch_size(batch_size or FEEDBACK_BATCH_SIZE)
+    try:
+        for feedback in cursor:
+            meals = feedback.get('meals') or {}
+            for meal_type in MEAL_TYPES:
+                meal_data = meals.get(meal_type) or {}
+                rating = meal_data.get('rating')
+                comment = (meal_data.get('comment') or '').strip()
+                
+                if rating is not None and comment:
+                    yield meal_type, rating, comment
+    finally:
+        cursor.close()
+
+
 def generate_daily_summary(overall_rating, participation_rate, sentiment_analysis, consistency_score):
     """
     Generate a concise 3-4 line daily summary highlighting overall sentiment and trends
@@ -126,26 +421,87 @@ def generate_daily_summary(overall_rating, participation_rate, sentiment_analysi
     return " ".join(summary_lines)
 
 
-def analyze_daily_feedback(date_str: str, include_charts: bool = True) -> dict:
+def assemble_analysis_data(total_students, participating_students, meal_stats, comment_rows):
+    """
+    Daily report sections from the aggregated meal stats and the comment rows
+    (meal_type, rating, comment): overview, summary, per-meal sections and all comments
+    """
+    meal_types = MEAL_TYPES
+    meal_names = MEAL_NAMES
+    
+    improvement_areas = {meal: [] for meal in meal_types}
+    all_comments = []
+    
+    for meal_type, rating, comment in comment_rows:
+        all_comments.append({
+            'text': comment,
+            'meal': meal_names[meal_type],
+            'rating': rating
+        })
+        if rating <= 2 and len(improvement_areas[meal_type]) < 2:
+            improvement_areas[meal_type].append(comment)
+    
+    # Calculate overview metrics
+    overall_rating = overall_rating_of(meal_stats)
+    participation_rate = (participating_students / total_students * 100) if total_students > 0 else 0
+    
+    (average_ratings_per_meal, student_rating_per_meal,
+     feedback_distribution_per_meal, sentiment_analysis_per_meal) = build_meal_sections(
+        meal_stats, improvement_areas
+    )
+    
+    # Calculate Quality Consistency Score
+    quality_consistency_score = calculate_quality_consistency(meal_stats, meal_types)
+    
+    # Generate concise daily sentiment summary
+    daily_summary = generate_daily_summary(
+        overall_rating, 
+        participation_rate, 
+        sentiment_analysis_per_meal,
+        quality_consistency_score
+    )
+    
+    # Prepare analysis data
+    analysis_data = {
+        "overview": {
+            "totalStudents": total_students,
+            "participatingStudents": participating_students,
+            "participationRate": round(participation_rate, 1),
+            "overallRating": round(overall_rating, 2),
+            "qualityConsistencyScore": quality_consistency_score
+        },
+        "dailySummary": daily_summary,
+        "averageRatingPerMeal": average_ratings_per_meal,
+        "studentRatingPerMeal": student_rating_per_meal,
+        "feedbackDistributionPerMeal": feedback_distribution_per_meal,
+        "sentimentAnalysisPerMeal": sentiment_analysis_per_meal,
+        "allComments": all_comments
+    }
+    
+    return analysis_data
+
+
+def analyze_daily_feedback(date_str: str, include_charts: bool = True, chart_profile: str = None,
+                           live_snapshot: dict = None) -> dict:
     """
     Perform comprehensive daily analysis
     
     Args:
         date_str: Date in YYYY-MM-DD format
         include_charts: Whether to generate and include charts (default: True)
+        chart_profile: Render profile for charts (see RENDER_PROFILES, default: CHART_DEFAULT_PROFILE)
+        live_snapshot: Today's in-memory counters (LiveCounters.snapshot), used
+                       instead of aggregating the feedback collection
     
     Returns:
         Dictionary with analysis results
     """
-    import traceback
-    
-    print(f"DEBUG: Creating database connection", file=sys.stderr)
+    # Borrow the process-wide pooled client (no per-request handshake)
     db_conn = DatabaseConnection()
     
-    print(f"DEBUG: Attempting to connect to database", file=sys.stderr)
     if not db_conn.connect():
         error_msg = "Failed to connect to database"
-        print(f"ERROR: {error_msg}", file=sys.stderr)
+        logger.error(error_msg)
         return {
             "error": True,
             "message": error_msg,
@@ -179,22 +535,35 @@ def analyze_daily_feedback(date_str: str, include_charts: bool = True) -> dict:
         
         # Get collections
         feedback_collection = db_conn.get_feedback_collection()
-        users_collection = db_conn.get_users_collection()
         
-        # Get total registered students
-        total_students = users_collection.count_documents({"isAdmin": False})
+        # Registered students on that day (cached, no users scan per request)
+        total_students = headcount_for(db_conn.db, date_str)
         
-        # Fetch feedback data for the day
-        feedback_cursor = feedback_collection.find({
-            "date": {
-                "$gte": start_date,
-                "$lt": end_date
-            }
+        if live_snapshot is not None:
+            document_count = live_snapshot['documents']
+            participating_students = live_snapshot['participatingStudents']
+            meal_stats = live_snapshot['mealStats']
+        else:
+            # Numeric part of the report is aggregated server-side
+            with stage_timer('mongo_stats'):
+                document_count, participating_students, meal_stats = fetch_daily_stats(
+                    feedback_collection, start_date, end_date
+                )
+        logger.debug("Daily stats fetched", extra={
+            "date": date_str,
+            "documents": document_count,
+            "live": live_snapshot is not None,
+            "sampled": True
         })
+
+        # Keep the day's rollup in step with what was just aggregated
+        # (imported here: daily_rollups builds on this module)
+        from services.daily_rollups import write_through_rollup
+        write_through_rollup(
+            db_conn.db, date_str, document_count, participating_students, meal_stats, total_students
+        )
         
-        feedback_data = list(feedback_cursor)
-        
-        if not feedback_data:
+        if not document_count:
             return {
                 "status": "no_data",
                 "message": "No feedback found for this date",
@@ -210,157 +579,28 @@ def analyze_daily_feedback(date_str: str, include_charts: bool = True) -> dict:
                 }
             }
         
-        # Initialize data structures
-        meal_types = ['morning', 'afternoon', 'evening', 'night']
-        meal_names = {
-            'morning': 'Breakfast',
-            'afternoon': 'Lunch',
-            'evening': 'Dinner',
-            'night': 'Night Snacks'
-        }
-        
-        meal_ratings = {meal: [] for meal in meal_types}
-        meal_comments = {meal: [] for meal in meal_types}
-        rating_distribution = {meal: {1: 0, 2: 0, 3: 0, 4: 0, 5: 0} for meal in meal_types}
-        
-        all_ratings = []
-        all_comments = []
-        participating_students = 0
-        
-        # Process feedback data
-        for feedback in feedback_data:
-            user_has_feedback = False
-            
-            for meal_type in meal_types:
-                meal_data = feedback.get('meals', {}).get(meal_type, {})
-                rating = meal_data.get('rating')
-                comment = meal_data.get('comment', '')
-                
-                if rating is not None:
-                    meal_ratings[meal_type].append(rating)
-                    all_ratings.append(rating)
-                    rating_distribution[meal_type][rating] += 1
-                    user_has_feedback = True
-                    
-                    if comment and comment.strip():
-                        meal_comments[meal_type].append(comment.strip())
-                        all_comments.append({
-                            'text': comment.strip(),
-                            'meal': meal_names[meal_type],
-                            'rating': rating
-                        })
-            
-            if user_has_feedback:
-                participating_students += 1
-        
-        # Calculate overview metrics
-        overall_rating = sum(all_ratings) / len(all_ratings) if all_ratings else 0
-        participation_rate = (participating_students / total_students * 100) if total_students > 0 else 0
-        
-        # Calculate average ratings per meal
-        average_ratings_per_meal = {}
-        for meal_type in meal_types:
-            if meal_ratings[meal_type]:
-                avg = sum(meal_ratings[meal_type]) / len(meal_ratings[meal_type])
-                average_ratings_per_meal[meal_names[meal_type]] = round(avg, 2)
-            else:
-                average_ratings_per_meal[meal_names[meal_type]] = 0
-        
-        # Calculate student participation per meal
-        student_rating_per_meal = {}
-        for meal_type in meal_types:
-            student_rating_per_meal[meal_names[meal_type]] = len(meal_ratings[meal_type])
-        
-        # Prepare feedback distribution per meal
-        feedback_distribution_per_meal = {}
-        for meal_type in meal_types:
-            feedback_distribution_per_meal[meal_names[meal_type]] = {
-                "1_star": rating_distribution[meal_type][1],
-                "2_star": rating_distribution[meal_type][2],
-                "3_star": rating_distribution[meal_type][3],
-                "4_star": rating_distribution[meal_type][4],
-                "5_star": rating_distribution[meal_type][5]
-            }
-        
-        # Sentiment analysis per meal
-        sentiment_analysis_per_meal = {}
-        for meal_type in meal_types:
-            meal_name = meal_names[meal_type]
-            ratings = meal_ratings[meal_type]
-            comments = meal_comments[meal_type]
-            
-            if ratings:
-                sentiments = [classify_sentiment(r) for r in ratings]
-                sentiment_counts = Counter(sentiments)
-                
-                total_responses = len(ratings)
-                positive_count = sentiment_counts.get('positive', 0)
-                negative_count = sentiment_counts.get('negative', 0)
-                neutral_count = sentiment_counts.get('neutral', 0)
-                
-                positive_pct = (positive_count / total_responses * 100) if total_responses > 0 else 0
-                negative_pct = (negative_count / total_responses * 100) if total_responses > 0 else 0
-                
-                dominant = max(sentiment_counts.items(), key=lambda x: x[1])[0] if sentiment_counts else 'neutral'
-                
-                negative_comments = [comments[i] for i, r in enumerate(ratings) if r <= 2 and i < len(comments) and comments[i]][:2]
-                
-                avg_rating = sum(ratings) / len(ratings)
-                
-                sentiment_analysis_per_meal[meal_name] = {
-                    "average_rating": round(avg_rating, 2),
-                    "total_responses": total_responses,
-                    "positive_percentage": round(positive_pct, 1),
-                    "negative_percentage": round(negative_pct, 1),
-                    "dominant_sentiment": dominant,
-                    "improvement_areas": negative_comments
-                }
-            else:
-                sentiment_analysis_per_meal[meal_name] = {
-                    "average_rating": 0,
-                    "total_responses": 0,
-                    "positive_percentage": 0,
-                    "negative_percentage": 0,
-                    "dominant_sentiment": "none",
-                    "improvement_areas": []
-                }
-        
-        # Calculate Quality Consistency Score
-        quality_consistency_score = calculate_quality_consistency(meal_ratings, meal_types)
-        
-        # Generate concise daily sentiment summary
-        daily_summary = generate_daily_summary(
-            overall_rating, 
-            participation_rate, 
-            sentiment_analysis_per_meal,
-            quality_consistency_score
-        )
+        # Comments come from the snapshot or the raw documents, streamed with a projection
+        if live_snapshot is not None:
+            comment_rows = live_snapshot['comments']
+        else:
+            comment_rows = timed_iter(
+                'mongo_comments', iter_daily_comments(feedback_collection, start_date, end_date)
+            )
         
-        # Prepare analysis data
-        analysis_data = {
-            "overview": {
-                "totalStudents": total_students,
-                "participatingStudents": participating_students,
-                "participationRate": round(participation_rate, 1),
-                "overallRating": round(overall_rating, 2),
-                "qualityConsistencyScore": quality_consistency_score
-            },
-            "dailySummary": daily_summary,
-            "averageRatingPerMeal": average_ratings_per_meal,
-            "studentRatingPerMeal": student_rating_per_meal,
-            "feedbackDistributionPerMeal": feedback_distribution_per_meal,
-            "sentimentAnalysisPerMeal": sentiment_analysis_per_meal,
-            "allComments": all_comments
-        }
+        # Includes streaming the comment cursor (observed on its own as mongo_comments)
+        with stage_timer('aggregation'):
+            analysis_data = assemble_analysis_data(
+                total_students, participating_students, meal_stats, comment_rows
+            )
         
         # Generate charts if requested (base64 only, no file storage)
         charts = None
         if include_charts:
             try:
-                chart_gen = ChartGenerator()
+                chart_gen = ChartGenerator(profile=chart_profile)
                 charts = chart_gen.generate_all_charts(analysis_data)
             except Exception as chart_error:
-                print(f"Chart generation failed: {str(chart_error)}", file=sys.stderr)
+                logger.error("Chart generation failed", extra={"date": date_str, "error": str(chart_error)})
                 charts = {
                     'avgRatings': {'base64': None},
                     'distribution': {'base64': None},
@@ -378,6 +618,7 @@ def analyze_daily_feedback(date_str: str, include_charts: bool = True) -> dict:
         }
         
     except Exception as e:
+        logger.exception("Daily analysis failed", extra={"date": date_str})
         return {
             "error": True,
             "message": f"Daily analysis failed: {str(e)}",
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Daily Rollups Module
+Maintains the daily_rollups collection: one compact document per date with the
+per-meal count, sum, sum of squares and star histogram, participating students
+and the headcount at the time, so multi-day queries read N tiny documents
+instead of scanning raw feedback.
+
+Usage (backfill history):
+    python services/daily_rollups.py --start 2025-07-01 --end 2025-11-30 [--force]
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo import UpdateOne
+
+from services.daily_analysis_core import (
+    MEAL_TYPES, STAR_VALUES, fetch_daily_stats, fetch_range_stats, empty_meal_stats
+)
+from services.student_count import headcounts_for, headcount_for
+from utils.database import DatabaseConnection, get_ist_today
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ROLLUP_COLLECTION = os.getenv('ROLLUP_COLLECTION', 'daily_rollups')
+# Seconds before the rollup of a still-open day is recomputed on read
+ROLLUP_TODAY_TTL = int(os.getenv('ROLLUP_TODAY_TTL', '60'))
+# Days aggregated per range pipeline when (re)building many rollups
+ROLLUP_BUILD_CHUNK_DAYS = int(os.getenv('ROLLUP_BUILD_CHUNK_DAYS', '92'))
+
+# Days whose last written rollup the background writer remembers
+ROLLUP_WRITER_MEMORY = 366
+
+# Bump when the rollup shape changes so old documents are recomputed on read
+ROLLUP_VERSION = 1
+
+
+def rollup_document(date_str, document_count, participating_students, meal_stats, total_students):
+    """Rollup document for one day from fetch_daily_stats output"""
+    day = datetime.strptime(date_str, '%Y-%m-%d')
+    meals = {}
+    for meal_type in MEAL_TYPES:
+        stats = meal_stats[meal_type]
+        meals[meal_type] = {
+            'count': stats['count'],
+            'sum': stats['sum'],
+            'sumSq': stats['sum_sq'],
+            'positive': stats['positive'],
+            'negative': stats['negative'],
+            # BSON keys must be strings
+            'histogram': {str(star): stats['histogram'][star] for star in STAR_VALUES}
+        }
+    return {
+        '_id': date_str,
+        'date': day,
+        'version': ROLLUP_VERSION,
+        'documents': document_count,
+        'participatingStudents': participating_students,
+        'totalStudents': total_students,
+        'meals': meals,
+        'closed': day < get_ist_today()
+    }
+
+
+def rollup_meal_stats(rollup):
+    """Back to the meal_stats shape used by daily_analysis_core"""
+    meal_stats = {}
+    for meal_type in MEAL_TYPES:
+        meal = (rollup.get('meals') or {}).get(meal_type)
+        stats = empty_meal_stats()
+        if meal:
+            stats.update(
+                count=meal['count'], sum=meal['sum'], sum_sq=meal['sumSq'],
+                positive=meal['positive'], negative=meal['negative'],
+                histogram={star: meal['histogram'].get(str(star), 0) for star in STAR_VALUES}
+            )
+        meal_stats[meal_type] = stats
+    return meal_stats
+
+
+def merge_meal_stats(rollups):
+    """Sum meal_stats over several rollups (counts, sums and histograms are additive)"""
+    merged = {meal_type: empty_meal_stats() for meal_type in MEAL_TYPES}
+    for rollup in rollups:
+        for meal_type, stats in rollup_meal_stats(rollup).items():
+            target = merged[meal_type]
+            for key in ('count', 'sum', 'sum_sq', 'positive', 'negative'):
+                target[key] += stats[key]
+            for star in STAR_VALUES:
+                target['histogram'][star] += stats['histogram'][star]
+    return merged
+
+
+def rollup_update(doc):
+    """
+    Upsert for a rollup document
+
+    The headcount of a closed day is kept as first recorded, so a later
+    recompute does not rewrite history with today's number of students.
+    """
+    fields = {key: value for key, value in doc.items() if key != '_id'}
+    fields['updatedAt'] = datetime.now(timezone.utc)
+    update = {'$set': fields}
+    if doc['closed']:
+        update['$setOnInsert'] = {'totalStudents': fields.pop('totalStudents')}
+    return UpdateOne({'_id': doc['_id']}, update, upsert=True)
+
+
+def save_rollup(db, doc):
+    """Write one rollup document"""
+    db[ROLLUP_COLLECTION].bulk_write([rollup_update(doc)])
+
+
+def build_rollups(db, date_strs, total_students=None):
+    """
+    (Re)build rollups for the given days with one range aggregation per chunk
+
+    Days without feedback get an all-zero rollup, so they are not rebuilt on
+    the next read. Each day gets its own recorded headcount unless
+    total_students is given. Returns {YYYY-MM-DD: rollup document}.
+    """
+    if not date_strs:
+        return {}
+
+    wanted = sorted(date_strs)
+    if total_students is None:
+        headcounts = headcounts_for(db, wanted)
+    else:
+        headcounts = dict.fromkeys(wanted, total_students)
+    built = {}
+    for index in range(0, len(wanted), ROLLUP_BUILD_CHUNK_DAYS):
+        chunk = wanted[index:index + ROLLUP_BUILD_CHUNK_DAYS]
+        start_date = datetime.strptime(chunk[0], '%Y-%m-%d')
+        end_date = datetime.strptime(chunk[-1], '%Y-%m-%d') + timedelta(days=1)
+        stats = fetch_range_stats(db.feedbacks, start_date, end_date)
+        empty = (0, 0, {meal_type: empty_meal_stats() for meal_type in MEAL_TYPES})
+        docs = [
+            rollup_document(date_str, *stats.get(date_str, empty), headcounts[date_str])
+            for date_str in chunk
+        ]
+        db[ROLLUP_COLLECTION].bulk_write([rollup_update(doc) for doc in docs], ordered=False)
+        built.update((doc['_id'], doc) for doc in docs)
+    return built
+
+
+class RollupWriter:
+    """
+    Writes the rollups daily analyses aggregate, off the request path
+
+    Submissions are coalesced per day (the latest stats win) and written by
+    one daemon thread started on first use. A day whose rollup equals its
+    last write is skipped: always once closed, and while that write is
+    younger than ROLLUP_TODAY_TTL for the open day (readers would otherwise
+    see it as stale and recompute it).
+    """
+
+    def __init__(self, memory=ROLLUP_WRITER_MEMORY):
+        self.memory = memory
+        self._pending = {}  # date_str -> (db, rollup document)
+        self._written = OrderedDict()  # date_str -> (rollup document, monotonic time written)
+        self._condition = threading.Condition()
+        self._thread = None
+        self.submitted = 0
+        self.skipped = 0
+        self.written = 0
+        self.failed = 0
+
+    def submit(self, db, doc):
+        """Queue a rollup document for writing; returns False when it was skipped as unchanged"""
+        with self._condition:
+            self.submitted += 1
+            last = self._written.get(doc['_id'])
+            if last is not None and last[0] == doc and (
+                doc['closed'] or time.monotonic() - last[1] < ROLLUP_TODAY_TTL
+            ):
+                self.skipped += 1
+                return False
+            self._pending[doc['_id']] = (db, doc)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='rollup-writer', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return True
+
+    def forget(self, date_str):
+        """Drop what is known about a day (its rollup was deleted)"""
+        with self._condition:
+            self._pending.pop(date_str, None)
+            self._written.pop(date_str, None)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                date_str = next(iter(self._pending))
+                db, doc = self._pending.pop(date_str)
+            try:
+                save_rollup(db, doc)
+            except Exception as e:
+                with self._condition:
+                    self.failed += 1
+                logger.warning("Rollup write failed", extra={"date": date_str, "error": str(e)})
+                continue
+            with self._condition:
+                self.written += 1
+                self._written[date_str] = (doc, time.monotonic())
+                self._written.move_to_end(date_str)
+                while len(self._written) > self.memory:
+                    self._written.popitem(last=False)
+
+    def stats(self):
+        """Rollups submitted, skipped as unchanged, written, failed and still queued"""
+        with self._condition:
+            return {
+                "submitted": self.submitted,
+                "skipped": self.skipped,
+                "written": self.written,
+                "failed": self.failed,
+                "pending": len(self._pending)
+            }
+
+
+rollup_writer = RollupWriter()
+
+
+def write_through_rollup(db, date_str, document_count, participating_students, meal_stats, total_students):
+    """Hand the stats a daily analysis just aggregated to the background writer"""
+    return rollup_writer.submit(db, rollup_document(
+        date_str, document_count, participating_students, meal_stats, total_students
+    ))
+
+
+def compute_rollup(db, date_str, total_students=None):
+    """Aggregate one day from raw feedback and store its rollup"""
+    start_date = datetime.strptime(date_str, '%Y-%m-%d')
+    end_date = start_date + timedelta(days=1)
+    if total_students is None:
+        total_students = headcount_for(db, date_str)
+    document_count, participating_students, meal_stats = fetch_daily_stats(db.feedbacks, start_date, end_date)
+    doc = rollup_document(date_str, document_count, participating_students, meal_stats, total_students)
+    save_rollup(db, doc)
+    return doc
+
+
+def is_stale(rollup):
+    """Rollups of open days expire after ROLLUP_TODAY_TTL; closed ones only on version change"""
+    if rollup.get('version') != ROLLUP_VERSION:
+        return True
+    if rollup.get('closed'):
+        return False
+    if datetime.strptime(rollup['_id'], '%Y-%m-%d') < get_ist_today():
+        # Day closed since the last write: recompute once to capture the final numbers
+        return True
+    updated_at = rollup.get('updatedAt')
+    if updated_at is None:
+        return True
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - updated_at).total_seconds() > ROLLUP_TODAY_TTL
+
+
+def iter_dates(start_date, end_date):
+    """YYYY-MM-DD strings from start_date to end_date inclusive"""
+    day = start_date
+    while day <= end_date:
+        yield day.strftime('%Y-%m-%d')
+        day += timedelta(days=1)
+
+
+def get_rollups(db, start_date, end_date):
+    """
+    Rollups for every day from start_date to end_date (inclusive, datetimes),
+    computing missing or stale days on the fly
+
+    Days after today (IST) are skipped. Returns a list ordered by date.
+    """
+    end_date = min(end_date, get_ist_today())
+    if end_date < start_date:
+        return []
+
+    found = {
+        doc['_id']: doc
+        for doc in db[ROLLUP_COLLECTION].find({'date': {'$gte': start_date, '$lte': end_date}})
+    }
+    dates = list(iter_dates(start_date, end_date))
+    stale = [date_str for date_str in dates if date_str not in found or is_stale(found[date_str])]
+
+    for date_str, fresh in build_rollups(db, stale).items():
+        previous = found.get(date_str)
+        if previous is not None and fresh['closed']:
+            # The stored headcount was kept (see rollup_update)
+            fresh['totalStudents'] = previous['totalStudents']
+        found[date_str] = fresh
+
+    return [found[date_str] for date_str in dates]
+
+
+def backfill_rollups(start_date, end_date, force=False):
+    """
+    Build rollups for a window of history (datetimes, inclusive)
+
+    Existing up-to-date rollups are skipped unless force is set.
+    Returns the number of days (re)computed.
+    """
+    db_conn = DatabaseConnection()
+    if not db_conn.connect():
+        raise RuntimeError("Failed to connect to database")
+    try:
+        db = db_conn.db
+        end_date = min(end_date, get_ist_today())
+        existing = {} if force else {
+            doc['_id']: doc
+            for doc in db[ROLLUP_COLLECTION].find({'date': {'$gte': start_date, '$lte': end_date}})
+        }
+        stale = [
+            date_str for date_str in iter_dates(start_date, end_date)
+            if date_str not in existing or is_stale(existing[date_str])
+        ]
+        computed = len(build_rollups(db, stale))
+        logger.info("Rollup backfill done", extra={"computed": computed})
+        return computed
+    finally:
+        db_conn.close()
+
+
+def delete_rollup(date_str):
+    """Drop a day's rollup so the next read recomputes it (e.g. after feedback was corrected)"""
+    rollup_writer.forget(date_str)
+    db_conn = DatabaseConnection()
+    if not db_conn.connect():
+        return 0
+    try:
+        return db_conn.db[ROLLUP_COLLECTION].delete_one({'_id': date_str}).deleted_count
+    finally:
+        db_conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill the daily_rollups collection')
+    parser.add_argument('--start', required=True, help='First date (YYYY-MM-DD)')
+    parser.add_argument('--end', default=None, help='Last date (YYYY-MM-DD), default today')
+    parser.add_argument('--force', action='store_true', help='Recompute days that already have a rollup')
+    args = parser.parse_args()
+
+    start_date = datetime.strptime(args.start, '%Y-%m-%d')
+    end_date = datetime.strptime(args.end, '%Y-%m-%d') if args.end else get_ist_today()
+    backfill_rollups(start_date, end_date, force=args.force)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Index Provisioning Module
+Declares the indexes the analytics queries rely on, creates them idempotently
+at startup, and explains each hot query to report collection scans, covered
+plans and documents examined.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo import ASCENDING
+
+from services.daily_analysis_core import (
+    MEAL_TYPES, build_daily_stats_pipeline, build_range_stats_pipeline, daily_comments_query
+)
+from services.daily_rollups import ROLLUP_COLLECTION
+from services.live_counters import LIVE_PROJECTION
+from services.sentiment_worker import SENTIMENT_WORKER_ENABLED
+from services.student_count import STUDENT_QUERY, HEADCOUNT_COLLECTION
+from utils.database import DatabaseConnection, get_date_range, get_ist_today
+from utils.sentiment import SENTIMENT_COLLECTION
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_PROVISIONING = os.getenv('INDEX_PROVISIONING', 'true').lower() == 'true'
+# Window explained for the range queries
+EXPLAIN_RANGE_DAYS = 30
+
+# Server-generated names (date_1_meals.morning.rating_1...), so an equivalent
+# index created by hand or by the backend is recognized as already present
+REQUIRED_INDEXES = [
+    {
+        'collection': 'feedbacks',
+        'keys': [('date', ASCENDING)] + [(f'meals.{meal}.rating', ASCENDING) for meal in MEAL_TYPES],
+        'purpose': 'Daily and range stats aggregations (covered: date plus every rating)'
+    },
+    {
+        'collection': 'users',
+        'keys': [('isAdmin', ASCENDING)],
+        'options': {'partialFilterExpression': STUDENT_QUERY},
+        'purpose': 'Registered-student count (partial: non-admin users only)'
+    },
+    {
+        'collection': ROLLUP_COLLECTION,
+        'keys': [('date', ASCENDING)],
+        'purpose': 'Date-range and trend reads of daily rollups'
+    },
+    {
+        'collection': SENTIMENT_COLLECTION,
+        'keys': [('textHash', ASCENDING)],
+        'purpose': 'Precomputed sentiment lookups by text hash'
+    },
+    {
+        'collection': SENTIMENT_COLLECTION,
+        'keys': [('date', ASCENDING)],
+        'purpose': 'Precomputed sentiment by day'
+    }
+]
+
+if SENTIMENT_WORKER_ENABLED:
+    REQUIRED_INDEXES.append({
+        'collection': 'feedbacks',
+        'keys': [('updatedAt', ASCENDING), ('_id', ASCENDING)],
+        'purpose': 'Sentiment worker polling on standalone servers ((updatedAt, _id) cursor)'
+    })
+
+
+def index_present(index_information, spec):
+    """True when an index with the same keys (and partial filter) already exists"""
+    wanted_filter = (spec.get('options') or {}).get('partialFilterExpression')
+    for info in index_information.values():
+        keys = [tuple(key) for key in info['key']]
+        if keys == spec['keys'] and info.get('partialFilterExpression') == wanted_filter:
+            return True
+    return False
+
+
+def ensure_indexes(db, specs=None):
+    """
+    Create every declared index that is missing
+
+    Never raises: a conflicting or unauthorized index is reported and the
+    service keeps working without it. Returns one status dict per index.
+    """
+    results = []
+    for spec in specs or REQUIRED_INDEXES:
+        status = {
+            'collection': spec['collection'],
+            'keys': dict(spec['keys']),
+            'purpose': spec['purpose']
+        }
+        try:
+            collection = db[spec['collection']]
+            if index_present(collection.index_information(), spec):
+                status['status'] = 'exists'
+            else:
+                status['name'] = collection.create_index(spec['keys'], **(spec.get('options') or {}))
+                status['status'] = 'created'
+        except Exception as e:
+            status['status'] = 'error'
+            status['error'] = str(e)
+            logger.warning("Index not provisioned", extra={
+                "collection": spec['collection'], "keys": status['keys'], "error": str(e)
+            })
+        results.append(status)
+    return results
+
+
+def provision_indexes():
+    """Startup hook: ensure the declared indexes if INDEX_PROVISIONING is on"""
+    if not INDEX_PROVISIONING:
+        return []
+    db_conn = DatabaseConnection()
+    if not db_conn.connect():
+        return []
+    try:
+        results = ensure_indexes(db_conn.db)
+        created = sum(1 for result in results if result['status'] == 'created')
+        failed = sum(1 for result in results if result['status'] == 'error')
+        logger.info("Indexes provisioned", extra={"indexesCreated": created, "indexesFailed": failed, "indexesDeclared": len(results)})
+        return results
+    finally:
+        db_conn.close()
+
+
+def hot_queries(date_str):
+    """
+    (name, collection, explain command) for the queries on the request path,
+    built by the same functions the services use
+    """
+    start_date, end_date = get_date_range(date_str)
+    range_start = end_date - timedelta(days=EXPLAIN_RANGE_DAYS)
+    comments_filter, comments_projection = daily_comments_query(start_date, end_date)
+    return [
+        ('dailyStats', 'feedbacks', {
+            'aggregate': 'feedbacks', 'pipeline': build_daily_stats_pipeline(start_date, end_date), 'cursor': {}
+        }),
+        ('dailyComments', 'feedbacks', {
+            'find': 'feedbacks', 'filter': comments_filter, 'projection': comments_projection
+        }),
+        ('liveCountersLoad', 'feedbacks', {
+            'find': 'feedbacks', 'filter': {'date': {'$gte': start_date, '$lt': end_date}},
+            'projection': LIVE_PROJECTION
+        }),
+        ('rangeStats', 'feedbacks', {
+            'aggregate': 'feedbacks', 'pipeline': build_range_stats_pipeline(range_start, end_date), 'cursor': {}
+        }),
+        ('studentCount', 'users', {
+            'count': 'users', 'query': STUDENT_QUERY
+        }),
+        ('rollupsRange', ROLLUP_COLLECTION, {
+            'find': ROLLUP_COLLECTION, 'filter': {'date': {'$gte': range_start, '$lt': end_date}}
+        }),
+        ('headcountSnapshots', HEADCOUNT_COLLECTION, {
+            'find': HEADCOUNT_COLLECTION, 'filter': {'_id': {'$in': [date_str]}}
+        })
+    ]
+
+
+def summarize_explain(explain):
+    """Plan stages, indexes used and execution counters from explain output (any server layout)"""
+    stages = []
+    indexes = set()
+    stats = {}
+
+    def walk(node):
+        if isinstance(node, dict):
+            stage = node.get('stage')
+            if isinstance(stage, str) and stage not in stages:
+                stages.append(stage)
+            if node.get('indexName'):
+                indexes.add(node['indexName'])
+            if not stats and isinstance(node.get('executionStats'), dict):
+                stats.update(node['executionStats'])
+            for key, value in node.items():
+                if key not in ('rejectedPlans', 'allPlansExecution'):
+                    walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(explain)
+    collscan = 'COLLSCAN' in stages
+    return {
+        'stages': stages,
+        'indexes': sorted(indexes),
+        'collscan': collscan,
+        # Answered from index keys alone
+        'covered': not collscan and 'FETCH' not in stages and bool(indexes),
+        'docsExamined': stats.get('totalDocsExamined'),
+        'keysExamined': stats.get('totalKeysExamined'),
+        'nReturned': stats.get('nReturned'),
+        'executionTimeMillis': stats.get('executionTimeMillis')
+    }
+
+
+def explain_hot_queries(date_str=None):
+    """
+    Explain every hot query for a date (default today, IST) and check the
+    declared indexes
+
+    Returns:
+        Dictionary with index and query plan reports
+    """
+    db_conn = DatabaseConnection()
+
+    if not db_conn.connect():
+        error_msg = "Failed to connect to database"
+        logger.error(error_msg)
+        return {
+            "error": True,
+            "message": error_msg,
+            "status": "error"
+        }
+
+    try:
+        db = db_conn.db
+        date_str = date_str or get_ist_today().strftime('%Y-%m-%d')
+
+        index_report = []
+        for spec in REQUIRED_INDEXES:
+            index_report.append({
+                'collection': spec['collection'],
+                'keys': dict(spec['keys']),
+                'purpose': spec['purpose'],
+                'present': index_present(db[spec['collection']].index_information(), spec)
+            })
+
+        query_report = []
+        for name, collection, command in hot_queries(date_str):
+            entry = {'query': name, 'collection': collection}
+            try:
+                entry.update(summarize_explain(db.command({'explain': command, 'verbosity': 'executionStats'})))
+            except Exception as e:
+                entry['error'] = str(e)
+            query_report.append(entry)
+
+        return {
+            "status": "success",
+            "date": date_str,
+            "indexes": index_report,
+            "missingIndexes": sum(1 for entry in index_report if not entry['present']),
+            "queries": query_report,
+            "collscans": [entry['query'] for entry in query_report if entry.get('collscan')],
+            "timestamp": datetime.now().isoformat()
+        }
+
+    except Exception as e:
+        return {
+            "error": True,
+            "message": f"Query plan check failed: {str(e)}",
+            "status": "error"
+        }
+    finally:
+        db_conn.close()
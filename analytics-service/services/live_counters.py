@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Live Counters Module
+Keeps today's (IST) per-meal count, sum, sum of squares, sentiment buckets and
+star histogram, documents, participants and rated comments in memory, updated
+from the feedbacks change stream or a meals.*.submittedAt delta poll. The daily
+endpoint for today reads a snapshot instead of rescanning the day; a full
+recompute only happens on start, at day rollover and on the periodic resync.
+"""
+
+import os
+import sys
+import copy
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.daily_analysis_core import MEAL_TYPES, FEEDBACK_BATCH_SIZE, empty_meal_stats
+from services.collection_tailer import CollectionTailer
+from utils.database import get_ist_today
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+LIVE_COUNTERS_ENABLED = os.getenv('LIVE_COUNTERS_ENABLED', 'false').lower() == 'true'
+# auto: change stream, falling back to polling; or force change_stream / poll
+LIVE_COUNTERS_MODE = os.getenv('LIVE_COUNTERS_MODE', 'auto').lower()
+LIVE_POLL_INTERVAL = float(os.getenv('LIVE_POLL_INTERVAL', '5'))
+# Seconds between full recomputes that correct drift (deletes are invisible to polling); 0 disables
+LIVE_RESYNC_INTERVAL = float(os.getenv('LIVE_RESYNC_INTERVAL', '600'))
+
+# Ratings, comments and submission times only
+LIVE_PROJECTION = {'date': 1}
+for _meal_type in MEAL_TYPES:
+    for _field in ('rating', 'comment', 'submittedAt'):
+        LIVE_PROJECTION[f'meals.{_meal_type}.{_field}'] = 1
+
+
+def feedback_entry(doc):
+    """{meal_type: (rating, comment)} for the rated meals of one feedback document"""
+    meals = doc.get('meals') or {}
+    entry = {}
+    for meal_type in MEAL_TYPES:
+        meal_data = meals.get(meal_type) or {}
+        rating = meal_data.get('rating')
+        if rating is not None:
+            entry[meal_type] = (rating, (meal_data.get('comment') or '').strip())
+    return entry
+
+
+def latest_submission(doc):
+    """Most recent meals.*.submittedAt of a document, or None"""
+    meals = doc.get('meals') or {}
+    times = [(meals.get(meal_type) or {}).get('submittedAt') for meal_type in MEAL_TYPES]
+    times = [t for t in times if t is not None]
+    return max(times) if times else None
+
+
+def add_entry(meal_stats, entry, sign):
+    """
+    Add (sign=1) or remove (sign=-1) one document's rated meals in meal_stats
+
+    Returns the change in participating students.
+    """
+    if not entry:
+        return 0
+    for meal_type, (rating, _) in entry.items():
+        stats = meal_stats[meal_type]
+        stats['count'] += sign
+        stats['sum'] += sign * rating
+        stats['sum_sq'] += sign * rating * rating
+        if rating >= 4:
+            stats['positive'] += sign
+        elif rating <= 2:
+            stats['negative'] += sign
+        if rating in stats['histogram']:
+            stats['histogram'][rating] += sign
+    return sign
+
+
+class LiveCounters(CollectionTailer):
+    name = 'live-counters'
+
+    def __init__(self, mode=LIVE_COUNTERS_MODE, poll_interval=LIVE_POLL_INTERVAL,
+                 resync_interval=LIVE_RESYNC_INTERVAL):
+        super().__init__(mode=mode, poll_interval=poll_interval)
+        self.resync_interval = resync_interval
+        self.date_str = None
+        self.version = 0
+        self.recomputes = 0
+        self.loaded_at = None
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._day = None
+        self._end = None
+        self._loaded_monotonic = 0
+        self._poll_since = None
+        self._reset()
+
+    def _reset(self):
+        # feedback _id -> feedback_entry(); insertion order matches the collection scan
+        self._docs = {}
+        self._meal_stats = {meal_type: empty_meal_stats() for meal_type in MEAL_TYPES}
+        self._participants = 0
+        self._snapshot = None
+
+    def add_listener(self, callback):
+        """callback(date_str) after every change to today's counters (called on the tailer thread)"""
+        self._listeners.append(callback)
+
+    def _notify(self, date_str):
+        for callback in self._listeners:
+            try:
+                callback(date_str)
+            except Exception as e:
+                logger.warning("Live counters listener failed", extra={"date": date_str, "error": str(e)})
+
+    def _apply(self, feedback_id, doc):
+        """Replace one document's contribution (doc None: deleted or moved off today)"""
+        with self._lock:
+            old = self._docs.get(feedback_id)
+            entry = feedback_entry(doc) if doc is not None else None
+            if old == entry:
+                return False
+            if old is not None:
+                self._participants += add_entry(self._meal_stats, old, -1)
+            if entry is None:
+                del self._docs[feedback_id]
+            else:
+                # Assigning an existing key keeps its position, so comment order stays stable
+                self._docs[feedback_id] = entry
+                self._participants += add_entry(self._meal_stats, entry, 1)
+            self.version += 1
+            self._snapshot = None
+            date_str = self.date_str
+        self._notify(date_str)
+        return True
+
+    def _is_today(self, doc):
+        date = doc.get('date')
+        if date is None:
+            return False
+        if date.tzinfo is not None:
+            date = date.astimezone(timezone.utc).replace(tzinfo=None)
+        return self._day <= date < self._end
+
+    def load(self):
+        """Full recompute of today's counters from the feedbacks collection"""
+        day = get_ist_today()
+        end = day + timedelta(days=1)
+        cursor = self.db.feedbacks.find(
+            {'date': {'$gte': day, '$lt': end}}, LIVE_PROJECTION
+        ).batch_size(FEEDBACK_BATCH_SIZE)
+
+        docs = {}
+        meal_stats = {meal_type: empty_meal_stats() for meal_type in MEAL_TYPES}
+        participants = 0
+        latest = None
+        for doc in cursor:
+            entry = feedback_entry(doc)
+            docs[doc['_id']] = entry
+            participants += add_entry(meal_stats, entry, 1)
+            submitted = latest_submission(doc)
+            if submitted is not None and (latest is None or submitted > latest):
+                latest = submitted
+
+        with self._lock:
+            changed = self.date_str != day.strftime('%Y-%m-%d') or self._docs != docs
+            self._day, self._end = day, end
+            self.date_str = day.strftime('%Y-%m-%d')
+            self._docs = docs
+            self._meal_stats = meal_stats
+            self._participants = participants
+            self._snapshot = None
+            # Polling continues from the newest submission seen (the server's clock, not ours)
+            self._poll_since = latest or day
+            self.loaded_at = datetime.now(timezone.utc)
+            self._loaded_monotonic = time.monotonic()
+            self.recomputes += 1
+            if changed:
+                self.version += 1
+            date_str = self.date_str
+        logger.info("Live counters loaded", extra={"date": date_str, "documents": len(docs)})
+        if changed:
+            self._notify(date_str)
+
+    def prepare(self):
+        self.load()
+
+    def tick(self):
+        """Reload at IST midnight and every resync_interval seconds"""
+        if get_ist_today() != self._day:
+            self.load()
+        elif self.resync_interval and time.monotonic() - self._loaded_monotonic > self.resync_interval:
+            self.load()
+
+    def handle_change(self, change):
+        feedback_id = change['documentKey']['_id']
+        doc = change.get('fullDocument')
+        if change['operationType'] == 'delete':
+            if feedback_id in self._docs:
+                self._apply(feedback_id, None)
+        elif doc is not None:
+            if self._is_today(doc):
+                self._apply(feedback_id, doc)
+            elif feedback_id in self._docs:
+                self._apply(feedback_id, None)
+
+    def poll(self):
+        """Apply today's documents with a meal submitted since the last poll"""
+        since = self._poll_since
+        query = {
+            'date': {'$gte': self._day, '$lt': self._end},
+            # $gte: submissions in the same millisecond as the last one seen are not skipped
+            # (re-applying an unchanged document is a no-op); late writes are left to the resync
+            '$or': [{f'meals.{meal_type}.submittedAt': {'$gte': since}} for meal_type in MEAL_TYPES]
+        }
+        latest = since
+        for doc in self.db.feedbacks.find(query, LIVE_PROJECTION).batch_size(FEEDBACK_BATCH_SIZE):
+            self.last_event_at = datetime.now(timezone.utc)
+            self._apply(doc['_id'], doc)
+            submitted = latest_submission(doc)
+            if submitted is not None and submitted > latest:
+                latest = submitted
+        self._poll_since = latest
+        return False
+
+    def is_live(self, date_str):
+        """True when date_str is the day these running counters follow"""
+        return self.running and date_str == self.date_str
+
+    def snapshot(self, date_str):
+        """
+        Today's numbers for analyze_daily_feedback, or None when date_str is
+        not the live day or the counters are not running
+
+        The snapshot is rebuilt only after a change, so repeated reads are O(1).
+        """
+        if not self.is_live(date_str):
+            return None
+        with self._lock:
+            if self._snapshot is None:
+                # Same (meal_type, rating, comment) rows as iter_daily_comments
+                comments = []
+                for entry in self._docs.values():
+                    for meal_type in MEAL_TYPES:
+                        rating, comment = entry.get(meal_type, (None, ''))
+                        if comment:
+                            comments.append((meal_type, rating, comment))
+                self._snapshot = {
+                    'version': self.version,
+                    'documents': len(self._docs),
+                    'participatingStudents': self._participants,
+                    'mealStats': copy.deepcopy(self._meal_stats),
+                    'comments': comments
+                }
+            return self._snapshot
+
+    def stats(self):
+        """Mode in use, live day, documents held and number of full recomputes"""
+        return {
+            "enabled": self.running,
+            "mode": self.active_mode,
+            "date": self.date_str,
+            "documents": len(self._docs),
+            "version": self.version,
+            "recomputes": self.recomputes,
+            "loadedAt": self.loaded_at.isoformat() if self.loaded_at else None,
+            "lastEventAt": self.last_event_at.isoformat() if self.last_event_at else None
+        }
+
+
+live_counters = LiveCounters()
+
+
+def start_live_counters():
+    """Start the live counters thread if enabled"""
+    if LIVE_COUNTERS_ENABLED:
+        live_counters.start()
+
+
+def stop_live_counters():
+    """Stop the live counters thread"""
+    live_counters.stop()
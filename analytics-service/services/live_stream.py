@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Live Stream Module
+Fan-out of daily analytics to Server-Sent Events subscribers: one debounced
+computation per date, shared by every open dashboard watching that date.
+Updates are triggered by the live counters, or by a periodic refresh when they
+are not running for the date.
+"""
+
+import os
+import sys
+import json
+import asyncio
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.analysis_cache import is_closed_day
+from services.live_counters import live_counters
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds to wait after a change so bursts of submissions cost one computation
+STREAM_DEBOUNCE_SECONDS = float(os.getenv('STREAM_DEBOUNCE_SECONDS', '2'))
+# Refresh period for an open day when the live counters are not running
+STREAM_REFRESH_INTERVAL = float(os.getenv('STREAM_REFRESH_INTERVAL', '30'))
+# Comment line sent when idle so proxies keep the connection open
+STREAM_KEEPALIVE_SECONDS = float(os.getenv('STREAM_KEEPALIVE_SECONDS', '15'))
+STREAM_MAX_SUBSCRIBERS = int(os.getenv('STREAM_MAX_SUBSCRIBERS', '200'))
+
+# Report sections pushed to subscribers (comments and charts stay on the regular endpoint)
+STREAM_SECTIONS = (
+    'overview', 'dailySummary', 'averageRatingPerMeal', 'studentRatingPerMeal',
+    'feedbackDistributionPerMeal', 'sentimentAnalysisPerMeal'
+)
+
+
+class StreamFull(Exception):
+    """Raised when STREAM_MAX_SUBSCRIBERS streams are already open"""
+    pass
+
+
+def stream_payload(date_str, result):
+    """Compact SSE payload from a daily analysis result"""
+    data = result.get('data') or {}
+    return {
+        'date': date_str,
+        'status': result.get('status'),
+        'type': result.get('type'),
+        **{section: data[section] for section in STREAM_SECTIONS if section in data},
+        'timestamp': result.get('timestamp') or datetime.now().isoformat()
+    }
+
+
+def format_event(payload, event_id, event='analytics'):
+    """One SSE frame"""
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+class DailyStreamHub:
+    def __init__(self, compute, debounce=STREAM_DEBOUNCE_SECONDS,
+                 refresh_interval=STREAM_REFRESH_INTERVAL, max_subscribers=STREAM_MAX_SUBSCRIBERS):
+        # compute: async (date_str) -> daily analysis result without charts
+        self.compute = compute
+        self.debounce = debounce
+        self.refresh_interval = refresh_interval
+        self.max_subscribers = max_subscribers
+        self.computations = 0
+        self.events_sent = 0
+        self._loop = None
+        self._subscribers = {}
+        self._changed = {}
+        self._tasks = {}
+        self._latest = {}
+
+    def start(self, loop):
+        """Bind to the event loop that serves the streams"""
+        self._loop = loop
+
+    def stop(self):
+        """Cancel the per-date computation tasks"""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        self._latest.clear()
+
+    def notify_threadsafe(self, date_str):
+        """Mark a date as changed; safe to call from any thread (live counters listener)"""
+        if self._loop is not None and date_str in self._subscribers:
+            self._loop.call_soon_threadsafe(self.notify, date_str)
+
+    def notify(self, date_str):
+        changed = self._changed.get(date_str)
+        if changed is not None:
+            changed.set()
+
+    @property
+    def subscriber_count(self):
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def subscribe(self, date_str):
+        """
+        Register a subscriber queue for a date, starting its computation task
+
+        Raises:
+            StreamFull: when max_subscribers streams are open
+        """
+        if self.subscriber_count >= self.max_subscribers:
+            raise StreamFull(f"Too many open streams ({self.max_subscribers}), try again later")
+        # Only the latest state matters, so a slow client just skips intermediate updates
+        queue = asyncio.Queue(maxsize=1)
+        self._subscribers.setdefault(date_str, set()).add(queue)
+        if date_str in self._latest:
+            queue.put_nowait(self._latest[date_str])
+            self.events_sent += 1
+        if date_str not in self._tasks:
+            self._changed[date_str] = asyncio.Event()
+            self._changed[date_str].set()
+            self._tasks[date_str] = asyncio.get_running_loop().create_task(self._run(date_str))
+        return queue
+
+    def unsubscribe(self, date_str, queue):
+        """Drop a subscriber; the date's task stops with its last subscriber"""
+        queues = self._subscribers.get(date_str)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[date_str]
+            self._changed.pop(date_str, None)
+            self._latest.pop(date_str, None)
+            task = self._tasks.pop(date_str, None)
+            if task is not None:
+                task.cancel()
+
+    def _refresh_timeout(self, date_str):
+        """Closed days never change; today without live counters is refreshed periodically"""
+        if is_closed_day(date_str) or live_counters.is_live(date_str):
+            return None
+        return self.refresh_interval
+
+    async def _run(self, date_str):
+        changed = self._changed[date_str]
+        version = 0
+        last_payload = None
+        while True:
+            try:
+                await asyncio.wait_for(changed.wait(), self._refresh_timeout(date_str))
+            except asyncio.TimeoutError:
+                pass
+            if last_payload is not None:
+                await asyncio.sleep(self.debounce)
+            changed.clear()
+
+            try:
+                result = await self.compute(date_str)
+                self.computations += 1
+                if result.get('error'):
+                    raise RuntimeError(result.get('message', 'Analysis failed'))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Busy or failing: keep the last state and try again later
+                logger.warning("Stream update failed", extra={"date": date_str, "error": str(e)})
+                await asyncio.sleep(self.refresh_interval)
+                changed.set()
+                continue
+
+            payload = stream_payload(date_str, result)
+            comparable = {key: value for key, value in payload.items() if key != 'timestamp'}
+            if comparable == last_payload:
+                continue
+            last_payload = comparable
+            version += 1
+            frame = format_event(payload, version)
+            self._latest[date_str] = frame
+            self._broadcast(date_str, frame)
+
+    def _broadcast(self, date_str, frame):
+        for queue in self._subscribers.get(date_str, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(frame)
+            self.events_sent += 1
+
+    def stats(self):
+        """Open streams per date and computations shared between them"""
+        return {
+            "subscribers": {date_str: len(queues) for date_str, queues in self._subscribers.items()},
+            "computations": self.computations,
+            "eventsSent": self.events_sent
+        }
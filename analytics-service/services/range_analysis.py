@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Date Range Analysis Module
+Overview, per-meal averages, distributions and consistency score over an
+arbitrary window, plus a per-day series, read from daily_rollups (missing
+days are built with one range aggregation)
+"""
+
+import os
+import sys
+import math
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.daily_analysis_core import (
+    MEAL_TYPES, MEAL_NAMES, build_meal_sections, calculate_quality_consistency, overall_rating_of
+)
+from services.daily_rollups import get_rollups, merge_meal_stats, rollup_meal_stats
+from utils.database import DatabaseConnection, get_date_range
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Longest window accepted by the range endpoint
+DATE_RANGE_MAX_DAYS = int(os.getenv('DATE_RANGE_MAX_DAYS', '366'))
+
+
+def participation_rate_of(rollup):
+    """Participating students as a percentage of that day's headcount"""
+    if not rollup['totalStudents']:
+        return 0
+    return rollup['participatingStudents'] / rollup['totalStudents'] * 100
+
+
+def rating_std_dev(stats):
+    """Population standard deviation of a meal's ratings from count, sum and sum of squares"""
+    if not stats['count']:
+        return 0
+    mean = stats['sum'] / stats['count']
+    return math.sqrt(max(0.0, stats['sum_sq'] / stats['count'] - mean * mean))
+
+
+def build_daily_series(rollups):
+    """One compact point per day of the window"""
+    series = []
+    for rollup in rollups:
+        meal_stats = rollup_meal_stats(rollup)
+        series.append({
+            "date": rollup['_id'],
+            "submissions": rollup['documents'],
+            "participatingStudents": rollup['participatingStudents'],
+            "participationRate": round(participation_rate_of(rollup), 1),
+            "overallRating": round(overall_rating_of(meal_stats), 2),
+            "averageRatingPerMeal": {
+                MEAL_NAMES[meal_type]: round(stats['sum'] / stats['count'], 2) if stats['count'] else 0
+                for meal_type, stats in meal_stats.items()
+            }
+        })
+    return series
+
+
+def analyze_date_range(start_date_str: str, end_date_str: str) -> dict:
+    """
+    Aggregate analysis over start_date..end_date (inclusive)
+
+    Args:
+        start_date_str: First date in YYYY-MM-DD format
+        end_date_str: Last date in YYYY-MM-DD format (clamped to today)
+
+    Returns:
+        Dictionary with analysis results
+    """
+    db_conn = DatabaseConnection()
+
+    if not db_conn.connect():
+        error_msg = "Failed to connect to database"
+        logger.error(error_msg)
+        return {
+            "error": True,
+            "message": error_msg,
+            "status": "error"
+        }
+
+    try:
+        start_date, end_date = get_date_range(start_date_str, end_date_str)
+        last_date = end_date - timedelta(days=1)
+
+        rollups = get_rollups(db_conn.db, start_date, last_date)
+        days_with_feedback = [rollup for rollup in rollups if rollup['documents']]
+
+        if not days_with_feedback:
+            return {
+                "status": "no_data",
+                "message": "No feedback found for this date range",
+                "startDate": start_date_str,
+                "endDate": end_date_str,
+                "type": "no_feedback"
+            }
+
+        meal_stats = merge_meal_stats(rollups)
+        overall_rating = overall_rating_of(meal_stats)
+
+        (average_ratings_per_meal, student_rating_per_meal,
+         feedback_distribution_per_meal, sentiment_analysis_per_meal) = build_meal_sections(meal_stats)
+
+        # Averages over days that had feedback, so holidays do not drag participation down
+        average_participants = sum(r['participatingStudents'] for r in days_with_feedback) / len(days_with_feedback)
+        average_participation_rate = sum(participation_rate_of(r) for r in days_with_feedback) / len(days_with_feedback)
+
+        analysis_data = {
+            "overview": {
+                "totalStudents": rollups[-1]['totalStudents'],
+                "days": len(rollups),
+                "daysWithFeedback": len(days_with_feedback),
+                "totalSubmissions": sum(r['documents'] for r in rollups),
+                "participatingStudents": round(average_participants, 1),
+                "participationRate": round(average_participation_rate, 1),
+                "overallRating": round(overall_rating, 2),
+                "qualityConsistencyScore": calculate_quality_consistency(meal_stats, MEAL_TYPES)
+            },
+            "averageRatingPerMeal": average_ratings_per_meal,
+            "ratingStdDevPerMeal": {
+                MEAL_NAMES[meal_type]: round(rating_std_dev(meal_stats[meal_type]), 2)
+                for meal_type in MEAL_TYPES
+            },
+            "studentRatingPerMeal": student_rating_per_meal,
+            "feedbackDistributionPerMeal": feedback_distribution_per_meal,
+            "sentimentAnalysisPerMeal": sentiment_analysis_per_meal,
+            "series": build_daily_series(rollups)
+        }
+
+        return {
+            "status": "success",
+            "startDate": start_date_str,
+            "endDate": rollups[-1]['_id'],
+            "data": analysis_data,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    except Exception as e:
+        return {
+            "error": True,
+            "message": f"Date range analysis failed: {str(e)}",
+            "status": "error"
+        }
+    finally:
+        db_conn.close()
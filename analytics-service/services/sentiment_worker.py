@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Sentiment Precompute Worker
+Tails the feedbacks collection and writes polarity/label per meal comment into
+a side collection, so the sentiment chart reads stored scores instead of
+running NLP in the request path. Uses a change stream where available
+(replica sets, Atlas) and polls updatedAt on standalone servers.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo import UpdateOne, DeleteMany, ASCENDING
+
+from services.daily_analysis_core import MEAL_TYPES, FEEDBACK_BATCH_SIZE
+from services.collection_tailer import CollectionTailer
+from utils.database import get_ist_today
+from utils.sentiment import sentiment_engine, classify_polarity, SENTIMENT_COLLECTION
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SENTIMENT_WORKER_ENABLED = os.getenv('SENTIMENT_WORKER_ENABLED', 'false').lower() == 'true'
+# auto: change stream, falling back to polling; or force change_stream / poll
+SENTIMENT_WORKER_MODE = os.getenv('SENTIMENT_WORKER_MODE', 'auto').lower()
+SENTIMENT_POLL_INTERVAL = float(os.getenv('SENTIMENT_POLL_INTERVAL', '15'))
+# Days of existing feedback scored when the worker starts
+SENTIMENT_BACKFILL_DAYS = int(os.getenv('SENTIMENT_BACKFILL_DAYS', '7'))
+
+# Only the fields needed to score comments
+FEEDBACK_PROJECTION = {'date': 1, 'updatedAt': 1}
+for _meal_type in MEAL_TYPES:
+    FEEDBACK_PROJECTION[f'meals.{_meal_type}.comment'] = 1
+
+
+class SentimentWorker(CollectionTailer):
+    name = 'sentiment-worker'
+
+    def __init__(self, engine=sentiment_engine, mode=SENTIMENT_WORKER_MODE,
+                 poll_interval=SENTIMENT_POLL_INTERVAL, backfill_days=SENTIMENT_BACKFILL_DAYS):
+        super().__init__(mode=mode, poll_interval=poll_interval)
+        self.engine = engine
+        self.backfill_days = backfill_days
+        self.processed = 0
+        # Poll cursor: last (updatedAt, _id) seen, so a batch ending inside a
+        # run of equal timestamps resumes within that run
+        self._poll_since = None
+        self._poll_last_id = None
+
+    def _collections(self):
+        return self.db.feedbacks, self.db[SENTIMENT_COLLECTION]
+
+    def prepare(self):
+        # Polling picks up from here, so nothing written during backfill is missed
+        self._poll_since = datetime.now(timezone.utc).replace(tzinfo=None)
+        self._poll_last_id = None
+        _, side = self._collections()
+        side.create_index([('textHash', ASCENDING)])
+        side.create_index([('date', ASCENDING)])
+        self.backfill()
+
+    def backfill(self):
+        """Score the last backfill_days of feedback"""
+        feedback, _ = self._collections()
+        since = get_ist_today() - timedelta(days=self.backfill_days)
+        cursor = feedback.find({'date': {'$gte': since}}, FEEDBACK_PROJECTION).batch_size(FEEDBACK_BATCH_SIZE)
+        batch = []
+        for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= FEEDBACK_BATCH_SIZE:
+                self.process_feedback(batch)
+                batch = []
+        if batch:
+            self.process_feedback(batch)
+        logger.info("Sentiment backfill done", extra={"scored": self.processed})
+
+    def handle_change(self, change):
+        if change['operationType'] == 'delete':
+            _, side = self._collections()
+            side.delete_many({'feedback': change['documentKey']['_id']})
+        elif change.get('fullDocument'):
+            self.process_feedback([change['fullDocument']])
+
+    def poll(self):
+        """Re-score feedback whose updatedAt moved since the last poll"""
+        feedback, _ = self._collections()
+        query = {'updatedAt': {'$gt': self._poll_since}}
+        if self._poll_last_id is not None:
+            query = {'$or': [
+                query,
+                {'updatedAt': self._poll_since, '_id': {'$gt': self._poll_last_id}}
+            ]}
+        docs = list(
+            feedback.find(query, FEEDBACK_PROJECTION)
+            .sort([('updatedAt', ASCENDING), ('_id', ASCENDING)])
+            .limit(FEEDBACK_BATCH_SIZE)
+        )
+        if not docs:
+            return False
+        self.last_event_at = datetime.now(timezone.utc)
+        self.process_feedback(docs)
+        self._poll_since = docs[-1]['updatedAt']
+        self._poll_last_id = docs[-1]['_id']
+        # A full batch means more are waiting
+        return len(docs) >= FEEDBACK_BATCH_SIZE
+
+    def process_feedback(self, docs):
+        """Score every meal comment of the given feedback documents and upsert the results"""
+        entries = []
+        cleared = []
+        for doc in docs:
+            meals = doc.get('meals') or {}
+            for meal_type in MEAL_TYPES:
+                comment = ((meals.get(meal_type) or {}).get('comment') or '').strip()
+                if comment:
+                    entries.append((doc, meal_type, comment))
+                else:
+                    cleared.append(f"{doc['_id']}:{meal_type}")
+
+        if not entries and not cleared:
+            return 0
+
+        # One batched pass; never read back our own (possibly stale) precomputed scores
+        scores = self.engine.polarities([comment for _, _, comment in entries], use_precomputed=False)
+        now = datetime.now(timezone.utc)
+        operations = [
+            UpdateOne(
+                {'_id': f"{doc['_id']}:{meal_type}"},
+                {'$set': {
+                    'feedback': doc['_id'],
+                    'date': doc.get('date'),
+                    'meal': meal_type,
+                    'textHash': self.engine.key_for(comment),
+                    'backend': self.engine.backend.name,
+                    'polarity': polarity,
+                    'label': classify_polarity(polarity),
+                    'updatedAt': now
+                }},
+                upsert=True
+            )
+            for (doc, meal_type, comment), polarity in zip(entries, scores)
+        ]
+        if cleared:
+            operations.append(DeleteMany({'_id': {'$in': cleared}}))
+
+        _, side = self._collections()
+        side.bulk_write(operations, ordered=False)
+        self.processed += len(entries)
+        return len(entries)
+
+    def stats(self):
+        """Mode in use, comments scored and last event time"""
+        return {
+            "enabled": self.running,
+            "mode": self.active_mode,
+            "processed": self.processed,
+            "lastEventAt": self.last_event_at.isoformat() if self.last_event_at else None
+        }
+
+
+sentiment_worker = SentimentWorker()
+
+
+def start_sentiment_worker():
+    """Start the precompute worker if enabled"""
+    if SENTIMENT_WORKER_ENABLED:
+        sentiment_worker.start()
+
+
+def stop_sentiment_worker():
+    """Stop the precompute worker"""
+    sentiment_worker.stop()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Student Count Module
+Registered-student denominator without a users scan per request: the count is
+cached for STUDENT_COUNT_TTL seconds and refreshed in the background (stale
+values are served meanwhile), recounted on users changes when a change stream
+is available, and recorded per date so past participation rates use the
+headcount of that day.
+"""
+
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.collection_tailer import CollectionTailer
+from utils.database import DatabaseConnection, get_ist_today
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+STUDENT_COUNT_TTL = float(os.getenv('STUDENT_COUNT_TTL', '300'))
+# Background thread keeping the count fresh (users change stream, or a refresh every TTL)
+STUDENT_COUNT_WATCH = os.getenv('STUDENT_COUNT_WATCH', 'true').lower() == 'true'
+STUDENT_COUNT_MODE = os.getenv('STUDENT_COUNT_MODE', 'auto').lower()
+HEADCOUNT_COLLECTION = os.getenv('HEADCOUNT_COLLECTION', 'student_headcounts')
+
+STUDENT_QUERY = {'isAdmin': False}
+
+
+def record_headcount(db, date_str, total_students):
+    """Store the headcount observed on a date (the last refresh of the day wins)"""
+    db[HEADCOUNT_COLLECTION].update_one(
+        {'_id': date_str},
+        {'$set': {
+            'date': datetime.strptime(date_str, '%Y-%m-%d'),
+            'totalStudents': total_students,
+            'updatedAt': datetime.now(timezone.utc)
+        }},
+        upsert=True
+    )
+
+
+class StudentCounter:
+    def __init__(self, ttl=STUDENT_COUNT_TTL):
+        self.ttl = ttl
+        self.value = None
+        self.refreshes = 0
+        self._fetched_at = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._db_conn = DatabaseConnection()
+
+    def _db(self):
+        if self._db_conn.db is None:
+            self._db_conn.connect()
+        return self._db_conn.db
+
+    def refresh(self):
+        """Count non-admin users now and record today's headcount"""
+        db = self._db()
+        value = db.users.count_documents(STUDENT_QUERY)
+        with self._lock:
+            self.value = value
+            self._fetched_at = time.monotonic()
+            self.refreshes += 1
+        try:
+            record_headcount(db, get_ist_today().strftime('%Y-%m-%d'), value)
+        except Exception as e:
+            logger.warning("Headcount snapshot failed", extra={"error": str(e)})
+        return value
+
+    def get(self):
+        """Cached count; only the very first call waits for the database"""
+        with self._lock:
+            value = self.value
+            stale = self._fetched_at is None or time.monotonic() - self._fetched_at > self.ttl
+        if value is None:
+            return self.refresh()
+        if stale:
+            self._refresh_in_background()
+        return value
+
+    def invalidate(self):
+        """Mark the count stale so the next read refreshes it"""
+        with self._lock:
+            self._fetched_at = None
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, name='student-count-refresh', daemon=True).start()
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning("Student count refresh failed", extra={"error": str(e)})
+        finally:
+            self._refreshing = False
+
+    def stats(self):
+        """Cached value, its age and number of counts run"""
+        age = None if self._fetched_at is None else round(time.monotonic() - self._fetched_at, 1)
+        return {
+            "value": self.value,
+            "ageSeconds": age,
+            "ttlSeconds": self.ttl,
+            "refreshes": self.refreshes
+        }
+
+
+class StudentCountWatcher(CollectionTailer):
+    name = 'student-count'
+    collection = 'users'
+
+    def __init__(self, counter, mode=STUDENT_COUNT_MODE):
+        # Polling simply recounts once per TTL
+        super().__init__(mode=mode, poll_interval=counter.ttl)
+        self.counter = counter
+        self._dirty = False
+
+    def change_stream_pipeline(self):
+        # Profile edits do not change the count; only new, removed or promoted users do
+        return [{'$match': {'$or': [
+            {'operationType': {'$in': ['insert', 'replace', 'delete']}},
+            {'operationType': 'update', 'updateDescription.updatedFields.isAdmin': {'$exists': True}}
+        ]}}]
+
+    def prepare(self):
+        self.counter.refresh()
+
+    def handle_change(self, change):
+        # Recounted on the next tick, so a bulk import costs one count
+        self._dirty = True
+
+    def tick(self):
+        if self._dirty:
+            self._dirty = False
+            self.counter.refresh()
+
+    def poll(self):
+        self.counter.refresh()
+        return False
+
+
+student_counter = StudentCounter()
+student_count_watcher = StudentCountWatcher(student_counter)
+
+
+def headcounts_for(db, date_strs):
+    """
+    Headcount per date: the recorded snapshot for past days, else the
+    headcount frozen in that day's rollup, else (and for today) the cached
+    current count
+
+    Returns {YYYY-MM-DD: total_students}.
+    """
+    today_str = get_ist_today().strftime('%Y-%m-%d')
+    past = [date_str for date_str in date_strs if date_str < today_str]
+    found = {}
+    if past:
+        for doc in db[HEADCOUNT_COLLECTION].find({'_id': {'$in': past}}, {'totalStudents': 1}):
+            found[doc['_id']] = doc['totalStudents']
+        missing = [date_str for date_str in past if date_str not in found]
+        if missing:
+            # Rollups written before snapshots existed still hold their day's headcount
+            # (imported here: daily_rollups builds on this module)
+            from services.daily_rollups import ROLLUP_COLLECTION
+            for doc in db[ROLLUP_COLLECTION].find({'_id': {'$in': missing}, 'closed': True},
+                                                  {'totalStudents': 1}):
+                found[doc['_id']] = doc['totalStudents']
+    if len(found) < len(date_strs):
+        current = student_counter.get()
+        for date_str in date_strs:
+            found.setdefault(date_str, current)
+    return found
+
+
+def headcount_for(db, date_str):
+    """Headcount for one date (see headcounts_for)"""
+    return headcounts_for(db, [date_str])[date_str]
+
+
+def start_student_count_watcher():
+    """Start the background count refresher if enabled"""
+    if STUDENT_COUNT_WATCH:
+        student_count_watcher.start()
+
+
+def stop_student_count_watcher():
+    """Stop the background count refresher"""
+    student_count_watcher.stop()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Trend Analysis Module
+Rolling per-meal averages, 7-day moving participation, week-over-week deltas
+and trend slopes for the last N days, computed with NumPy over a dense
+date x meal array built from daily_rollups (days without feedback are gaps,
+not zeros). NumPy is imported on first use, not at service startup.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.daily_analysis_core import MEAL_TYPES, MEAL_NAMES
+from services.daily_rollups import get_rollups
+from utils.database import DatabaseConnection, get_ist_today
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Rolling window and week length, in days
+TREND_WINDOW_DAYS = 7
+# Extra history loaded so the first requested day has a full window and a previous week
+TREND_LOOKBACK_DAYS = 2 * TREND_WINDOW_DAYS - 1
+TRENDS_MAX_DAYS = 365
+
+
+def rollup_arrays(rollups):
+    """
+    Dense arrays from consecutive daily rollups
+
+    Returns:
+        counts, sums: (days, meals) rating counts and rating sums
+        participants, headcount, has_feedback: (days,)
+    """
+    import numpy as np
+    counts = np.array([[r['meals'][m]['count'] for m in MEAL_TYPES] for r in rollups], dtype=np.float64)
+    sums = np.array([[r['meals'][m]['sum'] for m in MEAL_TYPES] for r in rollups], dtype=np.float64)
+    participants = np.array([r['participatingStudents'] for r in rollups], dtype=np.float64)
+    headcount = np.array([r['totalStudents'] for r in rollups], dtype=np.float64)
+    has_feedback = np.array([r['documents'] > 0 for r in rollups], dtype=bool)
+    return counts, sums, participants, headcount, has_feedback
+
+
+def rolling_sum(values, window):
+    """Sum over the trailing window along axis 0 (shorter at the start)"""
+    import numpy as np
+    cumulative = np.cumsum(values, axis=0)
+    shifted = np.zeros_like(cumulative)
+    shifted[window:] = cumulative[:-window]
+    return cumulative - shifted
+
+
+def safe_divide(numerator, denominator):
+    """Elementwise division with NaN where the denominator is 0 (a gap)"""
+    import numpy as np
+    out = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def trend_slopes(values):
+    """
+    Least-squares slope per column against the day index, skipping NaN days
+
+    values: (days, series). Returns (series,) with NaN where fewer than 2 points.
+    """
+    import numpy as np
+    present = ~np.isnan(values)
+    x = np.arange(values.shape[0], dtype=np.float64)[:, None]
+    n = present.sum(axis=0)
+    y = np.where(present, values, 0.0)
+    x_mean = safe_divide((x * present).sum(axis=0), n)
+    y_mean = safe_divide(y.sum(axis=0), n)
+    dx = np.where(present, x - x_mean, 0.0)
+    dy = np.where(present, y - y_mean, 0.0)
+    denominator = (dx * dx).sum(axis=0)
+    slopes = safe_divide((dx * dy).sum(axis=0), denominator)
+    return np.where(n >= 2, slopes, np.nan)
+
+
+def to_list(values, digits=2):
+    """Rounded floats for JSON, NaN as None"""
+    import numpy as np
+    # Round in NumPy, then only a cheap NaN check per element (NaN != NaN)
+    return [None if v != v else v for v in np.round(values, digits).tolist()]
+
+
+def to_number(value, digits=3):
+    """Rounded float for JSON, NaN as None"""
+    import numpy as np
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def compute_trends(rollups, days):
+    """
+    Trend series for the last `days` of the given consecutive rollups
+
+    The rollups may start up to TREND_LOOKBACK_DAYS earlier; that history only
+    feeds rolling windows and the previous-week comparison.
+    """
+    import numpy as np
+    counts, sums, participants, headcount, has_feedback = rollup_arrays(rollups)
+    window = TREND_WINDOW_DAYS
+
+    # Columns: the four meals plus an all-meals column
+    counts = np.column_stack([counts, counts.sum(axis=1)])
+    sums = np.column_stack([sums, sums.sum(axis=1)])
+
+    daily_average = safe_divide(sums, counts)
+    # Rating-weighted rolling mean: busy days weigh more than quiet ones
+    rolling_average = safe_divide(rolling_sum(sums, window), rolling_sum(counts, window))
+
+    participation = np.where(has_feedback, safe_divide(participants, headcount) * 100, np.nan)
+    observed = ~np.isnan(participation)
+    moving_participation = safe_divide(
+        rolling_sum(np.where(observed, participation, 0.0), window),
+        rolling_sum(observed.astype(np.float64), window)
+    )
+
+    # This week vs the week before, over the last two windows
+    week_sums = rolling_sum(sums, window)
+    week_counts = rolling_sum(counts, window)
+    current_week = safe_divide(week_sums[-1], week_counts[-1])
+    previous_week = (
+        safe_divide(week_sums[-1 - window], week_counts[-1 - window])
+        if len(rollups) > window else np.full(current_week.shape, np.nan)
+    )
+    participation_current = moving_participation[-1]
+    participation_previous = moving_participation[-1 - window] if len(rollups) > window else np.nan
+
+    # Only the requested days are reported and fitted
+    view = slice(len(rollups) - days, None)
+    slopes = trend_slopes(daily_average[view])
+    participation_slope = trend_slopes(participation[view][:, None])[0]
+
+    def series(column):
+        return {
+            "daily": to_list(daily_average[view, column]),
+            "rollingAverage": to_list(rolling_average[view, column]),
+            "currentWeekAverage": to_number(current_week[column], 2),
+            "previousWeekAverage": to_number(previous_week[column], 2),
+            "weekOverWeekDelta": to_number(current_week[column] - previous_week[column]),
+            "slopePerDay": to_number(slopes[column], 4),
+            "slopePerWeek": to_number(slopes[column] * window)
+        }
+
+    return {
+        "dates": [r['_id'] for r in rollups[view]],
+        "meals": {MEAL_NAMES[meal_type]: series(index) for index, meal_type in enumerate(MEAL_TYPES)},
+        "overall": series(len(MEAL_TYPES)),
+        "participation": {
+            "dailyRate": to_list(participation[view], 1),
+            "movingAverage7d": to_list(moving_participation[view], 1),
+            "currentWeekAverage": to_number(participation_current, 1),
+            "previousWeekAverage": to_number(participation_previous, 1),
+            "weekOverWeekDelta": to_number(participation_current - participation_previous, 2),
+            "slopePerDay": to_number(participation_slope, 4)
+        },
+        "daysWithFeedback": int(has_feedback[view].sum())
+    }
+
+
+def analyze_trends(days: int) -> dict:
+    """
+    Trend analysis for the last N days up to today (IST)
+
+    Args:
+        days: Number of days to report (1 to TRENDS_MAX_DAYS)
+
+    Returns:
+        Dictionary with trend series
+    """
+    db_conn = DatabaseConnection()
+
+    if not db_conn.connect():
+        error_msg = "Failed to connect to database"
+        logger.error(error_msg)
+        return {
+            "error": True,
+            "message": error_msg,
+            "status": "error"
+        }
+
+    try:
+        end_date = get_ist_today()
+        start_date = end_date - timedelta(days=days - 1 + TREND_LOOKBACK_DAYS)
+        rollups = get_rollups(db_conn.db, start_date, end_date)
+
+        if not any(r['documents'] for r in rollups[-days:]):
+            return {
+                "status": "no_data",
+                "message": f"No feedback found in the last {days} days",
+                "days": days,
+                "type": "no_feedback"
+            }
+
+        trends = compute_trends(rollups, days)
+        return {
+            "status": "success",
+            "days": days,
+            "startDate": trends["dates"][0],
+            "endDate": trends["dates"][-1],
+            "data": trends,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    except Exception as e:
+        return {
+            "error": True,
+            "message": f"Trend analysis failed: {str(e)}",
+            "status": "error"
+        }
+    finally:
+        db_conn.close()
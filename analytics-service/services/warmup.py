@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Startup Warm-up Module
+Renders a synthetic day through the chart pipeline and primes the sentiment
+backend once at startup, so the first real chart request does not pay for
+font-cache discovery, emoji glyph fallback, Agg initialization and TextBlob
+lexicon loading. /health reports not-ready until it finishes.
+"""
+
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.daily_analysis_core import MEAL_NAMES
+from utils.chart_generator import ChartGenerator, RENDER_PROFILES, DEFAULT_RENDER_PROFILE
+from utils.sentiment import sentiment_engine
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+STARTUP_WARMUP = os.getenv('STARTUP_WARMUP', 'false').lower() == 'true'
+# Render profiles warmed (comma-separated), default the one charts are served in
+WARMUP_PROFILES = [
+    profile.strip() for profile in os.getenv('WARMUP_PROFILES', DEFAULT_RENDER_PROFILE).split(',')
+    if profile.strip()
+]
+
+# Ratings picked so every rating emoji (🌟 😊 😐 😟) is drawn once
+WARMUP_RATINGS = [4.6, 4.2, 3.4, 2.6]
+WARMUP_COMMENTS = [
+    ('very tasty food 😋', 5), ('good', 4), ('okay', 3), ('too oily', 2), ('bad and cold', 1)
+]
+
+
+def synthetic_analysis(students=100):
+    """analysis_data shaped like analyze_daily_feedback output (fixed, no database)"""
+    averages = {}
+    distribution = {}
+    sentiment = {}
+    for meal, rating in zip(MEAL_NAMES.values(), WARMUP_RATINGS):
+        counts = [1, 2, 4, 8, 10] if rating >= 4 else [6, 8, 6, 4, 1]
+        averages[meal] = rating
+        distribution[meal] = {f'{star}_star': counts[star - 1] for star in range(1, 6)}
+        sentiment[meal] = {'average_rating': rating, 'total_responses': sum(counts)}
+    participating = 72
+    return {
+        'overview': {
+            'totalStudents': students,
+            'participatingStudents': participating,
+            'participationRate': round(participating / students * 100, 1),
+            'overallRating': round(sum(WARMUP_RATINGS) / len(WARMUP_RATINGS), 2),
+            'qualityConsistencyScore': 80.0
+        },
+        'averageRatingPerMeal': averages,
+        'feedbackDistributionPerMeal': distribution,
+        'sentimentAnalysisPerMeal': sentiment,
+        'allComments': [
+            {'text': text, 'meal': meal, 'rating': rating}
+            for meal in MEAL_NAMES.values() for text, rating in WARMUP_COMMENTS
+        ]
+    }
+
+
+class StartupWarmup:
+    def __init__(self, enabled=STARTUP_WARMUP, profiles=None):
+        self.enabled = enabled
+        self.profiles = profiles or WARMUP_PROFILES
+        # disabled -> pending -> running -> done / failed
+        self.status = 'pending' if enabled else 'disabled'
+        self.timings = {}
+        self.error = None
+        self.finished_at = None
+        self._thread = None
+
+    @property
+    def ready(self):
+        """False only while a warm-up is pending or running (a failed one does not block)"""
+        return self.status not in ('pending', 'running')
+
+    def start(self):
+        """Run on a daemon thread so /health can answer meanwhile (idempotent)"""
+        if self.enabled and self._thread is None:
+            self._thread = threading.Thread(target=self.run, name='startup-warmup', daemon=True)
+            self._thread.start()
+
+    def _timed(self, step, work):
+        start = time.perf_counter()
+        work()
+        self.timings[step] = round((time.perf_counter() - start) * 1000, 1)
+
+    def run(self):
+        """Prime the sentiment backend, then render every chart once per warm-up profile"""
+        self.status = 'running'
+        started = time.perf_counter()
+        try:
+            # Straight to the backend so the lexicon load is timed on its own
+            self._timed('sentiment', lambda: sentiment_engine.backend.score(
+                [text for text, _ in WARMUP_COMMENTS]
+            ))
+            data = synthetic_analysis()
+            for profile in self.profiles:
+                if profile not in RENDER_PROFILES:
+                    logger.warning("Unknown warm-up profile skipped", extra={"profile": profile})
+                    continue
+                generator = ChartGenerator(use_cache=False, profile=profile)
+                self._timed(f'charts:{profile}', lambda: generator.generate_all_charts(data))
+            self.status = 'done'
+        except Exception as e:
+            # Not fatal: the first real request simply pays the cost instead
+            self.status = 'failed'
+            self.error = str(e)
+            logger.warning("Startup warm-up failed", extra={"error": str(e)})
+        finally:
+            self.timings['total'] = round((time.perf_counter() - started) * 1000, 1)
+            self.finished_at = datetime.now().isoformat()
+        if self.status == 'done':
+            logger.info("Startup warm-up done", extra={"timingsMs": self.timings})
+
+    def stats(self):
+        """Warm-up status and milliseconds per step"""
+        return {
+            "status": self.status,
+            "timingsMs": self.timings,
+            "error": self.error,
+            "finishedAt": self.finished_at
+        }
+
+
+startup_warmup = StartupWarmup()
+
+
+def start_startup_warmup():
+    """Start the warm-up thread if STARTUP_WARMUP is on"""
+    startup_warmup.start()
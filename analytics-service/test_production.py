@@ -32,10 +32,10 @@ def test_imports():
         return False
     
     try:
-        import seaborn
-        print("✓ Seaborn imported")
+        import numpy
+        print("✓ NumPy imported")
     except ImportError as e:
-        print(f"✗ Seaborn import failed: {e}")
+        print(f"✗ NumPy import failed: {e}")
         return False
     
     try:
@@ -45,6 +45,13 @@ def test_imports():
         print(f"✗ TextBlob import failed: {e}")
         return False
     
+    try:
+        import prometheus_client
+        print("✓ prometheus_client imported")
+    except ImportError as e:
+        print(f"✗ prometheus_client import failed: {e}")
+        return False
+    
     return True
 
 
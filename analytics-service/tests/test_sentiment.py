@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Sentiment engine tests
+Polarities from the engine must match TextBlob(text).sentiment.polarity
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from textblob import TextBlob
+
+from utils.sentiment import SentimentEngine, classify_polarity
+
+MIXED_CASE_EMOTICONS = [":D", "Food :-D", "ok :D", "great :D", "Bad food :(", "  Tasty   :P  "]
+
+
+@pytest.mark.parametrize("comment", MIXED_CASE_EMOTICONS)
+def test_emoticon_polarity_matches_textblob(comment):
+    engine = SentimentEngine(store_path='', backend='textblob')
+    expected = TextBlob(comment).sentiment.polarity
+
+    label, polarity = engine.analyze(comment)
+
+    assert polarity == pytest.approx(expected)
+    assert label == classify_polarity(expected)
+
+
+def test_case_variants_are_scored_separately():
+    engine = SentimentEngine(store_path='', backend='textblob')
+
+    polarities = engine.polarities(["great :D", "great :d", "great  :D"])
+
+    assert polarities[0] == pytest.approx(TextBlob("great :D").sentiment.polarity)
+    assert polarities[1] == pytest.approx(TextBlob("great :d").sentiment.polarity)
+    # Whitespace variants still share one score
+    assert engine.scored == 2
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Sentiment backend parity tests
+Every backend in SENTIMENT_BACKENDS must label comments like the TextBlob
+reference at the +/-0.1 thresholds
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from benchmarks.bench_sentiment_backends import synthetic_comments
+from utils.sentiment import SENTIMENT_BACKENDS, TextBlobBackend, classify_polarity, normalize_comment
+
+# Minimum label agreement with TextBlob on the synthetic comments, in percent
+MIN_AGREEMENT = 95.0
+SYNTHETIC_COMMENTS = 2000
+
+# Hand-written cases: (comment, expected TextBlob label)
+CASES = [
+    ('good', 'positive'),
+    ('Good!', 'positive'),
+    ('not good', 'negative'),
+    ('not very good', 'negative'),
+    ('very tasty food', 'positive'),
+    ('bad and cold', 'negative'),
+    ('too oily', 'neutral'),
+    ('was not bad', 'positive'),
+    ('not a good day', 'negative'),
+    ('', 'neutral')
+]
+
+BACKENDS = sorted(SENTIMENT_BACKENDS)
+
+
+@pytest.fixture(scope='module')
+def reference_labels():
+    texts = [normalize_comment(text) for text in synthetic_comments(SYNTHETIC_COMMENTS, seed=0)]
+    return texts, [classify_polarity(p) for p in TextBlobBackend().score(texts)]
+
+
+@pytest.mark.parametrize('name', BACKENDS)
+@pytest.mark.parametrize('comment, expected', CASES)
+def test_hand_written_cases(name, comment, expected):
+    polarity = SENTIMENT_BACKENDS[name]().score([normalize_comment(comment)])[0]
+
+    assert classify_polarity(polarity) == expected
+
+
+@pytest.mark.parametrize('name', BACKENDS)
+def test_label_agreement_with_textblob(name, reference_labels):
+    texts, expected = reference_labels
+
+    labels = [classify_polarity(p) for p in SENTIMENT_BACKENDS[name]().score(texts)]
+
+    agreement = sum(a == b for a, b in zip(labels, expected)) / len(texts) * 100
+    assert agreement >= MIN_AGREEMENT
+
+
+@pytest.mark.parametrize('name', BACKENDS)
+def test_batch_matches_single_scoring(name):
+    backend = SENTIMENT_BACKENDS[name]()
+    texts = [normalize_comment(text) for text, _ in CASES]
+
+    assert backend.score(texts) == pytest.approx([backend.score([text])[0] for text in texts])
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Content-addressed chart cache - memory LRU backed by an optional disk store
+Charts are keyed by a stable hash of exactly the inputs each chart consumes
+(the disk store is private to this service, values are pickled image bytes)
+"""
+
+import os
+import sys
+import json
+import pickle
+import hashlib
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.result_cache import ResultCache
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when chart styling changes so stale renders are never served
+CHART_CACHE_VERSION = 3
+
+CHART_CACHE_ENABLED = os.getenv('CHART_CACHE_ENABLED', 'true').lower() == 'true'
+CHART_CACHE_MEMORY_MB = float(os.getenv('CHART_CACHE_MEMORY_MB', '32'))
+CHART_CACHE_DIR = os.getenv('CHART_CACHE_DIR', '')  # empty = memory only
+CHART_CACHE_DISK_MB = float(os.getenv('CHART_CACHE_DISK_MB', '256'))
+
+
+def chart_key(name, inputs, profile='default'):
+    """Stable content hash for a chart name, its inputs and the render profile"""
+    payload = json.dumps(
+        {'v': CHART_CACHE_VERSION, 'chart': name, 'profile': profile, 'inputs': inputs},
+        sort_keys=True, default=str, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ChartCache:
+    def __init__(self, memory_bytes, cache_dir='', disk_bytes=0):
+        self.memory = ResultCache(memory_bytes, name='charts')
+        self.cache_dir = cache_dir
+        self.disk_bytes = disk_bytes
+        self.disk_hits = 0
+        self._disk_lock = threading.Lock()
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.pkl')
+
+    def get(self, key):
+        """Memory first, then disk (promoting disk hits into memory)"""
+        value = self.memory.get(key)
+        if value is not None or not self.cache_dir:
+            return value
+
+        try:
+            with open(self._path(key), 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+            return None
+
+        self.disk_hits += 1
+        self.memory.set(key, value)
+        return value
+
+    def set(self, key, value):
+        """Store a rendered chart in memory and, if configured, on disk"""
+        self.memory.set(key, value)
+        if not self.cache_dir:
+            return
+
+        path = self._path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Chart cache write failed", extra={"error": str(e)})
+            return
+        self._prune_disk()
+
+    def _prune_disk(self):
+        """Delete oldest cache files once the disk budget is exceeded"""
+        with self._disk_lock:
+            try:
+                entries = []
+                for entry in os.scandir(self.cache_dir):
+                    if entry.name.endswith('.pkl'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except OSError:
+                return
+
+            total = sum(size for _, size, _ in entries)
+            if total <= self.disk_bytes:
+                return
+            for _, size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                if total <= self.disk_bytes:
+                    break
+
+    def stats(self):
+        """Memory stats plus disk hits"""
+        return {**self.memory.stats(), "diskHits": self.disk_hits, "diskDir": self.cache_dir or None}
+
+
+chart_cache = ChartCache(
+    int(CHART_CACHE_MEMORY_MB * 1024 * 1024),
+    cache_dir=CHART_CACHE_DIR,
+    disk_bytes=int(CHART_CACHE_DISK_MB * 1024 * 1024)
+)
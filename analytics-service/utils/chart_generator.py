@@ -5,32 +5,209 @@ Enhanced with modern dark theme matching the frontend UI
 """
 
 import os
+import sys
 import base64
+import functools
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
-from textblob import TextBlob
-
-# Set modern dark theme to match frontend
-sns.set_theme(style="darkgrid")
-plt.rcParams['figure.facecolor'] = '#0f172a'  # Navy-950
-plt.rcParams['axes.facecolor'] = '#1e293b'    # Navy-900
-plt.rcParams['text.color'] = '#e2e8f0'        # Gray-200
-plt.rcParams['axes.labelcolor'] = '#e2e8f0'   # Gray-200
-plt.rcParams['axes.edgecolor'] = '#475569'    # Navy-600
-plt.rcParams['xtick.color'] = '#cbd5e1'       # Gray-300
-plt.rcParams['ytick.color'] = '#cbd5e1'       # Gray-300
-plt.rcParams['grid.color'] = '#334155'        # Navy-700
-plt.rcParams['grid.alpha'] = 0.3
-plt.rcParams['font.family'] = 'sans-serif'
-plt.rcParams['font.size'] = 11
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.chart_cache import chart_cache, chart_key, CHART_CACHE_ENABLED
+from utils.metrics import stage_timer
+from utils.sentiment import sentiment_engine, SENTIMENT_ENGINE_VERSION
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# matplotlib and NumPy are imported on first render (see get_pyplot), so
+# /health and chart-less requests never pay for them.
+
+# What seaborn's set_theme(style="darkgrid") applied; seaborn was only used
+# for this, so the values are inlined instead of importing seaborn (and pandas)
+DARKGRID_THEME = {
+    'axes.axisbelow': True,
+    'axes.grid': True,
+    'axes.labelsize': 12.0,
+    'axes.linewidth': 1.25,
+    'axes.prop_cycle': ['#4c72b0', '#dd8452', '#55a868', '#c44e52', '#8172b3',
+                        '#937860', '#da8bc3', '#8c8c8c', '#ccb974', '#64b5cd'],
+    'axes.titlesize': 12.0,
+    'font.sans-serif': ['Arial', 'DejaVu Sans', 'Liberation Sans', 'Bitstream Vera Sans', 'sans-serif'],
+    'grid.linewidth': 1.0,
+    'legend.fontsize': 11.0,
+    'legend.title_fontsize': 12.0,
+    'lines.solid_capstyle': 'round',
+    'patch.edgecolor': 'w',
+    'patch.force_edgecolor': True,
+    'xtick.bottom': False,
+    'xtick.labelsize': 11.0,
+    'xtick.major.size': 6.0,
+    'xtick.major.width': 1.25,
+    'xtick.minor.size': 4.0,
+    'xtick.minor.width': 1.0,
+    'ytick.left': False,
+    'ytick.labelsize': 11.0,
+    'ytick.major.size': 6.0,
+    'ytick.major.width': 1.25,
+    'ytick.minor.size': 4.0,
+    'ytick.minor.width': 1.0
+}
+
+# Modern dark theme to match frontend
+DARK_THEME = {
+    'figure.facecolor': '#0f172a',  # Navy-950
+    'axes.facecolor': '#1e293b',    # Navy-900
+    'text.color': '#e2e8f0',        # Gray-200
+    'axes.labelcolor': '#e2e8f0',   # Gray-200
+    'axes.edgecolor': '#475569',    # Navy-600
+    'xtick.color': '#cbd5e1',       # Gray-300
+    'ytick.color': '#cbd5e1',       # Gray-300
+    'grid.color': '#334155',        # Navy-700
+    'grid.alpha': 0.3,
+    'font.family': 'sans-serif',
+    'font.size': 11
+}
+
+_pyplot = None
+_pyplot_import_lock = threading.Lock()
+
+
+def get_pyplot():
+    """Import matplotlib (Agg backend) and apply the chart theme on first use"""
+    global _pyplot
+    if _pyplot is None:
+        with _pyplot_import_lock:
+            if _pyplot is None:
+                import matplotlib
+                matplotlib.use('Agg')  # Non-interactive backend
+                import matplotlib.pyplot as pyplot
+                from cycler import cycler
+                theme = {**DARKGRID_THEME, **DARK_THEME}
+                theme['axes.prop_cycle'] = cycler('color', theme['axes.prop_cycle'])
+                pyplot.rcParams.update(theme)
+                _pyplot = pyplot
+    return _pyplot
+
+# pyplot keeps global figure state, so renders from analysis threads are serialized
+_pyplot_lock = threading.Lock()
+
+# Rendering mode: "serial" renders in-process, "process" fans the charts out to a warm worker pool
+CHART_RENDER_MODE = os.getenv('CHART_RENDER_MODE', 'serial').lower()
+CHART_RENDER_WORKERS = int(os.getenv('CHART_RENDER_WORKERS', '4'))
+
+# Response key -> ChartGenerator method
+CHART_METHODS = {
+    'sentiment': 'generate_sentiment_chart',
+    'distribution': 'generate_rating_distribution_chart',
+    'participation': 'generate_participation_chart',
+    'avgRatings': 'generate_avg_ratings_chart'
+}
+
+_render_pool = None
+_render_pool_lock = threading.Lock()
+# Set with ANALYSIS_EXECUTOR=process: each analysis worker would otherwise start
+# its own render pool (workers x CHART_RENDER_WORKERS processes)
+_render_pool_disabled = False
+
+# Figure templates: styled skeletons built once per process, updated in place per request
+CHART_TEMPLATES_ENABLED = os.getenv('CHART_TEMPLATES_ENABLED', 'false').lower() == 'true'
+MAX_FIGURE_TEMPLATES = 16
+_figure_templates = OrderedDict()
+
+# Named output profiles, selectable per request (?profile=...)
+# Measured sizes/latencies are documented in README.md
+RENDER_PROFILES = {
+    'thumbnail': {'format': 'png', 'dpi': 50, 'pil_kwargs': {'optimize': True}},
+    'web': {'format': 'png', 'dpi': 100, 'pil_kwargs': {'optimize': True}},
+    'default': {'format': 'png', 'dpi': 150},
+    'print': {'format': 'png', 'dpi': 300},
+    'webp': {'format': 'webp', 'dpi': 100, 'pil_kwargs': {'quality': 80, 'method': 4}},
+    'svg': {'format': 'svg'}
+}
+DEFAULT_RENDER_PROFILE = os.getenv('CHART_DEFAULT_PROFILE', 'default')
+
+MEDIA_TYPES = {
+    'png': 'image/png',
+    'webp': 'image/webp',
+    'svg': 'image/svg+xml'
+}
+
+
+def cached_chart(name, select_inputs):
+    """Memoize a generate_*_chart method on a hash of exactly the inputs it consumes"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, data):
+            if not self.use_cache:
+                with stage_timer(f'chart_{name}'):
+                    return method(self, data)
+            
+            key = chart_key(name, select_inputs(data), self.profile)
+            cached = chart_cache.get(key)
+            if cached is not None:
+                return cached
+            
+            with stage_timer(f'chart_{name}'):
+                result = method(self, data)
+            if result is not None:
+                chart_cache.set(key, result)
+            return result
+        # Exposed so the parallel renderer can check the cache before dispatching
+        wrapper.chart_name = name
+        wrapper.select_inputs = select_inputs
+        return wrapper
+    return decorator
+
+
+def _avg_ratings_inputs(data):
+    return data.get('averageRatingPerMeal', {})
+
+
+def _distribution_inputs(data):
+    return data.get('feedbackDistributionPerMeal', {})
+
+
+def _sentiment_inputs(data):
+    return {
+        # Scores change with the engine version, so its charts and ETags must too
+        'backend': sentiment_engine.backend.name,
+        'engine': SENTIMENT_ENGINE_VERSION,
+        'hasMeals': bool(data.get('sentimentAnalysisPerMeal')),
+        'comments': [
+            [c.get('text', ''), c.get('meal', 'Unknown'), c.get('rating', 0)]
+            for c in data.get('allComments', [])
+        ]
+    }
+
+
+def _participation_inputs(data):
+    overview = data.get('overview', {})
+    return {
+        key: overview.get(key, 0)
+        for key in ('totalStudents', 'participatingStudents', 'participationRate',
+                    'overallRating', 'qualityConsistencyScore')
+    }
 
 class ChartGenerator:
-    def __init__(self):
-        """Initialize chart generator for in-memory base64 generation (no file storage)"""
+    def __init__(self, use_cache=CHART_CACHE_ENABLED, profile=None, use_templates=CHART_TEMPLATES_ENABLED):
+        """Initialize chart generator for in-memory PNG/base64 generation (no file storage)"""
+        # Serve identical charts from the content-addressed cache
+        self.use_cache = use_cache
+        
+        # Reuse styled figure skeletons across requests (per process)
+        self.use_templates = use_templates
+        
+        # Output format and resolution
+        self.profile = profile or DEFAULT_RENDER_PROFILE
+        if self.profile not in RENDER_PROFILES:
+            raise ValueError(f"Unknown render profile: {self.profile}")
+        self.render_settings = RENDER_PROFILES[self.profile]
+        
         # Modern gradient color schemes matching frontend
         self.meal_colors = {
             'Breakfast': '#f59e0b',   # Amber-500
@@ -46,6 +223,7 @@ class ChartGenerator:
             4: '#84cc16',  # Lime-500
             5: '#10b981'   # Emerald-500
         }
+        self.star_keys = ['1_star', '2_star', '3_star', '4_star', '5_star']
         
         self.sentiment_colors = {
             'positive': '#10b981',  # Emerald-500
@@ -60,45 +238,63 @@ class ChartGenerator:
         self.text_primary = '#e2e8f0' # Gray-200
         self.text_secondary = '#cbd5e1' # Gray-300
     
+    def render_image(self, fig, close=True, bbox_inches='tight'):
+        """Render figure to image bytes in the active profile's format without saving to disk"""
+        plt = get_pyplot()
+        settings = self.render_settings
+        save_kwargs = {}
+        if 'dpi' in settings:
+            save_kwargs['dpi'] = settings['dpi']
+        if 'pil_kwargs' in settings:
+            save_kwargs['pil_kwargs'] = settings['pil_kwargs']
+        
+        buffer = BytesIO()
+        # Draw + encode (PNG/WebP/SVG); also part of the chart_* stage it runs in
+        with stage_timer('image_encode'):
+            fig.savefig(buffer, format=settings['format'], bbox_inches=bbox_inches,
+                       facecolor='#0f172a', transparent=False, **save_kwargs)
+        if close:
+            plt.close(fig)
+        return buffer.getvalue()
+    
+    @property
+    def media_type(self):
+        """MIME type of the active profile's output"""
+        return MEDIA_TYPES[self.render_settings['format']]
+    
     def encode_to_base64(self, fig):
         """Convert figure to base64 encoding without saving to disk"""
-        buffer = BytesIO()
-        fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight', 
-                   facecolor='#0f172a', transparent=False)
-        buffer.seek(0)
-        image_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-        plt.close(fig)
-        # Return with data URI prefix for HTML img tags
-        return f'data:image/png;base64,{image_base64}'
+        return to_data_uri(self.render_image(fig), self.media_type)
     
     def analyze_comment_sentiment(self, comment):
-        """Analyze sentiment of a single comment using TextBlob"""
-        try:
-            blob = TextBlob(comment)
-            polarity = blob.sentiment.polarity
-            
-            # Classify based on polarity score (-1 to 1)
-            if polarity > 0.1:
-                return 'positive', polarity
-            elif polarity < -0.1:
-                return 'negative', polarity
-            else:
-                return 'neutral', polarity
-        except:
-            return 'neutral', 0.0
+        """Analyze sentiment of a single comment (memoized TextBlob polarity)"""
+        return sentiment_engine.analyze(comment)
         
         return {
             'path': filepath,
             'base64': f'data:image/png;base64,{image_base64}'
         }
     
+    @cached_chart('avgRatings', _avg_ratings_inputs)
     def generate_avg_ratings_chart(self, data):
-        """Generate modern average ratings bar chart with gradient effects (base64 only)"""
+        """Generate modern average ratings bar chart with gradient effects (image bytes)"""
         meal_data = data.get('averageRatingPerMeal', {})
         
         if not meal_data or all(v == 0 for v in meal_data.values()):
             return None
         
+        return self.render_chart_figure(
+            ('avgRatings', tuple(meal_data)),
+            lambda: self._draw_avg_ratings_chart(meal_data),
+            lambda artists: self._update_avg_ratings_chart(artists, meal_data),
+            fixed_extent=True
+        )
+    
+    def _draw_avg_ratings_chart(self, meal_data):
+        """Build the styled average ratings figure, returns (fig, artists updated per request)"""
+        plt = get_pyplot()
+        import numpy as np
+        
         fig, ax = plt.subplots(figsize=(14, 8))
         fig.patch.set_facecolor(self.bg_darker)
         ax.set_facecolor(self.bg_dark)
@@ -114,15 +310,18 @@ class ChartGenerator:
                       edgecolor='#334155', linewidth=2.5, width=0.65)
         
         # Add glow effect with multiple bars
+        glows = []
         for bar, color in zip(bars, colors):
             x = bar.get_x()
             width = bar.get_width()
             height = bar.get_height()
             # Subtle glow
-            ax.bar(x, height, width=width, color=color, alpha=0.2, 
-                  edgecolor='none', linewidth=0)
+            glows.extend(ax.bar(x, height, width=width, color=color, alpha=0.2, 
+                               edgecolor='none', linewidth=0))
         
         # Add rating badges on top
+        badges = []
+        emojis = []
         for i, (bar, rating) in enumerate(zip(bars, ratings)):
             height = bar.get_height()
             # Modern badge with shadow effect
@@ -131,15 +330,14 @@ class ChartGenerator:
                             edgecolor='#0f172a',
                             linewidth=2.5,
                             alpha=0.95)
-            ax.text(bar.get_x() + bar.get_width()/2., height + 0.2,
-                   f'{rating:.1f}★', ha='center', va='bottom', 
-                   fontsize=15, fontweight='bold', color='white',
-                   bbox=bbox_props)
+            badges.append(ax.text(bar.get_x() + bar.get_width()/2., height + 0.2,
+                                 f'{rating:.1f}★', ha='center', va='bottom', 
+                                 fontsize=15, fontweight='bold', color='white',
+                                 bbox=bbox_props))
             
             # Add emoji based on rating
-            emoji = '🌟' if rating >= 4.5 else '😊' if rating >= 4 else '😐' if rating >= 3 else '😟'
-            ax.text(bar.get_x() + bar.get_width()/2., height/2,
-                   emoji, ha='center', va='center', fontsize=28)
+            emojis.append(ax.text(bar.get_x() + bar.get_width()/2., height/2,
+                                 self._rating_emoji(rating), ha='center', va='center', fontsize=28))
         
         # Modern styling
         ax.set_ylabel('Average Rating', fontsize=14, fontweight='bold', 
@@ -183,17 +381,47 @@ class ChartGenerator:
         ax.tick_params(colors=self.text_secondary, which='both', 
                       length=6, width=1.5)
         
-        plt.tight_layout()
+        fig.tight_layout()
         
-        return self.encode_to_base64(fig)
+        return fig, {'bars': list(bars), 'glows': glows, 'badges': badges, 'emojis': emojis}
+    
+    def _update_avg_ratings_chart(self, artists, meal_data):
+        """Move bars, badges and emojis of a template to new ratings"""
+        for i, rating in enumerate(meal_data.values()):
+            artists['bars'][i].set_height(rating)
+            artists['glows'][i].set_height(rating)
+            artists['badges'][i].set_y(rating + 0.2)
+            artists['badges'][i].set_text(f'{rating:.1f}★')
+            artists['emojis'][i].set_y(rating / 2)
+            artists['emojis'][i].set_text(self._rating_emoji(rating))
+    
+    @staticmethod
+    def _rating_emoji(rating):
+        return '🌟' if rating >= 4.5 else '😊' if rating >= 4 else '😐' if rating >= 3 else '😟'
     
+    @cached_chart('distribution', _distribution_inputs)
     def generate_rating_distribution_chart(self, data):
-        """Generate 4 modern bar charts for rating distribution - one per meal (base64 only)"""
-        distribution_data = data.get('feedbackDistributionPerMeal', {})
+        """Generate 4 modern bar charts for rating distribution - one per meal (image bytes)"""
         distribution_data = data.get('feedbackDistributionPerMeal', {})
         
         if not distribution_data:
             return None
+        
+        # Tick label width depends on the count magnitude, so it is part of the layout
+        max_count = max((max(meal_dist.values(), default=0) for meal_dist in distribution_data.values()), default=0)
+        
+        return self.render_chart_figure(
+            ('distribution', tuple(distribution_data), len(str(int(max_count)))),
+            lambda: self._draw_rating_distribution_chart(distribution_data),
+            lambda artists: self._update_rating_distribution_chart(artists, distribution_data),
+            fixed_extent=True
+        )
+    
+    def _draw_rating_distribution_chart(self, distribution_data):
+        """Build the styled 2x2 distribution figure, returns (fig, artists updated per request)"""
+        plt = get_pyplot()
+        import numpy as np
+        
         # Create 2x2 subplot layout
         fig, axes = plt.subplots(2, 2, figsize=(18, 14))
         fig.patch.set_facecolor(self.bg_darker)
@@ -201,14 +429,14 @@ class ChartGenerator:
         
         meal_names = list(distribution_data.keys())
         star_labels = ['1★', '2★', '3★', '4★', '5★']
-        star_keys = ['1_star', '2_star', '3_star', '4_star', '5_star']
+        panels = []
         
         for idx, (meal, ax) in enumerate(zip(meal_names, axes)):
             ax.set_facecolor(self.bg_dark)
             meal_dist = distribution_data[meal]
             
             # Get counts for each star rating
-            counts = [meal_dist.get(key, 0) for key in star_keys]
+            counts = [meal_dist.get(key, 0) for key in self.star_keys]
             colors_list = [self.rating_colors[i+1] for i in range(5)]
             
             # Create bar chart with gradient effect
@@ -217,20 +445,22 @@ class ChartGenerator:
                          edgecolor='#334155', linewidth=2.5, width=0.7)
             
             # Add glow effect
+            glows = []
             for bar, color in zip(bars, colors_list):
                 x = bar.get_x()
                 width = bar.get_width()
                 height = bar.get_height()
-                ax.bar(x, height, width=width, color=color, alpha=0.2, 
-                      edgecolor='none', linewidth=0)
+                glows.extend(ax.bar(x, height, width=width, color=color, alpha=0.2, 
+                                   edgecolor='none', linewidth=0))
             
-            # Add count labels on bars
+            # Add count labels on bars (hidden for empty bars)
+            count_labels = []
             for bar, count in zip(bars, counts):
-                if count > 0:
-                    height = bar.get_height()
-                    ax.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                           f'{int(count)}', ha='center', va='bottom',
-                           fontsize=13, fontweight='bold', color=self.text_primary)
+                height = bar.get_height()
+                count_labels.append(ax.text(bar.get_x() + bar.get_width()/2., height + 0.5,
+                                           f'{int(count)}', ha='center', va='bottom',
+                                           fontsize=13, fontweight='bold', color=self.text_primary,
+                                           visible=count > 0))
             
             # Styling
             meal_color = self.meal_colors.get(meal, '#60a5fa')
@@ -254,10 +484,10 @@ class ChartGenerator:
             total = sum(counts)
             total_bbox = dict(boxstyle='round,pad=0.6', facecolor=self.bg_dark,
                             edgecolor=meal_color, linewidth=2, alpha=0.95)
-            ax.text(0.98, 0.98, f'Total: {int(total)}', 
-                   transform=ax.transAxes, ha='right', va='top',
-                   fontsize=11, fontweight='bold', color=self.text_primary,
-                   bbox=total_bbox)
+            total_text = ax.text(0.98, 0.98, f'Total: {int(total)}', 
+                                transform=ax.transAxes, ha='right', va='top',
+                                fontsize=11, fontweight='bold', color=self.text_primary,
+                                bbox=total_bbox)
             
             # Border styling
             for spine in ax.spines.values():
@@ -267,36 +497,59 @@ class ChartGenerator:
             # Tick styling
             ax.tick_params(colors=self.text_secondary, which='both', 
                           length=6, width=1.5)
+            
+            panels.append({
+                'ax': ax,
+                'bars': list(bars),
+                'glows': glows,
+                'labels': count_labels,
+                'total': total_text
+            })
         
         # Overall title
         fig.suptitle('📈 Rating Distribution Analysis', fontsize=20, fontweight='bold',
                     y=0.995, color=self.text_primary)
         
-        plt.tight_layout()
+        fig.tight_layout()
         
-        return self.encode_to_base64(fig)
+        return fig, {'panels': panels}
     
-    def generate_sentiment_chart(self, data):
-        """Generate modern sentiment analysis with NLP-based donut chart (base64 only)"""
-        sentiment_data = data.get('sentimentAnalysisPerMeal', {})
-        all_comments = data.get('allComments', [])
-        
-        if not sentiment_data:
-            return None
+    def _update_rating_distribution_chart(self, artists, distribution_data):
+        """Set bar heights, count labels and totals of a template, then rescale each panel"""
+        for meal, panel in zip(distribution_data, artists['panels']):
+            counts = [distribution_data[meal].get(key, 0) for key in self.star_keys]
+            for bar, glow, label, count in zip(panel['bars'], panel['glows'], panel['labels'], counts):
+                bar.set_height(count)
+                glow.set_height(count)
+                label.set_y(count + 0.5)
+                label.set_text(f'{int(count)}')
+                label.set_visible(count > 0)
+            panel['total'].set_text(f'Total: {int(sum(counts))}')
+            
+            panel['ax'].relim()
+            panel['ax'].autoscale_view()
+    
+    def summarize_comment_sentiment(self, all_comments):
+        """Run NLP over all comments: overall percentages plus top 3 positive/negative comments"""
+        positive_pct = negative_pct = neutral_pct = 0
+        positive_comments = negative_comments = []
         
         # Analyze all comments with NLP if available
         if all_comments:
-            analyzed_comments = []
-            for comment in all_comments:
-                if comment.get('text', '').strip():
-                    sentiment, polarity = self.analyze_comment_sentiment(comment['text'])
-                    analyzed_comments.append({
-                        'text': comment['text'],
-                        'meal': comment.get('meal', 'Unknown'),
-                        'rating': comment.get('rating', 0),
-                        'sentiment': sentiment,
-                        'polarity': polarity
-                    })
+            comments = [c for c in all_comments if c.get('text', '').strip()]
+            # One batched, deduplicated pass instead of a TextBlob call per comment
+            with stage_timer('sentiment'):
+                scores = sentiment_engine.analyze_many([c['text'] for c in comments])
+            analyzed_comments = [
+                {
+                    'text': comment['text'],
+                    'meal': comment.get('meal', 'Unknown'),
+                    'rating': comment.get('rating', 0),
+                    'sentiment': sentiment,
+                    'polarity': polarity
+                }
+                for comment, (sentiment, polarity) in zip(comments, scores)
+            ]
             
             # Sort by polarity for top positive/negative
             positive_comments = sorted(
@@ -319,11 +572,71 @@ class ChartGenerator:
                 positive_pct = (positive_count / total_analyzed) * 100
                 negative_pct = (negative_count / total_analyzed) * 100
                 neutral_pct = (neutral_count / total_analyzed) * 100
-            else:
-                positive_pct = negative_pct = neutral_pct = 0
-        else:
-            positive_pct = negative_pct = neutral_pct = 0
-            positive_comments = negative_comments = []
+        
+        return {
+            'positive_pct': positive_pct,
+            'negative_pct': negative_pct,
+            'neutral_pct': neutral_pct,
+            'positive_comments': positive_comments,
+            'negative_comments': negative_comments,
+            'topComments': {
+                'positive': [
+                    {
+                        'text': c['text'],
+                        'meal': c['meal'],
+                        'rating': c['rating'],
+                        'polarity': c['polarity']
+                    } for c in positive_comments
+                ],
+                'negative': [
+                    {
+                        'text': c['text'],
+                        'meal': c['meal'],
+                        'rating': c['rating'],
+                        'polarity': c['polarity']
+                    } for c in negative_comments
+                ]
+            }
+        }
+    
+    @cached_chart('sentiment', _sentiment_inputs)
+    def generate_sentiment_chart(self, data):
+        """Generate modern sentiment analysis with NLP-based donut chart (image + top comments)"""
+        sentiment_data = data.get('sentimentAnalysisPerMeal', {})
+        all_comments = data.get('allComments', [])
+        
+        if not sentiment_data:
+            return None
+        
+        summary = self.summarize_comment_sentiment(all_comments)
+        slices = self._sentiment_slices(summary)
+        
+        image = self.render_chart_figure(
+            ('sentiment', tuple(label for label, _, _ in slices)),
+            lambda: self._draw_sentiment_chart(summary, slices),
+            lambda artists: self._update_sentiment_chart(artists, summary, slices)
+        )
+        
+        # Return both the chart and the top comments data
+        return {
+            'image': image,
+            'topComments': summary['topComments']
+        }
+    
+    def _sentiment_slices(self, summary):
+        """(label, percentage, color) for every non-empty sentiment bucket"""
+        slices = []
+        if summary['positive_pct'] > 0:
+            slices.append(('Positive 😊', summary['positive_pct'], self.sentiment_colors['positive']))
+        if summary['neutral_pct'] > 0:
+            slices.append(('Neutral 😐', summary['neutral_pct'], self.sentiment_colors['neutral']))
+        if summary['negative_pct'] > 0:
+            slices.append(('Negative 😞', summary['negative_pct'], self.sentiment_colors['negative']))
+        return slices
+    
+    def _draw_sentiment_chart(self, summary, slices):
+        """Build the styled sentiment figure, returns (fig, artists updated per request)"""
+        plt = get_pyplot()
         
         # Create modern dark-themed chart
         fig = plt.figure(figsize=(16, 9))
@@ -333,42 +646,13 @@ class ChartGenerator:
         ax_pie = plt.subplot2grid((2, 3), (0, 0), colspan=2, rowspan=2)
         ax_pie.set_facecolor(self.bg_darker)
         
-        sentiments = []
-        percentages = []
-        colors = []
-        
-        if positive_pct > 0:
-            sentiments.append('Positive 😊')
-            percentages.append(positive_pct)
-            colors.append(self.sentiment_colors['positive'])
-        if neutral_pct > 0:
-            sentiments.append('Neutral 😐')
-            percentages.append(neutral_pct)
-            colors.append(self.sentiment_colors['neutral'])
-        if negative_pct > 0:
-            sentiments.append('Negative 😞')
-            percentages.append(negative_pct)
-            colors.append(self.sentiment_colors['negative'])
-        
-        if percentages:
-            # Create modern donut chart with shadow effect
-            wedges, texts, autotexts = ax_pie.pie(
-                percentages, labels=sentiments, colors=colors,
-                autopct='%1.1f%%', startangle=90,
-                textprops={'fontsize': 13, 'fontweight': 'bold', 'color': self.text_primary},
-                pctdistance=0.82, explode=[0.05] * len(percentages),
-                wedgeprops={'linewidth': 3, 'edgecolor': '#0f172a', 'alpha': 0.95}
-            )
-            
-            # Make percentage text white and bold
-            for autotext in autotexts:
-                autotext.set_color('white')
-                autotext.set_fontsize(14)
-                autotext.set_fontweight('bold')
+        pie_artists = []
+        if slices:
+            pie_artists = self._draw_sentiment_pie(ax_pie, slices)
             
-            # Draw center circle for donut effect
+            # Draw center circle for donut effect (above the wedges, which templates redraw)
             centre_circle = plt.Circle((0, 0), 0.65, fc=self.bg_dark, 
-                                      linewidth=4, edgecolor=self.border_color)
+                                      linewidth=4, edgecolor=self.border_color, zorder=1.5)
             ax_pie.add_artist(centre_circle)
             
             # Add center text with modern styling
@@ -385,62 +669,86 @@ class ChartGenerator:
         ax_comments.axis('off')
         ax_comments.set_facecolor(self.bg_darker)
         
+        comment_bbox = dict(boxstyle='round,pad=1.2', facecolor=self.bg_dark,
+                          edgecolor=self.border_color, linewidth=2.5, alpha=0.95)
+        comments = ax_comments.text(0.05, 0.95, self._format_top_comments(summary),
+                                   transform=ax_comments.transAxes,
+                                   fontsize=9.5, verticalalignment='top', fontfamily='monospace',
+                                   color=self.text_secondary, bbox=comment_bbox, linespacing=1.6)
+        
+        fig.tight_layout()
+        
+        return fig, {'ax_pie': ax_pie, 'pie': pie_artists, 'comments': comments}
+    
+    def _draw_sentiment_pie(self, ax_pie, slices):
+        """Draw the sentiment wedges and their labels, returns every artist added"""
+        def draw():
+            # Create modern donut chart with shadow effect
+            wedges, texts, autotexts = ax_pie.pie(
+                [pct for _, pct, _ in slices], labels=[label for label, _, _ in slices],
+                colors=[color for _, _, color in slices],
+                autopct='%1.1f%%', startangle=90,
+                textprops={'fontsize': 13, 'fontweight': 'bold', 'color': self.text_primary},
+                pctdistance=0.82, explode=[0.05] * len(slices),
+                wedgeprops={'linewidth': 3, 'edgecolor': '#0f172a', 'alpha': 0.95}
+            )
+            
+            # Make percentage text white and bold
+            for autotext in autotexts:
+                autotext.set_color('white')
+                autotext.set_fontsize(14)
+                autotext.set_fontweight('bold')
+        
+        return self._added_artists(ax_pie, draw)
+    
+    def _update_sentiment_chart(self, artists, summary, slices):
+        """Redraw the wedges on the template's axes and swap the comments text"""
+        if slices:
+            for artist in artists['pie']:
+                artist.remove()
+            artists['pie'] = self._draw_sentiment_pie(artists['ax_pie'], slices)
+        artists['comments'].set_text(self._format_top_comments(summary))
+    
+    @staticmethod
+    def _format_top_comments(summary):
+        """Monospace text block listing the top positive and negative comments"""
         comment_text = "📝 TOP COMMENTS\n" + "─" * 35 + "\n\n"
         
-        if positive_comments:
+        if summary['positive_comments']:
             comment_text += "✅ POSITIVE:\n"
-            for i, c in enumerate(positive_comments[:3], 1):
+            for i, c in enumerate(summary['positive_comments'][:3], 1):
                 truncated = (c['text'][:55] + '...') if len(c['text']) > 55 else c['text']
                 comment_text += f"{i}. {truncated}\n"
                 comment_text += f"   ({c['meal']}, {c['rating']}★)\n\n"
         
-        if negative_comments:
+        if summary['negative_comments']:
             comment_text += "\n❌ NEGATIVE:\n"
-            for i, c in enumerate(negative_comments[:3], 1):
+            for i, c in enumerate(summary['negative_comments'][:3], 1):
                 truncated = (c['text'][:55] + '...') if len(c['text']) > 55 else c['text']
                 comment_text += f"{i}. {truncated}\n"
                 comment_text += f"   ({c['meal']}, {c['rating']}★)\n\n"
         
-        comment_bbox = dict(boxstyle='round,pad=1.2', facecolor=self.bg_dark,
-                          edgecolor=self.border_color, linewidth=2.5, alpha=0.95)
-        ax_comments.text(0.05, 0.95, comment_text, transform=ax_comments.transAxes,
-                        fontsize=9.5, verticalalignment='top', fontfamily='monospace',
-                        color=self.text_secondary, bbox=comment_bbox, linespacing=1.6)
-        
-        plt.tight_layout()
-        
-        # Return both the chart and the top comments data
-        return {
-            'base64': self.encode_to_base64(fig),
-            'topComments': {
-                'positive': [
-                    {
-                        'text': c['text'],
-                        'meal': c['meal'],
-                        'rating': c['rating'],
-                        'polarity': c['polarity']
-                    } for c in positive_comments
-                ],
-                'negative': [
-                    {
-                        'text': c['text'],
-                        'meal': c['meal'],
-                        'rating': c['rating'],
-                        'polarity': c['polarity']
-                    } for c in negative_comments
-                ]
-            }
-        }
+        return comment_text
     
+    @cached_chart('participation', _participation_inputs)
     def generate_participation_chart(self, data):
-        """Generate modern participation rate visualization with dark theme (base64 only)"""
+        """Generate modern participation rate visualization with dark theme (image bytes)"""
         overview = data.get('overview', {})
         total_students = overview.get('totalStudents', 0)
-        participating = overview.get('participatingStudents', 0)
         
         if total_students == 0:
             return None
         
+        return self.render_chart_figure(
+            ('participation',),
+            lambda: self._draw_participation_chart(overview),
+            lambda artists: self._update_participation_chart(artists, overview)
+        )
+    
+    def _draw_participation_chart(self, overview):
+        """Build the styled participation figure, returns (fig, artists updated per request)"""
+        plt = get_pyplot()
+        
         fig = plt.figure(figsize=(14, 9))
         fig.patch.set_facecolor(self.bg_darker)
         
@@ -448,56 +756,107 @@ class ChartGenerator:
         ax_main = plt.subplot2grid((2, 2), (0, 0), colspan=2, rowspan=2)
         ax_main.set_facecolor(self.bg_darker)
         
-        non_participating = total_students - participating
-        sizes = [participating, non_participating]
-        labels = [f'Participated\n({participating} students)', 
-                 f'Did Not Participate\n({non_participating} students)']
-        colors = ['#10b981', '#ef4444']
-        explode = (0.08, 0.08)
-        
-        wedges, texts, autotexts = ax_main.pie(
-            sizes, labels=labels, colors=colors,
-            autopct='%1.1f%%', startangle=90,
-            textprops={'fontsize': 12, 'fontweight': 'bold', 'color': self.text_primary},
-            pctdistance=0.82, explode=explode,
-            wedgeprops={'linewidth': 4, 'edgecolor': '#0f172a', 'alpha': 0.95},
-            shadow=True
-        )
+        pie_artists = self._draw_participation_pie(ax_main, overview)
         
-        # Style the text
-        for text in texts:
-            text.set_fontsize(13)
-            text.set_fontweight('bold')
-            text.set_color(self.text_primary)
-        
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontsize(15)
-            autotext.set_fontweight('bold')
-        
-        # Draw center circle for donut effect
+        # Draw center circle for donut effect (above the wedges, which templates redraw)
         centre_circle = plt.Circle((0, 0), 0.65, fc=self.bg_dark, 
-                                  linewidth=5, edgecolor=self.border_color)
+                                  linewidth=5, edgecolor=self.border_color, zorder=1.5)
         ax_main.add_artist(centre_circle)
         
         # Add center text with participation rate
         participation_rate = overview.get('participationRate', 0)
-        rate_color = '#10b981' if participation_rate >= 70 else '#fbbf24' if participation_rate >= 50 else '#ef4444'
         
-        ax_main.text(0, 0.2, f'{participation_rate:.1f}%', ha='center', va='center',
-                    fontsize=42, fontweight='bold', color=rate_color)
+        rate_text = ax_main.text(0, 0.2, f'{participation_rate:.1f}%', ha='center', va='center',
+                                fontsize=42, fontweight='bold', color=self._participation_color(participation_rate))
         ax_main.text(0, -0.15, 'Participation', ha='center', va='center',
                     fontsize=16, fontweight='bold', color=self.text_secondary)
         
         # Add emoji based on participation rate
-        emoji = '🎉' if participation_rate >= 70 else '👍' if participation_rate >= 50 else '📢'
-        ax_main.text(0, -0.40, emoji, ha='center', va='center', fontsize=36)
+        emoji_text = ax_main.text(0, -0.40, self._participation_emoji(participation_rate),
+                                 ha='center', va='center', fontsize=36)
         
         ax_main.set_title('👥 Student Participation Rate', fontsize=18, fontweight='bold',
                          pad=25, color=self.text_primary)
         
         # Add stats box with modern styling
-        stats_text = f"""📊 PARTICIPATION STATS
+        stats_bbox = dict(boxstyle='round,pad=1.2', facecolor=self.bg_dark,
+                        edgecolor=self.border_color, linewidth=2.5, alpha=0.95)
+        stats_text = ax_main.text(1.22, 0.5, self._format_participation_stats(overview),
+                                 transform=ax_main.transAxes,
+                                 fontsize=11, verticalalignment='center', fontfamily='monospace',
+                                 color=self.text_secondary, bbox=stats_bbox, linespacing=1.8)
+        
+        fig.tight_layout()
+        
+        return fig, {
+            'ax_main': ax_main,
+            'pie': pie_artists,
+            'rate': rate_text,
+            'emoji': emoji_text,
+            'stats': stats_text
+        }
+    
+    def _draw_participation_pie(self, ax_main, overview):
+        """Draw participation wedges (with shadows) and labels, returns every artist added"""
+        total_students = overview.get('totalStudents', 0)
+        participating = overview.get('participatingStudents', 0)
+        non_participating = total_students - participating
+        
+        def draw():
+            sizes = [participating, non_participating]
+            labels = [f'Participated\n({participating} students)', 
+                     f'Did Not Participate\n({non_participating} students)']
+            colors = ['#10b981', '#ef4444']
+            explode = (0.08, 0.08)
+            
+            wedges, texts, autotexts = ax_main.pie(
+                sizes, labels=labels, colors=colors,
+                autopct='%1.1f%%', startangle=90,
+                textprops={'fontsize': 12, 'fontweight': 'bold', 'color': self.text_primary},
+                pctdistance=0.82, explode=explode,
+                wedgeprops={'linewidth': 4, 'edgecolor': '#0f172a', 'alpha': 0.95},
+                shadow=True
+            )
+            
+            # Style the text
+            for text in texts:
+                text.set_fontsize(13)
+                text.set_fontweight('bold')
+                text.set_color(self.text_primary)
+            
+            for autotext in autotexts:
+                autotext.set_color('white')
+                autotext.set_fontsize(15)
+                autotext.set_fontweight('bold')
+        
+        return self._added_artists(ax_main, draw)
+    
+    def _update_participation_chart(self, artists, overview):
+        """Redraw the wedges on the template's axes and update the center and stats text"""
+        for artist in artists['pie']:
+            artist.remove()
+        artists['pie'] = self._draw_participation_pie(artists['ax_main'], overview)
+        
+        participation_rate = overview.get('participationRate', 0)
+        artists['rate'].set_text(f'{participation_rate:.1f}%')
+        artists['rate'].set_color(self._participation_color(participation_rate))
+        artists['emoji'].set_text(self._participation_emoji(participation_rate))
+        artists['stats'].set_text(self._format_participation_stats(overview))
+    
+    @staticmethod
+    def _participation_color(participation_rate):
+        return '#10b981' if participation_rate >= 70 else '#fbbf24' if participation_rate >= 50 else '#ef4444'
+    
+    @staticmethod
+    def _participation_emoji(participation_rate):
+        return '🎉' if participation_rate >= 70 else '👍' if participation_rate >= 50 else '📢'
+    
+    @staticmethod
+    def _format_participation_stats(overview):
+        total_students = overview.get('totalStudents', 0)
+        participating = overview.get('participatingStudents', 0)
+        non_participating = total_students - participating
+        return f"""📊 PARTICIPATION STATS
 {"─" * 28}
 
 Total Students: {total_students}
@@ -507,24 +866,191 @@ Not Participated: {non_participating}
 Overall Rating: {overview.get('overallRating', 0):.1f}★/5.0
 Quality Score: {overview.get('qualityConsistencyScore', 0):.0f}/100
 """
+    
+    @staticmethod
+    def _added_artists(ax, draw):
+        """Run draw() and return the patches and texts it added to ax"""
+        before = set(ax.patches) | set(ax.texts)
+        draw()
+        return [artist for artist in list(ax.patches) + list(ax.texts) if artist not in before]
+    
+    def render_chart_figure(self, template_key, draw, update, fixed_extent=False):
+        """
+        Rasterize a chart, reusing a per-process figure template when enabled
         
-        stats_bbox = dict(boxstyle='round,pad=1.2', facecolor=self.bg_dark,
-                        edgecolor=self.border_color, linewidth=2.5, alpha=0.95)
-        ax_main.text(1.22, 0.5, stats_text, transform=ax_main.transAxes,
-                    fontsize=11, verticalalignment='center', fontfamily='monospace',
-                    color=self.text_secondary, bbox=stats_bbox, linespacing=1.8)
+        draw() builds a fully styled figure for the current data and returns
+        (fig, artists); update(artists) rewrites only the data-dependent
+        artists of a previously built figure. Templates skip figure creation,
+        styling and tight_layout on every request after the first.
         
-        plt.tight_layout()
+        fixed_extent: the figure's outer extent never depends on the data
+        (bar charts), so the tight bounding box is measured once and reused,
+        saving savefig's extra measuring draw.
+        """
+        plt = get_pyplot()
+        if not self.use_templates:
+            fig, _ = draw()
+            return self.render_image(fig)
         
-        return self.encode_to_base64(fig)
+        template = _figure_templates.get(template_key)
+        if template is None:
+            fig, artists = draw()
+            template = {'fig': fig, 'artists': artists, 'bbox': None}
+            if len(_figure_templates) >= MAX_FIGURE_TEMPLATES:
+                _, old = _figure_templates.popitem(last=False)
+                plt.close(old['fig'])
+            _figure_templates[template_key] = template
+        else:
+            _figure_templates.move_to_end(template_key)
+            update(template['artists'])
+        
+        fig = template['fig']
+        image = self.render_image(fig, close=False, bbox_inches=template['bbox'] or 'tight')
+        
+        if fixed_extent and template['bbox'] is None:
+            # Measure at the save DPI, exactly as savefig(bbox_inches='tight') does
+            figure_dpi = fig.dpi
+            fig.set_dpi(self.render_settings.get('dpi', figure_dpi))
+            try:
+                template['bbox'] = fig.get_tightbbox(fig.canvas.get_renderer()).padded(
+                    plt.rcParams['savefig.pad_inches']
+                )
+            finally:
+                fig.set_dpi(figure_dpi)
+        return image
     
     def generate_all_charts(self, data):
         """Generate all charts and return base64 data only (no file storage)"""
-        sentiment_chart_data = self.generate_sentiment_chart(data)
+        rendered = self.render_charts(data)
+        sentiment_chart_data = rendered['sentiment']
         
         return {
-            'avgRatings': {'base64': self.generate_avg_ratings_chart(data)},
-            'distribution': {'base64': self.generate_rating_distribution_chart(data)},
-            'sentiment': sentiment_chart_data if sentiment_chart_data else {'base64': None, 'topComments': {'positive': [], 'negative': []}},
-            'participation': {'base64': self.generate_participation_chart(data)}
+            'avgRatings': {'base64': to_data_uri(rendered['avgRatings'], self.media_type)},
+            'distribution': {'base64': to_data_uri(rendered['distribution'], self.media_type)},
+            'sentiment': {
+                'base64': to_data_uri(sentiment_chart_data['image'], self.media_type),
+                'topComments': sentiment_chart_data['topComments']
+            } if sentiment_chart_data else {'base64': None, 'topComments': {'positive': [], 'negative': []}},
+            'participation': {'base64': to_data_uri(rendered['participation'], self.media_type)}
         }
+    
+    def render_chart_image(self, name, data):
+        """Render a single chart by response key and return raw image bytes (None if no data)"""
+        rendered = self.render_charts(data, names=[name])[name]
+        if isinstance(rendered, dict):
+            return rendered['image']
+        return rendered
+    
+    def render_charts(self, data, names=None):
+        """Render the named charts (default: all) in the configured mode, keyed by response key"""
+        names = names or list(CHART_METHODS)
+        if CHART_RENDER_MODE == 'process' and not _render_pool_disabled:
+            try:
+                return self.render_charts_parallel(data, names)
+            except BrokenProcessPool as e:
+                logger.warning("Chart render pool failed, rendering serially", extra={"error": str(e)})
+                shutdown_render_pool()
+        
+        with _pyplot_lock:
+            return {name: getattr(self, CHART_METHODS[name])(data) for name in names}
+    
+    def render_charts_parallel(self, data, names):
+        """Render every chart not already cached on the warm process pool, one chart per worker"""
+        pool = start_render_pool()
+        rendered = {}
+        pending = {}
+        
+        for name in names:
+            method_name = CHART_METHODS[name]
+            key = None
+            if self.use_cache:
+                key = get_chart_key(name, data, self.profile)
+                cached = chart_cache.get(key)
+                if cached is not None:
+                    rendered[name] = cached
+                    continue
+            pending[name] = (key, pool.submit(_render_chart_in_worker, method_name, data, self.profile))
+        
+        for name, (key, future) in pending.items():
+            result = future.result()
+            if key is not None and result is not None:
+                chart_cache.set(key, result)
+            rendered[name] = result
+        
+        return rendered
+
+
+def render_chart_image(name, data, profile=None):
+    """Render one chart by response key to raw image bytes (executor entry point)"""
+    return ChartGenerator(profile=profile).render_chart_image(name, data)
+
+
+def summarize_top_comments(all_comments):
+    """Top positive/negative comments without rendering (executor entry point)"""
+    return ChartGenerator().summarize_comment_sentiment(all_comments)['topComments']
+
+
+def to_data_uri(image, media_type='image/png'):
+    """Wrap image bytes in a data URI for HTML img tags"""
+    if image is None:
+        return None
+    return f'data:{media_type};base64,{base64.b64encode(image).decode("ascii")}'
+
+
+def get_chart_key(name, data, profile=None):
+    """Content hash of the inputs a chart consumes - doubles as its HTTP ETag"""
+    method = getattr(ChartGenerator, CHART_METHODS[name])
+    return chart_key(method.chart_name, method.select_inputs(data), profile or DEFAULT_RENDER_PROFILE)
+
+
+def _init_render_worker():
+    """Warm a render worker: import matplotlib, apply rcParams and load the font cache"""
+    get_pyplot()
+    from matplotlib import font_manager
+    font_manager.findfont('DejaVu Sans')
+
+
+def _ping_render_worker():
+    return os.getpid()
+
+
+def _render_chart_in_worker(method_name, data, profile):
+    """Render one chart inside a pool worker (caching happens in the parent)"""
+    return getattr(ChartGenerator(use_cache=False, profile=profile), method_name)(data)
+
+
+def disable_render_pool():
+    """Render serially under _pyplot_lock in this process, never on the render pool"""
+    global _render_pool_disabled
+    _render_pool_disabled = True
+    shutdown_render_pool()
+
+
+def start_render_pool():
+    """Create and warm the chart render pool (idempotent; None once disabled)"""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool_disabled:
+            return None
+        if _render_pool is None:
+            # spawn: workers must not inherit the parent's MongoClient or pyplot state
+            _render_pool = ProcessPoolExecutor(
+                max_workers=CHART_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_render_worker
+            )
+            # Start every worker now so no request pays for interpreter + matplotlib startup
+            warm = [_render_pool.submit(_ping_render_worker) for _ in range(CHART_RENDER_WORKERS)]
+            for future in warm:
+                future.result()
+            logger.info("Chart render pool started", extra={"workers": CHART_RENDER_WORKERS})
+        return _render_pool
+
+
+def shutdown_render_pool():
+    """Stop the chart render pool"""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown(wait=False, cancel_futures=True)
+            _render_pool = None
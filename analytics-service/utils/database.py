@@ -4,12 +4,19 @@ Database connection utility for analytics service
 """
 
 import os
+import re
 import sys
 import json
-from datetime import datetime, timedelta
+import threading
+from datetime import datetime, timedelta, timezone
 from pymongo import MongoClient
 from dotenv import load_dotenv
 
+from utils.metrics import PoolUsageListener
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 # Load environment variables from analytics-service .env
 env_path = os.path.join(os.path.dirname(__file__), '..', '.env')
 if os.path.exists(env_path):
@@ -18,52 +25,114 @@ else:
     # If .env doesn't exist, load from environment (for Render deployment)
     load_dotenv()
 
+DEFAULT_MONGO_URI = 'mongodb://localhost:27017/hostel-food-analysis'
+DEFAULT_DB_NAME = 'hostel-food-analysis'
+
+# Connection pool settings for the process-wide client
+MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', '50'))
+MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', '0'))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', '60000'))
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+
+def get_mongo_uri():
+    """Get MongoDB URI from environment"""
+    return os.getenv('MONGODB_URI', DEFAULT_MONGO_URI)
+
+
+def get_database_name(mongo_uri):
+    """Extract database name from URI, falling back to the default"""
+    if '/' in mongo_uri:
+        uri_parts = mongo_uri.split('/')
+        if len(uri_parts) > 3:
+            db_part = uri_parts[-1].split('?')[0]
+            if db_part:
+                return db_part
+    return DEFAULT_DB_NAME
+
+
+def mask_mongo_uri(mongo_uri):
+    """URI with the user:password part replaced, safe to log"""
+    return re.sub(r'//[^@/]*@', '//***@', mongo_uri)
+
+
+def init_client():
+    """
+    Create the process-wide pooled MongoClient (idempotent)
+    Called from the FastAPI lifespan; other callers get it lazily via get_client()
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            mongo_uri = get_mongo_uri()
+            logger.debug("Creating MongoClient pool", extra={
+                "uri": mask_mongo_uri(mongo_uri),
+                "maxPoolSize": MONGO_MAX_POOL_SIZE,
+                "minPoolSize": MONGO_MIN_POOL_SIZE,
+                "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS
+            })
+            _shared_client = MongoClient(
+                mongo_uri,
+                serverSelectionTimeoutMS=5000,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+                event_listeners=[PoolUsageListener()]
+            )
+        return _shared_client
+
+
+def get_client():
+    """Get the process-wide MongoClient, creating it on first use"""
+    if _shared_client is None:
+        return init_client()
+    return _shared_client
+
+
+def close_client():
+    """Close the process-wide MongoClient and its connection pool"""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is not None:
+            _shared_client.close()
+            _shared_client = None
+
+
 class DatabaseConnection:
+    """Lightweight handle that borrows the shared pooled client"""
+
     def __init__(self):
-        self.mongo_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/hostel-food-analysis')
+        self.mongo_uri = get_mongo_uri()
         self.client = None
         self.db = None
         
     def connect(self):
-        """Connect to MongoDB"""
-        import traceback
+        """Attach to the shared MongoDB client (no network round trip)"""
         try:
-            print(f"DEBUG: MongoDB URI (masked): {self.mongo_uri[:20]}...", file=sys.stderr)
-            self.client = MongoClient(self.mongo_uri, serverSelectionTimeoutMS=5000)
-            
-            # Extract database name from URI
-            if '/' in self.mongo_uri:
-                uri_parts = self.mongo_uri.split('/')
-                if len(uri_parts) > 3:
-                    db_part = uri_parts[-1].split('?')[0]
-                    if db_part:
-                        self.db = self.client[db_part]
-                        print(f"DEBUG: Using database from URI: {db_part}", file=sys.stderr)
-                    else:
-                        self.db = self.client['hostel-food-analysis']
-                        print(f"DEBUG: Using default database: hostel-food-analysis", file=sys.stderr)
-                else:
-                    self.db = self.client['hostel-food-analysis']
-                    print(f"DEBUG: Using default database: hostel-food-analysis", file=sys.stderr)
-            else:
-                self.db = self.client['hostel-food-analysis']
-                print(f"DEBUG: Using default database: hostel-food-analysis", file=sys.stderr)
-            
-            # Test connection
-            print(f"DEBUG: Testing database connection with ping", file=sys.stderr)
+            self.client = get_client()
+            self.db = self.client[get_database_name(self.mongo_uri)]
+            return True
+        except Exception as e:
+            logger.exception("Database connection failed", extra={"error": str(e)})
+            return False
+
+    def ping(self):
+        """Check database connectivity with a ping over the shared pool"""
+        try:
+            if self.db is None and not self.connect():
+                return False
             self.db.command('ping')
-            print(f"DEBUG: Database connection successful", file=sys.stderr)
             return True
         except Exception as e:
-            error_trace = traceback.format_exc()
-            print(f"ERROR: Database connection failed: {str(e)}", file=sys.stderr)
-            print(f"TRACEBACK:\n{error_trace}", file=sys.stderr)
+            logger.error("Database ping failed", extra={"error": str(e)})
             return False
             
     def close(self):
-        """Close database connection"""
-        if self.client:
-            self.client.close()
+        """Release this handle (the shared pool stays open until shutdown)"""
+        self.client = None
+        self.db = None
             
     def get_feedback_collection(self):
         """Get feedback collection"""
@@ -74,16 +143,35 @@ class DatabaseConnection:
         return self.db.users
 
 
-# For weekly or more than analysis , we need this 
-def get_date_range(date_str):
-    """Get start and end datetime for a specific day"""
+# Feedback days follow the hostel's clock (see backend/utils/istDate.js)
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+def get_ist_today():
+    """Get today's date in IST as a naive midnight datetime"""
+    now_ist = datetime.now(IST)
+    return datetime(now_ist.year, now_ist.month, now_ist.day)
+
+
+def get_date_range(date_str, end_date_str=None):
+    """
+    Get start and (exclusive) end datetime for a day, or for date_str..end_date_str inclusive
+    
+    Raises:
+        ValueError: if end_date_str is malformed or before date_str
+    """
     try:
         target_date = datetime.strptime(date_str, '%Y-%m-%d')
     except ValueError:
         target_date = datetime.now() - timedelta(days=1)
     
     start_date = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
-    end_date = start_date + timedelta(days=1)
+    last_date = start_date
+    if end_date_str:
+        last_date = datetime.strptime(end_date_str, '%Y-%m-%d')
+        if last_date < start_date:
+            raise ValueError("end date is before start date")
+    end_date = last_date + timedelta(days=1)
     
     return start_date, end_date
 
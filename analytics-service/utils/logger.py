@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Logging Module
+Structured, level-gated logging. Records below LOG_LEVEL are dropped before
+any formatting. The rest are put on a bounded queue and written to stderr
+(JSON lines or text) by a background listener, so request threads never
+block on the stream. Every record carries the ID of the request it was
+logged for. Debug records marked sampled are kept for LOG_DEBUG_SAMPLE_RATE
+of requests, chosen by request ID, so a sampled request keeps all its
+detail.
+"""
+
+import os
+import sys
+import copy
+import json
+import queue
+import zlib
+import atexit
+import random
+import logging
+import contextvars
+import logging.handlers
+from datetime import datetime, timezone
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json').lower()  # json | text
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', '1.0'))
+# Records waiting for the writer; beyond this they are dropped rather than blocking
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+
+ROOT_LOGGER = 'analytics'
+
+request_id_var = contextvars.ContextVar('request_id', default=None)
+
+# Anything else on a record came from extra={...} and is emitted as a field
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {
+    'message', 'asctime', 'request_id', 'sampled', 'taskName'
+}
+
+
+def current_request_id():
+    return request_id_var.get()
+
+
+def run_with_request_id(request_id, func, *args):
+    """Call func with request_id as the current request (executor entry point, picklable)"""
+    token = request_id_var.set(request_id)
+    try:
+        return func(*args)
+    finally:
+        request_id_var.reset(token)
+
+
+def record_fields(record):
+    """Structured fields passed through extra={...}"""
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS}
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamps the current request ID and samples debug records marked sampled"""
+
+    def __init__(self, sample_rate=LOG_DEBUG_SAMPLE_RATE):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        if self.sample_rate < 1 and record.levelno <= logging.DEBUG and getattr(record, 'sampled', False):
+            # Same decision for every record of a request
+            key = record.request_id
+            bucket = zlib.crc32(key.encode()) % 10000 if key else random.randrange(10000)
+            return bucket < self.sample_rate * 10000
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the writer thread; drops them when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Merge args and render tracebacks now (they reference live objects); format later
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage()
+        }
+        if record.request_id:
+            entry['requestId'] = record.request_id
+        entry.update(record_fields(record))
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record):
+        line = (f"{datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds')} "
+                f"{record.levelname} [{record.request_id or '-'}] {record.name}: {record.getMessage()}")
+        fields = record_fields(record)
+        if fields:
+            line += ' ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+        if record.exc_text:
+            line += '\n' + record.exc_text
+        return line
+
+
+_queue_handler = None
+_listener = None
+
+
+def configure_logging():
+    """Install the queue handler and start its writer thread (idempotent, runs on import)"""
+    global _queue_handler, _listener
+    if _listener is not None:
+        return
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(TextFormatter() if LOG_FORMAT == 'text' else JsonFormatter())
+
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+    _queue_handler.addFilter(RequestContextFilter())
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+    root.addHandler(_queue_handler)
+    # Not duplicated by uvicorn's root handlers
+    root.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    # Flush what is queued on exit
+    atexit.register(_listener.stop)
+
+
+def get_logger(name):
+    """Logger under the service's tree, e.g. get_logger(__name__)"""
+    return logging.getLogger(f'{ROOT_LOGGER}.{name}')
+
+
+def logging_stats():
+    """Level, format, sampling and records dropped because the queue was full"""
+    return {
+        "level": logging.getLevelName(logging.getLogger(ROOT_LOGGER).level),
+        "format": LOG_FORMAT,
+        "debugSampleRate": LOG_DEBUG_SAMPLE_RATE,
+        "queued": _queue_handler.queue.qsize() if _queue_handler else 0,
+        "dropped": _queue_handler.dropped if _queue_handler else 0
+    }
+
+
+configure_logging()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Prometheus Metrics Module
+Request counts and latency per route, latency of each daily analysis stage,
+MongoDB pool usage, and gauges read from the service's stats() at scrape
+time. With PROMETHEUS_MULTIPROC_DIR set, observations made in analysis or
+render worker processes are aggregated into the scrape as well.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from pymongo import monitoring
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+# Shared directory for worker-process samples (must be empty at startup)
+PROMETHEUS_MULTIPROC_DIR = os.getenv('PROMETHEUS_MULTIPROC_DIR', '')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUEST_COUNT = Counter(
+    'analytics_http_requests_total', 'HTTP requests by route and status',
+    ['method', 'route', 'status']
+)
+REQUEST_LATENCY = Histogram(
+    'analytics_http_request_duration_seconds', 'Time until the response starts, by route',
+    ['method', 'route'], buckets=LATENCY_BUCKETS
+)
+STAGE_LATENCY = Histogram(
+    'analytics_stage_duration_seconds', 'Daily analysis stage latency',
+    ['stage'], buckets=LATENCY_BUCKETS
+)
+MONGO_POOL_CONNECTIONS = Gauge(
+    'analytics_mongo_pool_connections', 'Pooled MongoDB connections (open, in_use)',
+    ['state'], multiprocess_mode='livesum'
+)
+
+
+@contextmanager
+def stage_timer(stage):
+    """Observe the duration of the with-block as one analysis stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(stage).observe(time.perf_counter() - start)
+
+
+def timed_iter(stage, iterable):
+    """Yield from iterable, observing the time spent waiting on it once it is exhausted"""
+    iterator = iter(iterable)
+    waited = 0.0
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            waited += time.perf_counter() - start
+            break
+        waited += time.perf_counter() - start
+        yield item
+    STAGE_LATENCY.labels(stage).observe(waited)
+
+
+def observe_request(method, route, status, seconds):
+    """Count one request and its latency (route is the path template, not the raw path)"""
+    REQUEST_COUNT.labels(method, route, str(status)).inc()
+    REQUEST_LATENCY.labels(method, route).observe(seconds)
+
+
+class PoolUsageListener(monitoring.ConnectionPoolListener):
+    """Tracks open and checked-out connections of a MongoClient pool"""
+
+    def connection_created(self, event):
+        MONGO_POOL_CONNECTIONS.labels('open').inc()
+
+    def connection_closed(self, event):
+        MONGO_POOL_CONNECTIONS.labels('open').dec()
+
+    def connection_checked_out(self, event):
+        MONGO_POOL_CONNECTIONS.labels('in_use').inc()
+
+    def connection_checked_in(self, event):
+        MONGO_POOL_CONNECTIONS.labels('in_use').dec()
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        pass
+
+
+class StatsCollector:
+    """Metrics read from the service's in-memory stats when scraped (no bookkeeping on the hot path)"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def add(self, name, documentation, read, label=None, kind='gauge'):
+        """
+        Register a metric; read() returns a number, or {label value: number}
+        when label is given. kind is 'gauge' or 'counter'.
+        """
+        self._metrics.append((name, documentation, read, label, kind))
+
+    def collect(self):
+        for name, documentation, read, label, kind in self._metrics:
+            family_class = CounterMetricFamily if kind == 'counter' else GaugeMetricFamily
+            family = family_class(name, documentation, labels=[label] if label else None)
+            try:
+                values = read()
+            except Exception as e:
+                logger.warning("Metric unavailable", extra={"metric": name, "error": str(e)})
+                continue
+            if label:
+                for label_value, value in values.items():
+                    family.add_metric([label_value], value)
+            else:
+                family.add_metric([], values)
+            yield family
+
+
+stats_collector = StatsCollector()
+REGISTRY.register(stats_collector)
+
+
+def render_metrics():
+    """(exposition text, content type) for a scrape"""
+    if PROMETHEUS_MULTIPROC_DIR:
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(stats_collector)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
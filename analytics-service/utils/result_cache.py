@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+In-process LRU result cache with byte-size aware eviction and per-entry TTL
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultCache:
+    def __init__(self, max_bytes, name='cache', sizer=None):
+        """
+        Args:
+            max_bytes: Upper bound on the summed size of cached values
+            name: Label used in stats output
+            sizer: Optional callable replacing estimate_size (e.g. lambda v: 1
+                   to bound the number of entries instead of bytes)
+        """
+        self.name = name
+        self.max_bytes = max_bytes
+        self._sizer = sizer or self.estimate_size
+        self._entries = OrderedDict()  # key -> (value, size, expires_at or None)
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def estimate_size(value):
+        """Approximate in-memory footprint (raw length for bytes, JSON length otherwise)"""
+        if isinstance(value, (bytes, bytearray)):
+            return len(value)
+        if isinstance(value, dict) and any(isinstance(v, (bytes, bytearray)) for v in value.values()):
+            return sum(ResultCache.estimate_size(v) for v in value.values())
+        try:
+            return len(json.dumps(value, default=str))
+        except (TypeError, ValueError):
+            return 0
+
+    def get(self, key, record=True):
+        """
+        Return cached value or None (expired entries count as misses)
+
+        record=False leaves hit/miss counters untouched (secondary lookups).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, size, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    if record:
+                        self.hits += 1
+                    return value
+                self._remove(key)
+            if record:
+                self.misses += 1
+            return None
+
+    def record_hit(self):
+        """Count a hit served from a secondary lookup (get(..., record=False))"""
+        with self._lock:
+            self.hits += 1
+
+    def set(self, key, value, ttl=None):
+        """
+        Store value; ttl in seconds, None means never expires
+
+        Values larger than the whole budget are not cached.
+        """
+        size = self._sizer(value)
+        if size > self.max_bytes:
+            return False
+
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+
+            # Evict least recently used entries until we fit the budget
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return True
+
+    def invalidate(self, predicate):
+        """Drop every entry whose key matches predicate, return how many"""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def stats(self):
+        """Hit/miss counters and memory usage for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "maxBytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hitRate": round(self.hits / lookups * 100, 1) if lookups else 0
+            }
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Comment Sentiment Engine
+Scores comment polarity once per distinct text: comments are normalized and
+deduplicated, misses are scored in batches by a pluggable backend, and
+polarities are memoized in a bounded in-process LRU backed by an optional
+SQLite store keyed by text hash
+"""
+
+import os
+import re
+import sys
+import sqlite3
+import hashlib
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.result_cache import ResultCache
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the analyzer or normalization changes so stored polarities and
+# sentiment charts (the version is part of their cache key) are not reused
+SENTIMENT_ENGINE_VERSION = 2
+
+SENTIMENT_CACHE_ENTRIES = int(os.getenv('SENTIMENT_CACHE_ENTRIES', '50000'))
+SENTIMENT_STORE_PATH = os.getenv('SENTIMENT_STORE_PATH', '')  # empty = memory only
+SENTIMENT_BATCH_SIZE = int(os.getenv('SENTIMENT_BATCH_SIZE', '256'))
+# textblob: reference pattern analyzer, lexicon: vectorized NumPy approximation
+SENTIMENT_BACKEND = os.getenv('SENTIMENT_BACKEND', 'textblob').lower()
+# Side collection filled by the precompute worker (services/sentiment_worker.py)
+SENTIMENT_COLLECTION = os.getenv('SENTIMENT_COLLECTION', 'comment_sentiments')
+SENTIMENT_PRECOMPUTED = os.getenv(
+    'SENTIMENT_PRECOMPUTED', os.getenv('SENTIMENT_WORKER_ENABLED', 'false')
+).lower() == 'true'
+
+# Polarity thresholds (-1 to 1) used to label a comment
+POSITIVE_THRESHOLD = 0.1
+NEGATIVE_THRESHOLD = -0.1
+
+
+def normalize_comment(text):
+    """
+    Canonical form used for dedup, hashing and scoring: whitespace collapsed,
+    case kept (TextBlob scores ":D" but not ":d")
+    """
+    return ' '.join(str(text).split())
+
+
+def text_key(normalized, backend='textblob'):
+    """Stable hash of a normalized comment, scoped to the engine version and backend"""
+    payload = f'{SENTIMENT_ENGINE_VERSION}:{backend}:{normalized}'
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def classify_polarity(polarity):
+    """Label a polarity score as positive, negative or neutral"""
+    if polarity > POSITIVE_THRESHOLD:
+        return 'positive'
+    elif polarity < NEGATIVE_THRESHOLD:
+        return 'negative'
+    return 'neutral'
+
+
+class TextBlobBackend:
+    """Reference scorer: TextBlob's pattern analyzer, one text at a time"""
+    name = 'textblob'
+
+    def score(self, texts):
+        """Polarity for each text"""
+        # Same analyzer TextBlob(text).sentiment uses, without building a blob per text
+        from textblob.en import sentiment as pattern_sentiment
+
+        polarities = []
+        for text in texts:
+            try:
+                polarities.append(float(pattern_sentiment(text)[0]))
+            except Exception:
+                polarities.append(0.0)
+        return polarities
+
+
+class LexiconBackend:
+    """
+    Vectorized scorer over TextBlob's own lexicon
+
+    Tokenizes a whole batch at once and applies the pattern rules as NumPy
+    array operations: modifiers scale the next known word ("very good"),
+    negations flip and halve it ("not good"), trailing "!" boost it, and a
+    comment's polarity is the mean of its scored words. Emoticons and the
+    pattern tokenizer's finer edge cases are not modeled.
+    """
+    name = 'lexicon'
+    # Like the pattern tokenizer, contractions split apart ("wasn't" -> "was n ' t")
+    TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*|!")
+
+    def __init__(self):
+        self._vocabulary = None
+
+    def _load(self):
+        """Build word -> index plus polarity/intensity/modifier arrays (once)"""
+        if self._vocabulary is None:
+            import numpy as np
+            from textblob.en import sentiment as pattern_sentiment
+
+            words, polarity, intensity, modifier = [], [], [], []
+            for word, tags in pattern_sentiment.items():
+                p, _, i = tags[None]
+                words.append(word)
+                polarity.append(p)
+                intensity.append(i)
+                modifier.append(any(tag in tags for tag in pattern_sentiment.modifiers))
+
+            self._negations = set(pattern_sentiment.negations)
+            self._polarity = np.array(polarity, dtype=np.float64)
+            self._intensity = np.array(intensity, dtype=np.float64)
+            self._modifier = np.array(modifier, dtype=bool)
+            self._vocabulary = {word: index for index, word in enumerate(words)}
+        return self._vocabulary
+
+    def score(self, texts):
+        """Polarity for each text, computed for the whole batch at once"""
+        import numpy as np
+
+        vocabulary = self._load()
+        if not texts:
+            return []
+
+        ids, owners, negation, exclamation, short = [], [], [], [], []
+        for owner, text in enumerate(texts):
+            for token in self.TOKEN_PATTERN.findall(text.lower()):
+                ids.append(vocabulary.get(token, -1))
+                owners.append(owner)
+                negation.append(token in self._negations)
+                exclamation.append(token == '!')
+                short.append(len(token) <= 1)
+
+        polarities = np.zeros(len(texts), dtype=np.float64)
+        if not ids:
+            return polarities.tolist()
+
+        ids = np.array(ids, dtype=np.int64)
+        owners = np.array(owners, dtype=np.int64)
+        negation = np.array(negation, dtype=bool)
+        exclamation = np.array(exclamation, dtype=bool)
+        short = np.array(short, dtype=bool)
+
+        known = ids >= 0
+        safe_ids = np.where(known, ids, 0)
+        word_polarity = np.where(known, self._polarity[safe_ids], 0.0)
+        word_intensity = np.where(known, self._intensity[safe_ids], 1.0)
+        is_modifier = known & self._modifier[safe_ids]
+
+        def shifted(values, by, fill):
+            """values[i - by] within the same comment, fill elsewhere"""
+            out = np.full_like(values, fill)
+            if abs(by) >= len(values):
+                return out
+            if by > 0:
+                out[by:] = values[:-by]
+                out[by:][owners[by:] != owners[:-by]] = fill
+            else:
+                out[:by] = values[-by:]
+                out[:by][owners[:by] != owners[-by:]] = fill
+            return out
+
+        # A modifier directly followed by a known word merges into it ("very good")
+        after_modifier = known & shifted(is_modifier, 1, False)
+        scored = known & ~(is_modifier & shifted(known, -1, False))
+
+        # Negation right before the (possibly modified) word, or one short word earlier ("not a good")
+        offset = np.where(after_modifier, 1, 0)
+        negated = np.zeros_like(known)
+        for gap in (1, 2):
+            for extra in (0, 1):
+                candidate = shifted(negation, gap + extra, False)
+                if gap == 2:
+                    candidate &= shifted(short, 1 + extra, False)
+                negated |= candidate & (offset == extra)
+
+        # A negated modifier weakens instead of intensifies ("not very good")
+        prev_intensity = shifted(word_intensity, 1, 1.0)
+        prev_intensity = np.where(negated, 1.0 / prev_intensity, prev_intensity)
+        values = np.where(after_modifier, np.clip(word_polarity * prev_intensity, -1.0, 1.0), word_polarity)
+
+        # Each "!" boosts the last scored word before it in the same comment
+        positions = np.flatnonzero(scored)
+        bangs = np.flatnonzero(exclamation)
+        if len(positions) and len(bangs):
+            target = np.searchsorted(positions, bangs) - 1
+            valid = target >= 0
+            target, bangs = target[valid], bangs[valid]
+            same = owners[positions[target]] == owners[bangs]
+            boosts = np.bincount(target[same], minlength=len(positions))
+            values[positions] = np.clip(values[positions] * 1.25 ** boosts, -1.0, 1.0)
+
+        values = np.where(negated, values * -0.5, values)
+
+        totals = np.bincount(owners[scored], weights=values[scored], minlength=len(texts))
+        counts = np.bincount(owners[scored], minlength=len(texts))
+        np.divide(totals, counts, out=polarities, where=counts > 0)
+        return polarities.tolist()
+
+
+SENTIMENT_BACKENDS = {
+    'textblob': TextBlobBackend,
+    'lexicon': LexiconBackend
+}
+
+
+def get_backend(name=None):
+    """Instantiate a sentiment backend by name (default from SENTIMENT_BACKEND)"""
+    name = name or SENTIMENT_BACKEND
+    if name not in SENTIMENT_BACKENDS:
+        raise ValueError(f"Unknown sentiment backend '{name}'. Use one of: {', '.join(SENTIMENT_BACKENDS)}")
+    return SENTIMENT_BACKENDS[name]()
+
+
+class SentimentStore:
+    """Persistent text-hash -> polarity map in a SQLite file shared by all workers"""
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS polarity (key TEXT PRIMARY KEY, value REAL NOT NULL)'
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get_many(self, keys):
+        """Return {key: polarity} for the keys present in the store"""
+        found = {}
+        keys = list(keys)
+        try:
+            with self._lock:
+                conn = self._connection()
+                # Stay well under SQLite's bound-parameter limit
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    placeholders = ','.join('?' * len(chunk))
+                    rows = conn.execute(
+                        f'SELECT key, value FROM polarity WHERE key IN ({placeholders})', chunk
+                    )
+                    found.update(rows)
+        except sqlite3.Error as e:
+            logger.warning("Sentiment store read failed", extra={"error": str(e)})
+        return found
+
+    def put_many(self, items):
+        """Insert (key, polarity) pairs in one transaction"""
+        try:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    conn.executemany(
+                        'INSERT OR REPLACE INTO polarity (key, value) VALUES (?, ?)', items
+                    )
+        except sqlite3.Error as e:
+            logger.warning("Sentiment store write failed", extra={"error": str(e)})
+
+
+class PrecomputedSentiment:
+    """Read side of the precompute worker's collection (one document per meal comment)"""
+
+    def __init__(self, collection_name=SENTIMENT_COLLECTION):
+        self.collection_name = collection_name
+
+    def collection(self):
+        from utils.database import get_client, get_database_name, get_mongo_uri
+        return get_client()[get_database_name(get_mongo_uri())][self.collection_name]
+
+    def get_many(self, keys):
+        """Return {textHash: polarity} for the hashes the worker has already scored"""
+        try:
+            cursor = self.collection().find(
+                {'textHash': {'$in': list(keys)}},
+                {'_id': 0, 'textHash': 1, 'polarity': 1}
+            )
+            return {doc['textHash']: doc['polarity'] for doc in cursor}
+        except Exception as e:
+            logger.warning("Precomputed sentiment lookup failed", extra={"error": str(e)})
+            return {}
+
+
+class SentimentEngine:
+    def __init__(self, cache_entries=SENTIMENT_CACHE_ENTRIES, store_path=SENTIMENT_STORE_PATH,
+                 batch_size=SENTIMENT_BATCH_SIZE, backend=None, precomputed=None):
+        """
+        Args:
+            cache_entries: Maximum number of polarities kept in memory
+            store_path: SQLite file for polarities across restarts (empty = none)
+            batch_size: Texts scored per batch before results are persisted
+            backend: Backend name or instance (default from SENTIMENT_BACKEND)
+            precomputed: Optional source with get_many(keys), checked before scoring
+        """
+        self.backend = backend if hasattr(backend, 'score') else get_backend(backend)
+        self.memory = ResultCache(cache_entries, name='sentiment', sizer=lambda value: 1)
+        self.store = SentimentStore(store_path) if store_path else None
+        self.precomputed = precomputed
+        self.batch_size = max(1, batch_size)
+        self.precomputed_hits = 0
+        self.store_hits = 0
+        self.scored = 0
+
+    def key_for(self, text):
+        """Text hash a comment is memoized and precomputed under"""
+        return text_key(normalize_comment(text), self.backend.name)
+
+    def polarities(self, texts, use_precomputed=True):
+        """
+        Polarity for each text, in order; every distinct text is scored at most once
+
+        Lookup order: memory LRU, precomputed collection, SQLite store, backend.
+        """
+        keys = []
+        pending = {}  # key -> normalized text still needing a polarity
+        for text in texts:
+            normalized = normalize_comment(text)
+            key = text_key(normalized, self.backend.name)
+            keys.append(key)
+            if key not in pending:
+                pending[key] = normalized
+
+        resolved = {}
+        for key in list(pending):
+            polarity = self.memory.get(key)
+            if polarity is not None:
+                resolved[key] = polarity
+                del pending[key]
+
+        if pending and use_precomputed and self.precomputed is not None:
+            found = self.precomputed.get_many(pending)
+            self.precomputed_hits += len(found)
+            for key, polarity in found.items():
+                resolved[key] = polarity
+                self.memory.set(key, polarity)
+                del pending[key]
+
+        if pending and self.store is not None:
+            stored = self.store.get_many(pending)
+            self.store_hits += len(stored)
+            for key, polarity in stored.items():
+                resolved[key] = polarity
+                self.memory.set(key, polarity)
+                del pending[key]
+
+        items = list(pending.items())
+        for start in range(0, len(items), self.batch_size):
+            batch = items[start:start + self.batch_size]
+            scores = self.backend.score([normalized for _, normalized in batch])
+            self.scored += len(batch)
+            for (key, _), polarity in zip(batch, scores):
+                resolved[key] = polarity
+                self.memory.set(key, polarity)
+            if self.store is not None:
+                self.store.put_many([(key, polarity) for (key, _), polarity in zip(batch, scores)])
+
+        return [resolved[key] for key in keys]
+
+    def analyze_many(self, texts, use_precomputed=True):
+        """(label, polarity) for each text, in order"""
+        return [(classify_polarity(p), p) for p in self.polarities(texts, use_precomputed)]
+
+    def analyze(self, text):
+        """(label, polarity) for a single text"""
+        return self.analyze_many([text])[0]
+
+    def stats(self):
+        """Memory LRU stats plus store hits and number of texts actually scored"""
+        return {
+            **self.memory.stats(),
+            "backend": self.backend.name,
+            "precomputedHits": self.precomputed_hits,
+            "storeHits": self.store_hits,
+            "scored": self.scored,
+            "storePath": self.store.path if self.store is not None else None
+        }
+
+
+sentiment_engine = SentimentEngine(
+    precomputed=PrecomputedSentiment() if SENTIMENT_PRECOMPUTED else None
+)